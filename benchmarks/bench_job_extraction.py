@@ -0,0 +1,76 @@
+"""Benchmark job description extraction against the saved job page corpus.
+
+Compares the previous full-page parse with the JSON-LD / strainer extraction on
+tests/fixtures/job_pages, reporting parse time and accuracy per page.
+
+Usage:
+    python benchmarks/bench_job_extraction.py [--repeat 20]
+"""
+
+import argparse
+import difflib
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Optional
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "src"))
+
+from bs4 import BeautifulSoup  # noqa: E402
+
+from scraper import DESCRIPTION_SELECTORS, extract_job_description  # noqa: E402
+
+CORPUS_DIR = ROOT / "tests" / "fixtures" / "job_pages"
+
+
+def full_parse(page: str) -> Optional[str]:
+    """The previous extraction: parse the whole page, then try each selector."""
+    soup = BeautifulSoup(page, "html.parser")
+    for tag, class_name in DESCRIPTION_SELECTORS:
+        description_div = soup.find(tag, class_=class_name)
+        if description_div:
+            return description_div.get_text(separator="\n", strip=True)
+    return None
+
+
+def accuracy(extracted: Optional[str], expected: Optional[str]) -> float:
+    if expected is None:
+        return 1.0 if extracted is None else 0.0
+    if extracted is None:
+        return 0.0
+    return difflib.SequenceMatcher(None, " ".join(extracted.split()), " ".join(expected.split())).ratio()
+
+
+def measure(extract: Callable[[str], Optional[str]], page: str, repeat: int):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = extract(page)
+    return (time.perf_counter() - start) / repeat * 1000, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"{'page':<20} {'KiB':>6} {'full ms':>9} {'fast ms':>9} {'speedup':>8} {'full acc':>9} {'fast acc':>9}")
+    totals = [0.0, 0.0]
+    for html_path in sorted(CORPUS_DIR.glob("*.html")):
+        page = html_path.read_text(encoding="utf-8")
+        expected_path = html_path.with_suffix(".txt")
+        expected = expected_path.read_text(encoding="utf-8").strip() if expected_path.exists() else None
+
+        full_ms, full_result = measure(full_parse, page, args.repeat)
+        fast_ms, fast_result = measure(extract_job_description, page, args.repeat)
+        totals[0] += full_ms
+        totals[1] += fast_ms
+        print(
+            f"{html_path.stem:<20} {len(page) / 1024:>6.0f} {full_ms:>9.2f} {fast_ms:>9.2f} {full_ms / fast_ms:>7.1f}x "
+            f"{accuracy(full_result, expected):>9.2f} {accuracy(fast_result, expected):>9.2f}"
+        )
+    print(f"{'total':<20} {'':>6} {totals[0]:>9.2f} {totals[1]:>9.2f} {totals[0] / totals[1]:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""Benchmark the persona catalog, search index and recommender with a large synthetic persona library.
+
+Usage:
+    python benchmarks/bench_persona_index.py [--personas 10000] [--files 20]
+"""
+
+import argparse
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import yaml
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from services.persona_service import PersonaCatalog  # noqa: E402
+
+ROLES = ["Recruiter", "Engineer", "Designer", "Founder", "Manager", "Scientist", "Analyst", "Coach", "Director"]
+DOMAINS = ["Fintech", "Healthcare", "Gaming", "Retail", "Logistics", "Security", "Education", "Climate", "Media"]
+WORDS = "impact leadership metrics python design systems hiring growth strategy cloud data product ownership".split()
+
+
+def _write_library(persona_dir: Path, total: int, files: int):
+    rng = random.Random(42)
+    per_file = total // files
+    for file_no in range(files):
+        entries = []
+        for i in range(per_file):
+            name = f"{rng.choice(DOMAINS)} {rng.choice(ROLES)} {file_no * per_file + i}"
+            backstory = " ".join(rng.choice(WORDS) for _ in range(60))
+            entries.append({"name": name, "prompt": f"You are a {name}. {backstory}"})
+        with open(persona_dir / f"library_{file_no:03d}.yaml", "w", encoding="utf-8") as f:
+            yaml.safe_dump(entries, f)
+
+
+def _timed(label: str, fn, repeat: int = 1):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = fn()
+    elapsed = (time.perf_counter() - start) / repeat
+    print(f"{label:<45} {elapsed * 1000:>10.2f} ms")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--personas", type=int, default=10000)
+    parser.add_argument("--files", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        persona_dir = Path(tmp) / "personas"
+        persona_dir.mkdir()
+        _write_library(persona_dir, args.personas, args.files)
+        snapshot = Path(tmp) / "snapshot.pickle"
+
+        print(f"{args.personas} personas in {args.files} files")
+        catalog = PersonaCatalog(str(snapshot))
+        _timed("cold load (YAML parse)", lambda: catalog.get(persona_dir))
+        _timed("warm load (unchanged files, per rerun)", lambda: catalog.get(persona_dir), repeat=50)
+        _timed("new process load (pickle snapshot)", lambda: PersonaCatalog(str(snapshot)).get(persona_dir))
+        index = _timed("index build", lambda: catalog.get_index(persona_dir))
+        _timed("search: empty query, first page", lambda: index.search(""), repeat=200)
+        _timed("search: single prefix 'rec'", lambda: index.search("rec"), repeat=200)
+        _timed("search: two keywords 'fintech design'", lambda: index.search("fintech design"), repeat=200)
+        _timed("search: prefix + source filter", lambda: index.search("eng", ["library_003"]), repeat=200)
+        _timed("search: last page of broad query", lambda: index.search("python", page=10**6), repeat=200)
+        recommender = _timed("recommender build (persona vectors)", lambda: catalog.get_recommender(persona_dir))
+        job = "Senior fintech data engineer with python, cloud and leadership experience. " * 20
+        _timed("recommend top 3 for a job description", lambda: recommender.recommend(job), repeat=200)
+
+
+if __name__ == "__main__":
+    main()
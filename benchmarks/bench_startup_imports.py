@@ -0,0 +1,84 @@
+"""Report the import cost of the app's entry path and of each wizard step.
+
+Every entry is imported in a fresh interpreter with ``-X importtime``, so the numbers
+are cold-start costs. With ``--check`` the script exits non-zero when the welcome
+screen imports a heavy dependency or exceeds the time budget, to catch regressions.
+
+Usage:
+    python benchmarks/bench_startup_imports.py [--top 10] [--check] [--budget 1.0]
+"""
+
+import argparse
+import subprocess
+import sys
+from pathlib import Path
+
+SRC_DIR = Path(__file__).resolve().parent.parent / "src"
+
+# What app.py imports before the first page is drawn
+STARTUP_MODULES = ["streamlit", "dotenv", "services.warmup", "state_manager", "ui_components", "steps.welcome"]
+STEP_MODULES = ["steps.config", "steps.upload", "steps.job", "steps.team", "steps.results", "steps.personalize"]
+HEAVY_MODULES = ["crewai", "fpdf", "pypdf", "bs4", "yaml", "numpy", "google.generativeai", "openai", "litellm"]
+
+
+def _import_profile(modules, preloaded=()):
+    """Imports ``modules`` after ``preloaded`` in a fresh interpreter.
+
+    Returns (seconds, {module: cumulative seconds}, heavy modules loaded).
+    """
+    code = (
+        "import importlib, sys, time\n"
+        f"for name in {list(preloaded)!r}: importlib.import_module(name)\n"
+        "started = time.perf_counter()\n"
+        f"for name in {list(modules)!r}: importlib.import_module(name)\n"
+        "print(time.perf_counter() - started)\n"
+        f"print(','.join(name for name in {HEAVY_MODULES!r} if name in sys.modules))\n"
+    )
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code], cwd=SRC_DIR, capture_output=True, text=True, check=True
+    )
+    seconds, heavy = completed.stdout.splitlines()[-2:]
+
+    cumulative = {}
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative_us, name = (part.strip() for part in line[len("import time:") :].split("|"))
+        cumulative[name.strip()] = int(cumulative_us) / 1_000_000
+    return float(seconds), cumulative, [name for name in heavy.split(",") if name]
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--top", type=int, default=10, help="Slowest top-level imports to list for the startup path")
+    parser.add_argument("--check", action="store_true", help="Fail if the startup path regresses")
+    parser.add_argument("--budget", type=float, default=1.0, help="Startup import budget in seconds for --check")
+    args = parser.parse_args(argv)
+
+    seconds, cumulative, heavy = _import_profile(STARTUP_MODULES)
+    print(f"Startup path: {seconds:.2f}s, heavy modules: {', '.join(heavy) or 'none'}")
+    top_level = sorted(
+        ((name, value) for name, value in cumulative.items() if "." not in name), key=lambda item: item[1], reverse=True
+    )
+    for name, value in top_level[: args.top]:
+        print(f"  {value:7.3f}s  {name}")
+
+    print("\nEach step on top of the startup path:")
+    for module in STEP_MODULES:
+        step_seconds, _, step_heavy = _import_profile([module], preloaded=STARTUP_MODULES)
+        print(f"  {module:20s} {step_seconds:6.2f}s  {', '.join(step_heavy) or '-'}")
+
+    if not args.check:
+        return 0
+    problems = []
+    if heavy:
+        problems.append(f"startup imports heavy modules: {', '.join(heavy)}")
+    if seconds > args.budget:
+        problems.append(f"startup imports took {seconds:.2f}s, budget is {args.budget:.2f}s")
+    for problem in problems:
+        print(f"FAIL: {problem}", file=sys.stderr)
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,18 +1,35 @@
 """Main entry point for the AI CV Advisory Board application."""
 
+import importlib
+
 import streamlit as st
 from dotenv import load_dotenv
 
+from services.config_service import ConfigService
+from services.warmup import start_warmup
 from state_manager import state_manager
-from steps.config import render_config_step
-from steps.job import render_job_step
-from steps.personalize import render_personalize_step
-from steps.results import render_results_step
-from steps.team import render_team_step
-from steps.upload import render_upload_step
-from steps.welcome import render_welcome_step
 from ui_components import render_footer, render_header, render_stepper
 
+# Step modules are imported on first use, so the welcome screen does not wait for
+# crewai, the PDF libraries or the scraper; the warm-up loads them in the background.
+STEP_RENDERERS = {
+    0: ("steps.welcome", "render_welcome_step"),
+    1: ("steps.config", "render_config_step"),
+    2: ("steps.upload", "render_upload_step"),
+    3: ("steps.job", "render_job_step"),
+    4: ("steps.team", "render_team_step"),
+    5: ("steps.results", "render_results_step"),
+    6: ("steps.personalize", "render_personalize_step"),
+}
+
+
+def render_step(step: int):
+    if step not in STEP_RENDERERS:
+        return
+    module_name, function_name = STEP_RENDERERS[step]
+    getattr(importlib.import_module(module_name), function_name)()
+
+
 # Load environment variables
 load_dotenv()
 
@@ -23,6 +40,18 @@ st.set_page_config(
     layout="centered",
     initial_sidebar_state="collapsed",
 )
+start_warmup()
+state_manager.track_memory()
+
+# Operator report of per-session memory, served instead of the wizard when enabled
+if st.query_params.get("page") == "memory" and ConfigService.get_memory_page_enabled():
+    importlib.import_module("steps.memory").render_memory_page()
+    st.stop()
+
+# A shared result link opens straight on the results step
+shared_result_id = st.query_params.get("result")
+if shared_result_id:
+    importlib.import_module("steps.results").open_shared_result(shared_result_id)
 
 # --- Main UI ---
 render_header()
@@ -30,19 +59,6 @@ if 0 < state_manager.step <= 5:
     render_stepper(state_manager.step)
 
 # --- Routing ---
-if state_manager.step == 0:
-    render_welcome_step()
-elif state_manager.step == 1:
-    render_config_step()
-elif state_manager.step == 2:
-    render_upload_step()
-elif state_manager.step == 3:
-    render_job_step()
-elif state_manager.step == 4:
-    render_team_step()
-elif state_manager.step == 5:
-    render_results_step()
-elif state_manager.step == 6:
-    render_personalize_step()
+render_step(state_manager.step)
 
 render_footer()
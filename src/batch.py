@@ -0,0 +1,70 @@
+"""Command-line entry point for analyzing a batch of CV/job pairs without the web UI.
+
+Usage:
+    python src/batch.py manifest.jsonl --output-dir results/ [--concurrency 2] [--personas "LinkedIn Matchmaker"]
+
+Run it from the repository root so the ``personas/`` directory is found. Re-running with
+the same output directory resumes the batch, skipping items already completed.
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+from dotenv import load_dotenv
+
+from models import AppConfig
+from services.batch_service import BatchService, load_manifest
+from services.config_service import ConfigService
+
+PROVIDERS = ("Google", "OpenAI")
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Analyze a batch of CVs against job descriptions.")
+    parser.add_argument("manifest", type=Path, help="CSV or JSON Lines manifest of CV/job pairs")
+    parser.add_argument("--output-dir", type=Path, required=True, help="Directory for reports, PDFs and the checkpoint")
+    parser.add_argument("--concurrency", type=int, default=2, help="Number of analyses running at once")
+    parser.add_argument("--provider", choices=PROVIDERS, default="Google")
+    parser.add_argument("--model", default="", help="Model name (defaults to the provider's cheap model)")
+    parser.add_argument(
+        "--personas",
+        default="LinkedIn Matchmaker (matchmaker)",
+        help="';'-separated personas for manifest rows that do not list their own",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    load_dotenv()
+    args = parse_args(argv)
+
+    api_key = ConfigService.get_env_api_key(args.provider)
+    if not api_key:
+        print(f"No API key configured for {args.provider}; set it in .env.", file=sys.stderr)
+        return 2
+
+    config = AppConfig(
+        llm_provider=args.provider,
+        selected_model=args.model or ConfigService.get_cheap_model(args.provider),
+        api_key=api_key,
+        execution_mode=ConfigService.get_execution_mode(),
+        max_workers=ConfigService.get_max_workers(),
+        use_response_cache=ConfigService.get_response_cache_enabled(),
+        fallback_models=ConfigService.get_fallback_models(),
+    )
+    default_personas = [name.strip() for name in args.personas.split(";") if name.strip()]
+    items = load_manifest(args.manifest, default_personas)
+
+    summary = BatchService(config, args.output_dir, args.concurrency).run(items)
+    print(
+        f"Batch finished: {len(summary.completed)} completed, {len(summary.failed)} failed, "
+        f"{len(summary.skipped)} skipped (already completed)."
+    )
+    for item_id, error in summary.failed.items():
+        print(f"  {item_id}: {error}", file=sys.stderr)
+    return 1 if summary.failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -7,6 +7,9 @@ from typing import Dict, List
 import streamlit as st
 from crewai import Agent, Crew, Process, Task
 
+from models import AppConfig
+from services.analysis_service import AnalysisService
+
 
 def create_crew(
     custom_agents_data: List[Dict[str, str]],
@@ -31,13 +34,10 @@ def create_crew(
     Returns:
         A configured Crew object.
     """
-    # Set the API key in environment for LiteLLM (which CrewAI uses)
-    if provider == "Google":
-        os.environ["GEMINI_API_KEY"] = api_key
-        crew_model = f"gemini/{model}"
-    else:
-        os.environ["OPENAI_API_KEY"] = api_key
-        crew_model = f"openai/{model}" if not model.startswith("openai/") else model
+    # The key goes to this crew's own LLM client, never into os.environ shared by all sessions
+    crew_model = AnalysisService.configure_llm(
+        AppConfig(llm_provider=provider, selected_model=model.removeprefix("openai/"), api_key=api_key)
+    )
 
     rag_enabled = os.getenv("ENABLE_RAG", "false").lower() == "true"
 
@@ -26,3 +26,21 @@ class PersonaLoadError(AICVAdvisoryError):
     """Raised when a persona configuration cannot be loaded."""
 
     pass
+
+
+class BatchManifestError(AICVAdvisoryError):
+    """Raised when a batch manifest cannot be read or references unknown inputs."""
+
+    pass
+
+
+class RateLimitExceededError(LLMProviderError):
+    """Raised when a session has used up its share of LLM requests."""
+
+    pass
+
+
+class CircuitOpenError(LLMProviderError):
+    """Raised when calls to a failing provider/model are paused by its circuit breaker."""
+
+    pass
@@ -1,9 +1,6 @@
 import os
 from typing import List
 
-import google.generativeai as genai
-from openai import OpenAI
-
 # --- Constants ---
 DEFAULT_GEMINI_MODELS = [
     os.getenv("GEMINI_MODEL", "gemini-2.0-flash-lite"),
@@ -32,19 +29,25 @@ def get_available_models(api_key: str, provider: str = "Google") -> List[str]:
     if not api_key:
         return []
 
+    # The provider SDKs are slow to import, so they are only loaded when models are listed
     if provider == "Google":
         try:
-            genai.configure(api_key=api_key)
+            from google.ai import generativelanguage as glm
+
+            # A client of its own carries the key; genai.configure would set it for every thread in the process
             models = []
-            for m in genai.list_models():
-                if "generateContent" in m.supported_generation_methods:
-                    models.append(m.name.replace("models/", ""))
+            with glm.ModelServiceClient(client_options={"api_key": api_key}) as client:
+                for m in client.list_models():
+                    if "generateContent" in m.supported_generation_methods:
+                        models.append(m.name.replace("models/", ""))
             return sorted(models) if models else []
         except Exception:
             return []
 
     elif provider == "OpenAI":
         try:
+            from openai import OpenAI
+
             client = OpenAI(api_key=api_key)
             models = client.models.list()
             # Filter for relevant GPT models
@@ -1,5 +1,5 @@
-from dataclasses import dataclass, field
-from typing import List
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, List, Tuple
 
 
 @dataclass
@@ -16,6 +16,7 @@ class Persona:
     goal: str
     backstory: str
     tools: List[str] = field(default_factory=list)
+    source: str = ""
 
 
 @dataclass
@@ -24,3 +25,45 @@ class AppConfig:
     selected_model: str = ""
     api_key: str = ""
     is_online: bool = False
+    execution_mode: str = "sequential"
+    max_workers: int = 4
+    use_response_cache: bool = True
+    # (provider, model) pairs tried in order when the selected model keeps failing
+    fallback_models: List[Tuple[str, str]] = field(default_factory=list)
+
+
+@dataclass(slots=True)
+class TaskResult:
+    """The answer of one task of an analysis run."""
+
+    role: str
+    description: str
+    raw: str
+    expected_output: str = ""
+    seconds: float = 0.0
+    # TaskScheduler.fingerprint of the task's inputs, used to decide whether a re-run may reuse the answer
+    fingerprint: str = ""
+
+
+@dataclass(slots=True)
+class AnalysisResult:
+    """A finished analysis run, with its reports cleaned once for display.
+
+    Kept in session state instead of the crew output, which also carries every
+    task's prompt history; ``to_dict``/``from_dict`` round-trip it through JSON.
+    """
+
+    board_report: str
+    minimal_changes: str
+    final_cv: str
+    tasks: List[TaskResult] = field(default_factory=list)
+    # Prompt, cached prompt and completion tokens of the whole run
+    token_usage: Dict[str, int] = field(default_factory=dict)
+    wall_clock_seconds: float = 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "AnalysisResult":
+        return cls(**{**data, "tasks": [TaskResult(**task) for task in data.get("tasks", [])]})
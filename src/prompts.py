@@ -1,5 +1,30 @@
 """Prompt templates for the AI CV Advisory Board agents and tasks."""
 
+# The CV and job description lead every agent's prompt, byte-identical across the tasks
+# of a run, so provider prefix caching (OpenAI, Gemini) can reuse them between tasks.
+# Task texts below refer back to this block instead of repeating the inputs.
+SHARED_CONTEXT_TEMPLATE = """# Shared Context
+Every member of the board reviews the same candidate CV and target job description.
+
+## Candidate CV
+{cv_content}
+
+## Target Job Description
+{job_description}
+"""
+
+# CrewAI agent templates: the shared context first, then the agent's own role and the task
+AGENT_SYSTEM_TEMPLATE = "{shared_context}\n{{{{ .System }}}}"
+AGENT_PROMPT_TEMPLATE = "{{ .Prompt }}"
+
+# Substituted for "{job_description}" in persona backstories
+JOB_DESCRIPTION_REFERENCE = "the target job description in the shared context"
+
+SPECIALIST_TASK_DESCRIPTION = (
+    "Analyze the candidate's CV from the shared context based on your expertise. "
+    "Consider the target job description from the shared context."
+)
+
 BOARD_HEAD_BACKSTORY = (
     "You are the leader of the AI - CV Advisory Board. Your job is to take all reports and create "
     "a definitive guide for the candidate."
@@ -16,7 +41,7 @@ Use rich markdown formatting.
 OPTIMIZER_AGENT_BACKSTORY = "You are a Resume Surgeon. You focus on keywords, impact phrasing, and removing irrelevance."
 
 OPTIMIZER_TASK_DESCRIPTION = (
-    "Analyze CV: {cv_content_snippet} against Job: {job_description}. "
+    "Analyze the candidate's CV against the target job description, both in the shared context. "
     "CRITICAL: Do NOT rewrite the whole CV. Your goal is to provide a conversational yet professional list of specific recommendations. "
     "Instead of a rigid structure, write it as advice: 'You are missing X or Y keywords', 'I would recommend changing this paragraph/bullet point to this...', 'Consider removing Z because...'. "
     "Make it feel like a human expert giving quick, high-impact feedback. "
@@ -28,7 +53,7 @@ REFORMATTER_AGENT_BACKSTORY = (
 )
 
 REFORMATTER_TASK_DESCRIPTION = """
-Review FULL CV: {cv_content_snippet}
+Review the FULL CV from the shared context.
 Additional Info: {user_answers}
 
 YOUR GOAL: Produce a FINAL CV that is a polished version of the original.
@@ -1,7 +1,164 @@
+import html
+import json
+import os
+import re
+import threading
 from typing import Optional
 
 import requests
 from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from exceptions import JobScrapingError
+from logger import logger
+from services.http_cache import http_cache
+
+HTTP_CACHE_ENABLED = os.getenv("HTTP_CACHE_ENABLED", "true").lower() == "true"
+HTTP_POOL_SIZE = int(os.getenv("HTTP_POOL_SIZE", "10"))
+REQUEST_TIMEOUT_SECONDS = 10
+
+HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+}
+
+# LinkedIn often uses these classes for job descriptions in their public views
+# We try multiple common selectors, in order
+DESCRIPTION_SELECTORS = [
+    ("div", "description__text"),
+    ("div", "show-more-less-html__markup"),
+    ("section", "description"),
+    ("div", "job-view-main-content"),
+]
+CLASS_ATTRIBUTE = re.compile(r"""\bclass\s*=\s*(?:"([^"]*)"|'([^']*)')""", re.I)
+JSON_LD_PATTERN = re.compile(r"<script[^>]*type=[\"']application/ld\+json[\"'][^>]*>(.*?)</script>", re.S | re.I)
+
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+
+
+def get_session() -> requests.Session:
+    """Returns the process-wide session, so every scrape reuses pooled keep-alive connections."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            session.headers.update(HEADERS)
+            adapter = HTTPAdapter(
+                pool_connections=HTTP_POOL_SIZE,
+                pool_maxsize=HTTP_POOL_SIZE,
+                max_retries=Retry(total=2, backoff_factor=0.5, status_forcelist=(502, 503, 504), allowed_methods=("GET",)),
+            )
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _session = session
+        return _session
+
+
+def fetch_page(url: str) -> str:
+    """Fetches a page through the shared session and the on-disk HTTP cache.
+
+    Fresh cache entries are served without a request, stale ones are revalidated with
+    their ETag/Last-Modified, and recent failures are raised again without re-fetching.
+
+    Raises:
+        JobScrapingError: If the page cannot be fetched.
+    """
+    cached = http_cache.get(url) if HTTP_CACHE_ENABLED else None
+    if cached and http_cache.is_fresh(cached):
+        if cached.is_failure:
+            logger.info(f"Negative cache hit for {cached.url}")
+            raise JobScrapingError(cached.error)
+        logger.info(f"HTTP cache hit for {cached.url}")
+        return cached.body
+
+    headers = cached.validators() if cached and not cached.is_failure else {}
+    try:
+        response = get_session().get(url.strip(), headers=headers, timeout=REQUEST_TIMEOUT_SECONDS)
+        if response.status_code == 304 and cached:
+            logger.info(f"HTTP cache revalidated {cached.url}")
+            http_cache.touch(cached)
+            return cached.body
+        response.raise_for_status()
+    except requests.exceptions.RequestException as e:
+        error = f"Network error scraping LinkedIn: {str(e)}"
+        if HTTP_CACHE_ENABLED:
+            http_cache.store_failure(url, error)
+        raise JobScrapingError(error) from e
+
+    if HTTP_CACHE_ENABLED:
+        http_cache.store(url, response.text, response.headers.get("ETag", ""), response.headers.get("Last-Modified", ""))
+    return response.text
+
+
+def _json_ld_description(page: str) -> Optional[str]:
+    """Returns the description of the first JSON-LD ``JobPosting`` block, without building a DOM."""
+    for match in JSON_LD_PATTERN.finditer(page):
+        try:
+            data = json.loads(match.group(1))
+        except ValueError:
+            continue
+        candidates = data if isinstance(data, list) else data.get("@graph", [data]) if isinstance(data, dict) else []
+        for item in candidates:
+            if not isinstance(item, dict) or item.get("@type") != "JobPosting":
+                continue
+            description = html.unescape(str(item.get("description", ""))).strip()
+            if "<" in description:
+                description = BeautifulSoup(description, "html.parser").get_text(separator="\n", strip=True)
+            if description:
+                return description
+    return None
+
+
+def _slice_element(page: str, tag: str, class_name: str) -> Optional[str]:
+    """Returns the raw HTML of the first ``tag`` element with ``class_name``, found by scanning tags only."""
+    tag_pattern = re.compile(rf"<(/?){tag}\b[^>]*>", re.I)
+    for opening in tag_pattern.finditer(page):
+        if opening.group(1):
+            continue
+        classes = CLASS_ATTRIBUTE.search(opening.group(0))
+        if not classes or class_name not in (classes.group(1) or classes.group(2) or "").split():
+            continue
+
+        depth = 1
+        for match in tag_pattern.finditer(page, opening.end()):
+            depth += -1 if match.group(1) else 1
+            if depth == 0:
+                return page[opening.start() : match.end()]
+        return page[opening.start() :]
+    return None
+
+
+def _sliced_description(page: str) -> Optional[str]:
+    """Parses only the first element matching a description selector instead of the whole page."""
+    for tag, class_name in DESCRIPTION_SELECTORS:
+        element = _slice_element(page, tag, class_name)
+        if element is not None:
+            text = BeautifulSoup(element, "html.parser").get_text(separator="\n", strip=True)
+            if text:
+                return text
+    return None
+
+
+def _find_description(soup: BeautifulSoup) -> Optional[str]:
+    for tag, class_name in DESCRIPTION_SELECTORS:
+        description_div = soup.find(tag, class_=class_name)
+        if description_div:
+            return description_div.get_text(separator="\n", strip=True)
+    return None
+
+
+def extract_job_description(page: str) -> Optional[str]:
+    """Extracts the job description from a job page, or None if it has none.
+
+    JSON-LD ``JobPosting`` data is preferred; otherwise only the subtree matching the
+    description selectors is parsed, and the full page is parsed as a last resort.
+    """
+    description = _json_ld_description(page) or _sliced_description(page)
+    if description:
+        return description
+
+    return _find_description(BeautifulSoup(page, "html.parser"))
 
 
 def scrape_linkedin_job(url: str) -> str:
@@ -12,40 +169,16 @@ def scrape_linkedin_job(url: str) -> str:
         url: The LinkedIn job posting URL.
 
     Returns:
-        The extracted job description text or an error/warning message.
+        The extracted job description text.
+
+    Raises:
+        JobScrapingError: If the page cannot be fetched or contains no job description.
     """
     if not url.strip():
         return ""
 
-    try:
-        headers = {
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
-        }
-        response = requests.get(url, headers=headers, timeout=10)
-        response.raise_for_status()
-        soup = BeautifulSoup(response.text, "html.parser")
-
-        # LinkedIn often uses these classes for job descriptions in their public views
-        # We try multiple common selectors
-        description_selectors = [
-            ("div", "description__text"),
-            ("div", "show-more-less-html__markup"),
-            ("section", "description"),
-            ("div", "job-view-main-content"),
-        ]
-
-        description_div: Optional[BeautifulSoup] = None
-        for tag, class_name in description_selectors:
-            description_div = soup.find(tag, class_=class_name)
-            if description_div:
-                break
-
-        if description_div:
-            return description_div.get_text(separator="\n", strip=True)
+    description = extract_job_description(fetch_page(url))
+    if description:
+        return description
 
-        return "Could not find job description text on the page. You may need to paste it manually."
-
-    except requests.exceptions.RequestException as e:
-        return f"Network error scraping LinkedIn: {str(e)}"
-    except Exception as e:
-        return f"Unexpected error scraping LinkedIn: {str(e)}"
+    raise JobScrapingError("Could not find job description text on the page. You may need to paste it manually.")
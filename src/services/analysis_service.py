@@ -1,56 +1,236 @@
-from typing import Any, Callable, List, Optional, Tuple
+import hashlib
+import time
+from functools import partial
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 from crewai import LLM, Agent, Crew, Process, Task
+from crewai.tasks.task_output import TaskOutput
 
 from logger import logger
-from models import AppConfig, Persona
+from models import AnalysisResult, AppConfig, Persona, TaskResult
 from prompts import (
+    AGENT_PROMPT_TEMPLATE,
+    AGENT_SYSTEM_TEMPLATE,
     BOARD_HEAD_BACKSTORY,
     BOARD_HEAD_TASK_DESCRIPTION,
+    JOB_DESCRIPTION_REFERENCE,
     OPTIMIZER_AGENT_BACKSTORY,
     OPTIMIZER_TASK_DESCRIPTION,
     REFORMATTER_AGENT_BACKSTORY,
     REFORMATTER_TASK_DESCRIPTION,
+    SHARED_CONTEXT_TEMPLATE,
+    SPECIALIST_TASK_DESCRIPTION,
 )
+from services.config_service import ConfigService
+from services.cv_service import CVService
+from services.llm_clients import llm_client_pool
+from services.llm_resilience import FailoverChain, failover_chain, llm_resilience
+from services.rate_limiter import ANONYMOUS_SESSION, rate_limiter
+from services.response_cache import response_cache
+from services.stream_router import StreamCallback, stream_router
+from services.task_scheduler import TaskScheduler
+from services.token_budget import PromptBudget, RunEstimate, TaskBudget
+
+# CrewAI wraps every task in its own system and ReAct instructions
+AGENT_PROMPT_OVERHEAD_TOKENS = 500
+SPECIALIST_OUTPUT_TOKENS = 1_000
+BOARD_HEAD_OUTPUT_TOKENS = 2_000
+OPTIMIZER_OUTPUT_TOKENS = 1_000
 
 
 class AnalysisService:
     @staticmethod
-    def _configure_llm(config: AppConfig) -> LLM:
-        """Configures the LLM environment and returns the LLM instance."""
-        if config.llm_provider == "Google":
-            return LLM(model=f"gemini/{config.selected_model}", api_key=config.api_key)
+    def hash_api_key(api_key: str) -> str:
+        """Returns a short, non-reversible fingerprint of an API key for use in cache keys."""
+        return hashlib.sha256(api_key.encode("utf-8")).hexdigest()[:16]
+
+    @staticmethod
+    def model_scope(config: AppConfig) -> str:
+        """Names the selected provider/model in cache keys and task fingerprints."""
+        return f"{config.llm_provider}/{config.selected_model}"
+
+    @staticmethod
+    def rate_limit_key(config: AppConfig) -> str:
+        return rate_limiter.make_key(config.llm_provider, config.selected_model)
+
+    @staticmethod
+    def _create_llm(provider: str, model: str, api_key: str, stream: bool = False) -> LLM:
+        """Builds an LLM with an explicit API key on the shared, keep-alive provider client.
+
+        The key is never written to ``os.environ`` or an SDK's global config (model listing uses
+        a client of its own too), so concurrent sessions cannot pick up each other's keys.
+        """
+        if provider == "Google":
+            llm = LLM(model=f"gemini/{model}", api_key=api_key, stream=stream)
         else:
             # For OpenAI, CrewAI expects "gpt-4o" or "openai/gpt-4o"
-            return LLM(model=config.selected_model, api_key=config.api_key)
+            llm = LLM(model=model, api_key=api_key, stream=stream)
+        return llm_client_pool.attach(llm)
+
+    @staticmethod
+    def model_chain(config: AppConfig) -> List[Tuple[str, str, str]]:
+        """Returns the (provider, model, api_key) of the selected model followed by its usable fallbacks.
+
+        Fallbacks of the selected provider reuse the session's API key; other providers
+        need their key configured in the environment.
+        """
+        chain = [(config.llm_provider, config.selected_model, config.api_key)]
+        for provider, model in config.fallback_models:
+            if any((provider, model) == (known_provider, known_model) for known_provider, known_model, _ in chain):
+                continue
+            api_key = config.api_key if provider == config.llm_provider else ConfigService.get_env_api_key(provider)
+            if not api_key:
+                logger.warning(f"Skipping fallback model {provider}/{model}: no API key configured for {provider}.")
+                continue
+            chain.append((provider, model, api_key))
+        return chain
+
+    @staticmethod
+    def configure_llm(config: AppConfig, stream: bool = False, session_id: str = "") -> LLM:
+        """Configures the LLM environment and returns the LLM instance.
+
+        Its calls pass through the shared rate limiter on behalf of ``session_id``, are
+        retried, hedged and circuit-broken per provider/model (see ``llm_resilience``), and
+        move down the fallback chain while a model keeps failing.
+        """
+        routes = []
+        for provider, model, api_key in AnalysisService.model_chain(config):
+            key = rate_limiter.make_key(provider, model)
+            admit = partial(rate_limiter.acquire, key, session_id or ANONYMOUS_SESSION)
+            llm = AnalysisService._create_llm(provider, model, api_key, stream)
+            routes.append((key, llm_resilience.wrap(llm, key, admit=admit)))
+        return FailoverChain(routes).install()
+
+    @staticmethod
+    def _agent_templates(cv_content: str, job_description: str) -> Dict[str, str]:
+        """Returns the CrewAI prompt templates that put the shared CV and job description first.
+
+        Every agent of a run gets byte-identical leading text, so providers can serve it
+        from their prompt prefix cache after the first request.
+        """
+        shared_context = SHARED_CONTEXT_TEMPLATE.format(cv_content=cv_content, job_description=job_description)
+        # CrewAI substitutes these placeholders anywhere in the system template, including the CV
+        for placeholder in ("{role}", "{goal}", "{backstory}"):
+            shared_context = shared_context.replace(placeholder, placeholder.replace("{", "{ ").replace("}", " }"))
+        return {
+            "system_template": AGENT_SYSTEM_TEMPLATE.format(shared_context=shared_context),
+            "prompt_template": AGENT_PROMPT_TEMPLATE,
+        }
+
+    @staticmethod
+    def _specialist_backstory(persona: Persona) -> str:
+        if "{job_description}" in persona.backstory:
+            return persona.backstory.format(job_description=JOB_DESCRIPTION_REFERENCE)
+        return persona.backstory
+
+    @staticmethod
+    def _task_budgets(personas: List[Persona], user_answers: str, cv_tokens: int) -> List[TaskBudget]:
+        """Describes the prompt of every crew task for budgeting, without the CV and job description.
+
+        Every task carries the shared context, i.e. one copy of each input.
+        """
+        shared_text = SHARED_CONTEXT_TEMPLATE.format(cv_content="", job_description="")
+        budgets = []
+        for persona in personas:
+            budgets.append(
+                TaskBudget(
+                    label=persona.name,
+                    fixed_text="\n".join(
+                        [
+                            shared_text,
+                            persona.name,
+                            persona.goal,
+                            AnalysisService._specialist_backstory(persona),
+                            SPECIALIST_TASK_DESCRIPTION,
+                        ]
+                    ),
+                    cv_copies=1,
+                    job_copies=1,
+                    context_tokens=AGENT_PROMPT_OVERHEAD_TOKENS,
+                    expected_output_tokens=SPECIALIST_OUTPUT_TOKENS,
+                    parallel=True,
+                )
+            )
+
+        budgets.append(
+            TaskBudget(
+                label="Board Head",
+                fixed_text=shared_text + BOARD_HEAD_BACKSTORY + BOARD_HEAD_TASK_DESCRIPTION,
+                cv_copies=1,
+                job_copies=1,
+                context_tokens=AGENT_PROMPT_OVERHEAD_TOKENS + SPECIALIST_OUTPUT_TOKENS * len(personas),
+                expected_output_tokens=BOARD_HEAD_OUTPUT_TOKENS,
+            )
+        )
+        budgets.append(
+            TaskBudget(
+                label="Optimizer",
+                fixed_text=shared_text + OPTIMIZER_AGENT_BACKSTORY + OPTIMIZER_TASK_DESCRIPTION,
+                cv_copies=1,
+                job_copies=1,
+                context_tokens=AGENT_PROMPT_OVERHEAD_TOKENS,
+                expected_output_tokens=OPTIMIZER_OUTPUT_TOKENS,
+            )
+        )
+        budgets.append(
+            TaskBudget(
+                label="Reformatter",
+                fixed_text=shared_text
+                + REFORMATTER_AGENT_BACKSTORY
+                + REFORMATTER_TASK_DESCRIPTION.format(user_answers=user_answers),
+                cv_copies=1,
+                job_copies=1,
+                context_tokens=AGENT_PROMPT_OVERHEAD_TOKENS + OPTIMIZER_OUTPUT_TOKENS,
+                # The rewritten CV is about as long as the original
+                expected_output_tokens=max(1_500, int(cv_tokens * 1.2)),
+            )
+        )
+        return budgets
+
+    @staticmethod
+    def _budget_for_run(
+        personas: List[Persona], cv_content: str, config: AppConfig, user_answers: str
+    ) -> Tuple[PromptBudget, List[TaskBudget]]:
+        budget = PromptBudget(config.selected_model)
+        return budget, AnalysisService._task_budgets(personas, user_answers, budget.count(cv_content))
+
+    @staticmethod
+    def fit_inputs(
+        personas: List[Persona], cv_content: str, job_description: str, config: AppConfig, user_answers: str = ""
+    ) -> Tuple[str, str]:
+        """Returns the CV and job description truncated, if needed, to fit every task into the model's context window."""
+        budget, tasks = AnalysisService._budget_for_run(personas, cv_content, config, user_answers)
+        return budget.fit(tasks, cv_content, job_description)
+
+    @staticmethod
+    def estimate_run(
+        personas: List[Persona], cv_content: str, job_description: str, config: AppConfig, user_answers: str = ""
+    ) -> RunEstimate:
+        """Estimates the input/output tokens, list-price cost and duration of an analysis run."""
+        budget, tasks = AnalysisService._budget_for_run(personas, cv_content, config, user_answers)
+        return budget.estimate(tasks, cv_content, job_description)
 
     @staticmethod
     def _create_specialist_agents(
-        personas: List[Persona], cv_content: str, job_description: str, model: LLM
+        personas: List[Persona], templates: Dict[str, str], model: LLM
     ) -> Tuple[List[Agent], List[Task]]:
         """Creates specialist agents and their analysis tasks."""
         agents = []
         tasks = []
 
         for persona in personas:
-            backstory = persona.backstory
-            if "{job_description}" in backstory:
-                backstory = backstory.format(job_description=job_description)
-
             specialist_agent = Agent(
                 role=persona.name,
                 goal=persona.goal,
-                backstory=backstory,
+                backstory=AnalysisService._specialist_backstory(persona),
                 llm=model,
                 verbose=True,
                 allow_delegation=False,
+                **templates,
             )
 
             specialist_task = Task(
-                description=(
-                    f"Analyze the candidate's CV: {cv_content[:15000]} based on your expertise. "
-                    f"Consider the job description: {job_description}"
-                ),
+                description=SPECIALIST_TASK_DESCRIPTION,
                 expected_output=f"A detailed critique from the perspective of a {persona.name}.",
                 agent=specialist_agent,
                 async_execution=True,
@@ -68,19 +248,34 @@ class AnalysisService:
         config: AppConfig,
         user_answers: str = "",
         task_callback: Optional[Callable[[Any], None]] = None,
+        stream_output: bool = False,
+        session_id: str = "",
     ) -> Crew:
-        """Creates and configures a CrewAI crew for CV analysis using domain models."""
+        """Creates and configures a CrewAI crew for CV analysis using domain models.
+
+        With ``stream_output`` the Board Head and Reformatter, whose reports are shown
+        to the user, stream their tokens (see ``run_crew``'s ``stream_callback``).
+        Every LLM call of the crew goes through the shared rate limiter on behalf of ``session_id``.
+        """
 
         logger.info(f"Creating analysis crew with {len(selected_personas)} specialists...")
 
-        crew_model = AnalysisService._configure_llm(config)
+        cv_content, job_description = AnalysisService.fit_inputs(
+            selected_personas, cv_content, job_description, config, user_answers
+        )
+
+        templates = AnalysisService._agent_templates(cv_content, job_description)
+        crew_model = AnalysisService.configure_llm(config, session_id=session_id)
+        report_model = (
+            AnalysisService.configure_llm(config, stream=True, session_id=session_id) if stream_output else crew_model
+        )
 
         agents = []
         tasks = []
 
         # 1. Specialist Agents
         specialist_agents, specialist_tasks = AnalysisService._create_specialist_agents(
-            selected_personas, cv_content, job_description, crew_model
+            selected_personas, templates, crew_model
         )
         agents.extend(specialist_agents)
         tasks.extend(specialist_tasks)
@@ -90,9 +285,10 @@ class AnalysisService:
             role="Board Head for CV Excellence",
             goal="Synthesize all specialist findings into one final actionable recommendation",
             backstory=BOARD_HEAD_BACKSTORY,
-            llm=crew_model,
+            llm=report_model,
             verbose=True,
             allow_delegation=False,
+            **templates,
         )
 
         final_recommendation_task = Task(
@@ -113,12 +309,11 @@ class AnalysisService:
             llm=crew_model,
             verbose=True,
             allow_delegation=False,
+            **templates,
         )
 
         optimization_task = Task(
-            description=OPTIMIZER_TASK_DESCRIPTION.format(
-                cv_content_snippet=cv_content[:15000], job_description=job_description
-            ),
+            description=OPTIMIZER_TASK_DESCRIPTION,
             expected_output="A conversational list of high-impact advice and specific phrasing recommendations.",
             agent=optimizer_agent,
             callback=task_callback,
@@ -131,13 +326,14 @@ class AnalysisService:
             role="Expert CV Reformatter",
             goal="Rewrite the candidate CV into a professional, modern Markdown format incorporating board feedback.",
             backstory=REFORMATTER_AGENT_BACKSTORY,
-            llm=crew_model,
+            llm=report_model,
             verbose=True,
             allow_delegation=False,
+            **templates,
         )
 
         reformat_task = Task(
-            description=REFORMATTER_TASK_DESCRIPTION.format(cv_content_snippet=cv_content[:15000], user_answers=user_answers),
+            description=REFORMATTER_TASK_DESCRIPTION.format(user_answers=user_answers),
             expected_output="The complete, polished CV with all original sections and minimal improvements, formatted in clean Markdown.",
             agent=reformatter_agent,
             context=[optimization_task],
@@ -162,3 +358,181 @@ class AnalysisService:
 
         logger.info("Analysis crew successfully created.")
         return analysis_crew
+
+    @staticmethod
+    def create_interview_crew(cv_content: str, config: AppConfig, session_id: str = "") -> Crew:
+        """Creates a one-agent crew that asks the candidate a few questions about their achievements."""
+        interviewer = Agent(
+            role="Board Interviewer",
+            goal="Identify gaps and ask 3-4 targeted questions.",
+            backstory="You are an expert recruiter gathering achievements.",
+            llm=AnalysisService.configure_llm(config, session_id=session_id),
+            allow_delegation=False,
+        )
+        interview_task = Task(
+            description=f"Based on CV: {cv_content[:1500]}, ask 3 specific questions.",
+            expected_output="3 numbered questions.",
+            agent=interviewer,
+        )
+        return Crew(agents=[interviewer], tasks=[interview_task], verbose=False)
+
+    @staticmethod
+    def build_result(crew: Crew, output: Any, wall_clock_seconds: float = 0.0, scope: str = "") -> AnalysisResult:
+        """Condenses a finished crew run into an ``AnalysisResult`` with cleaned reports.
+
+        The crew's tasks are laid out as [...specialists, board head, optimization, reformat].
+        """
+        tasks_output = list(getattr(output, "tasks_output", None) or [])
+
+        final_cv = tasks_output[-1].raw if len(tasks_output) >= 1 else str(output)
+        minimal_changes = tasks_output[-2].raw if len(tasks_output) >= 2 else "Optimization data not found."
+        board_report = tasks_output[-3].raw if len(tasks_output) >= 3 else str(output)
+
+        # Tasks served from the response cache or reused from an earlier run were not executed and count as 0s
+        durations = [task.execution_duration or 0.0 for task in crew.tasks]
+        fingerprints = [TaskScheduler.fingerprint(task, scope) for task in crew.tasks]
+        tasks = [
+            TaskResult(
+                role=str(task_output.agent),
+                description=task_output.description,
+                raw=str(task_output.raw),
+                expected_output=task_output.expected_output or "",
+                seconds=durations[i] if i < len(durations) else 0.0,
+                fingerprint=fingerprints[i] if i < len(fingerprints) else "",
+            )
+            for i, task_output in enumerate(tasks_output)
+        ]
+        try:
+            token_usage = AnalysisService.token_usage(crew)
+        except Exception as e:
+            logger.warning(f"Could not read token usage: {str(e)}")
+            token_usage = {}
+
+        return AnalysisResult(
+            board_report=CVService.clean_markdown_code_blocks(str(board_report)),
+            minimal_changes=CVService.clean_markdown_code_blocks(str(minimal_changes)),
+            final_cv=CVService.clean_markdown_code_blocks(str(final_cv)),
+            tasks=tasks,
+            token_usage=token_usage,
+            wall_clock_seconds=wall_clock_seconds,
+        )
+
+    @staticmethod
+    def _create_scheduler(config: AppConfig, thread_initializer: Optional[Callable[[], None]] = None) -> TaskScheduler:
+        parallel = config.execution_mode == "parallel"
+        return TaskScheduler(
+            max_workers=config.max_workers if parallel else 1,
+            thread_initializer=thread_initializer,
+            cache=response_cache if config.use_response_cache else None,
+            cache_scope=AnalysisService.model_scope(config),
+            implicit_context=not parallel,
+        )
+
+    @staticmethod
+    def token_usage(crew: Crew) -> Dict[str, int]:
+        """Returns prompt, cached prompt and completion tokens used by the crew's LLMs.
+
+        Agents share LLM instances, so usage is summed per instance rather than per agent,
+        including the fallback models an instance failed over to.
+        """
+        llms = {}
+        for agent in crew.agents:
+            chain = failover_chain(agent.llm)
+            for llm in chain.llms if chain else [agent.llm]:
+                if hasattr(llm, "get_token_usage_summary"):
+                    llms[id(llm)] = llm
+        usage = {"prompt_tokens": 0, "cached_prompt_tokens": 0, "completion_tokens": 0}
+        for llm in llms.values():
+            summary = llm.get_token_usage_summary()
+            for name in usage:
+                usage[name] += getattr(summary, name, 0) or 0
+        return usage
+
+    @staticmethod
+    def served_models(crew: Crew) -> Dict[str, str]:
+        """Returns the "provider/model" that answered each task, by agent role.
+
+        Tasks served from the response cache or not run at all are left out.
+        """
+        served = {}
+        for task in crew.tasks:
+            chain = failover_chain(getattr(task.agent, "llm", None))
+            key = chain.served.get(str(task.id)) if chain else None
+            if key:
+                served[str(task.agent.role)] = key
+        return served
+
+    @staticmethod
+    def log_token_usage(crew: Crew):
+        try:
+            usage = AnalysisService.token_usage(crew)
+        except Exception as e:
+            logger.warning(f"Could not read token usage: {str(e)}")
+            return
+        prompt_tokens = usage["prompt_tokens"]
+        cached_share = usage["cached_prompt_tokens"] / prompt_tokens if prompt_tokens else 0.0
+        logger.info(
+            f"Token usage: {prompt_tokens} prompt ({usage['cached_prompt_tokens']} cached, {cached_share:.0%}), "
+            f"{usage['completion_tokens']} completion."
+        )
+
+    @staticmethod
+    def run_crew(
+        crew: Crew,
+        config: AppConfig,
+        thread_initializer: Optional[Callable[[], None]] = None,
+        stream_callback: Optional[StreamCallback] = None,
+    ) -> AnalysisResult:
+        """Runs the crew using the configured execution mode and returns its result.
+
+        Sequential runs without the response cache go straight through ``crew.kickoff()``;
+        everything else is driven by the ``TaskScheduler`` so tasks can be served from cache.
+        ``stream_callback(role, chunk, call_id)`` receives tokens from agents whose LLM streams.
+        """
+        if stream_callback is not None:
+            with stream_router.subscribe(crew.agents, stream_callback):
+                return AnalysisService.run_crew(crew, config, thread_initializer)
+
+        start = time.perf_counter()
+        if config.execution_mode != "parallel" and not config.use_response_cache:
+            output = crew.kickoff()
+            AnalysisService.log_token_usage(crew)
+            return AnalysisService.build_result(crew, output, time.perf_counter() - start, AnalysisService.model_scope(config))
+
+        output, report = AnalysisService._create_scheduler(config, thread_initializer).run(crew)
+        logger.info(f"Analysis finished ({config.execution_mode}): {report.summary()}")
+        if config.use_response_cache:
+            logger.info(f"Response cache stats: {response_cache.stats()}")
+        AnalysisService.log_token_usage(crew)
+        return AnalysisService.build_result(crew, output, report.wall_clock_seconds, AnalysisService.model_scope(config))
+
+    @staticmethod
+    def rerun_changed_tasks(
+        crew: Crew,
+        previous_result: Optional[AnalysisResult],
+        config: AppConfig,
+        thread_initializer: Optional[Callable[[], None]] = None,
+    ) -> AnalysisResult:
+        """Re-runs only the tasks of ``crew`` whose inputs differ from ``previous_result``.
+
+        The crew must have the same task layout as the one that produced ``previous_result``
+        (same personas, same order). A task keeps its previous output only if its fingerprint,
+        which covers the CV and job in the agent's system template and the selected model, and all
+        its upstream tasks are unchanged.
+        """
+        previous_tasks = previous_result.tasks if previous_result else []
+        previous_outputs = [
+            TaskOutput(description=task.description, expected_output=task.expected_output, raw=task.raw, agent=task.role)
+            for task in previous_tasks
+        ]
+        previous_fingerprints = [task.fingerprint for task in previous_tasks]
+        if len(previous_outputs) != len(crew.tasks):
+            logger.warning("Previous result does not match the crew layout; running the full analysis.")
+            previous_outputs, previous_fingerprints = [], []
+
+        output, report = AnalysisService._create_scheduler(config, thread_initializer).run(
+            crew, previous_outputs, previous_fingerprints
+        )
+        logger.info(f"Incremental re-analysis finished: {report.summary()}")
+        AnalysisService.log_token_usage(crew)
+        return AnalysisService.build_result(crew, output, report.wall_clock_seconds, AnalysisService.model_scope(config))
@@ -0,0 +1,221 @@
+"""Headless batch analysis of many CV/job pairs, resumable from a checkpoint file."""
+
+import csv
+import hashlib
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from exceptions import BatchManifestError
+from logger import logger
+from models import AppConfig, Persona
+from services.analysis_service import AnalysisService
+from services.cv_service import CVService
+from services.job_service import JobService
+from services.persona_service import PersonaService
+
+CHECKPOINT_FILE = "checkpoint.jsonl"
+ITEM_COMPLETED = "completed"
+ITEM_FAILED = "failed"
+
+
+@dataclass
+class BatchItem:
+    """One CV/job pair of a batch manifest."""
+
+    item_id: str
+    cv_path: Path
+    job_description: str = ""
+    job_url: str = ""
+    personas: List[str] = field(default_factory=list)
+
+
+@dataclass
+class BatchSummary:
+    completed: List[str] = field(default_factory=list)
+    failed: Dict[str, str] = field(default_factory=dict)
+    skipped: List[str] = field(default_factory=list)
+
+
+def _split_personas(value) -> List[str]:
+    if isinstance(value, list):
+        return [str(name).strip() for name in value if str(name).strip()]
+    return [name.strip() for name in str(value or "").split(";") if name.strip()]
+
+
+def load_manifest(manifest_path: Path, default_personas: Optional[List[str]] = None) -> List[BatchItem]:
+    """Reads a CSV or JSON Lines manifest.
+
+    Each row needs ``cv`` (a path relative to the manifest) and one of ``job_description``,
+    ``job_file`` or ``job_url``; ``personas`` (a list, or ``;``-separated in CSV) and ``id`` are
+    optional. Rows without an ID get a stable one derived from their inputs.
+    """
+    try:
+        with open(manifest_path, "r", encoding="utf-8") as f:
+            if manifest_path.suffix.lower() == ".csv":
+                rows = list(csv.DictReader(f))
+            else:
+                rows = [json.loads(line) for line in f if line.strip()]
+    except (OSError, ValueError) as e:
+        raise BatchManifestError(f"Could not read manifest {manifest_path}: {str(e)}") from e
+
+    items = []
+    seen = set()
+    for number, row in enumerate(rows, start=1):
+        if not row.get("cv"):
+            raise BatchManifestError(f"Manifest row {number} has no 'cv' path.")
+        job_description = row.get("job_description") or ""
+        if row.get("job_file"):
+            try:
+                job_description = (manifest_path.parent / row["job_file"]).read_text(encoding="utf-8")
+            except (OSError, ValueError) as e:
+                label = f"row {number} ('{row['id']}')" if row.get("id") else f"row {number}"
+                raise BatchManifestError(f"Manifest {label} could not read job_file {row['job_file']}: {str(e)}") from e
+        job_url = row.get("job_url") or ""
+        if not job_description and not job_url:
+            raise BatchManifestError(f"Manifest row {number} needs 'job_description', 'job_file' or 'job_url'.")
+
+        personas = _split_personas(row.get("personas")) or list(default_personas or [])
+        item_id = (
+            str(row.get("id") or "").strip()
+            or hashlib.sha256(json.dumps([row["cv"], job_description, job_url, personas]).encode("utf-8")).hexdigest()[:12]
+        )
+        if item_id in seen:
+            raise BatchManifestError(f"Manifest row {number} repeats item ID '{item_id}'.")
+        seen.add(item_id)
+
+        items.append(
+            BatchItem(
+                item_id=item_id,
+                cv_path=manifest_path.parent / row["cv"],
+                job_description=job_description,
+                job_url=job_url,
+                personas=personas,
+            )
+        )
+    return items
+
+
+class BatchCheckpoint:
+    """Append-only record of finished items, so an interrupted batch can resume where it stopped."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def completed_ids(self) -> set:
+        if not self.path.exists():
+            return set()
+        completed = set()
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    # A line cut short by an interrupted write
+                    continue
+                if entry.get("status") == ITEM_COMPLETED:
+                    completed.add(entry["id"])
+        return completed
+
+    def record(self, item_id: str, status: str, error: str = ""):
+        entry = {"id": item_id, "status": status, "error": error, "finished_at": time.time()}
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry) + "\n")
+
+
+class BatchService:
+    """Runs the analysis crew for every manifest item with bounded concurrency."""
+
+    def __init__(self, config: AppConfig, output_dir: Path, concurrency: int = 2):
+        self.config = config
+        self.output_dir = output_dir
+        self.concurrency = max(1, concurrency)
+        self.checkpoint = BatchCheckpoint(output_dir / CHECKPOINT_FILE)
+
+    @staticmethod
+    def resolve_personas(names: List[str]) -> List[Persona]:
+        """Maps display names ("Name (source)") or plain persona names to catalog personas."""
+        catalog = PersonaService.load_personas()
+        by_name = {}
+        for persona in catalog.values():
+            by_name.setdefault(persona.name, persona)
+
+        personas = []
+        for name in names:
+            persona = catalog.get(name) or by_name.get(name)
+            if persona is None:
+                raise BatchManifestError(f"Unknown persona '{name}'.")
+            personas.append(persona)
+        return personas
+
+    def process_item(self, item: BatchItem):
+        """Analyzes one item and writes its reports, PDF and the models that served each task to ``output_dir/<item_id>``."""
+        cv_content = CVService.parse_cv_file(item.cv_path.read_bytes(), item.cv_path.name)
+        job_description = item.job_description or JobService.scrape_job(item.job_url)
+        personas = self.resolve_personas(item.personas)
+        if not personas:
+            raise BatchManifestError("No personas selected.")
+
+        crew = AnalysisService.create_analysis_crew(
+            selected_personas=personas,
+            cv_content=cv_content,
+            job_description=job_description,
+            config=self.config,
+            session_id=f"batch-{item.item_id}",
+        )
+        result = AnalysisService.run_crew(crew, self.config)
+
+        item_dir = self.output_dir / item.item_id
+        item_dir.mkdir(parents=True, exist_ok=True)
+        (item_dir / "board_report.md").write_text(result.board_report, encoding="utf-8")
+        (item_dir / "minimal_changes.md").write_text(result.minimal_changes, encoding="utf-8")
+        (item_dir / "optimized_cv.md").write_text(result.final_cv, encoding="utf-8")
+        (item_dir / "served_models.json").write_text(
+            json.dumps(AnalysisService.served_models(crew), indent=2), encoding="utf-8"
+        )
+        pdf_bytes = CVService.generate_pdf(result.final_cv)
+        if pdf_bytes:
+            (item_dir / "optimized_cv.pdf").write_bytes(pdf_bytes)
+
+    def _run_item(self, item: BatchItem) -> Optional[str]:
+        """Processes and checkpoints one item, returning the error message if it failed."""
+        try:
+            logger.info(f"Batch item {item.item_id}: starting analysis of {item.cv_path.name}")
+            self.process_item(item)
+        except Exception as e:
+            logger.error(f"Batch item {item.item_id} failed: {str(e)}")
+            self.checkpoint.record(item.item_id, ITEM_FAILED, str(e))
+            return str(e) or type(e).__name__
+        self.checkpoint.record(item.item_id, ITEM_COMPLETED)
+        logger.info(f"Batch item {item.item_id}: completed")
+        return None
+
+    def run(self, items: List[BatchItem]) -> BatchSummary:
+        """Processes every item not already completed according to the checkpoint."""
+        summary = BatchSummary()
+        done = self.checkpoint.completed_ids()
+        pending = []
+        for item in items:
+            if item.item_id in done:
+                summary.skipped.append(item.item_id)
+            else:
+                pending.append(item)
+        logger.info(f"Batch: {len(pending)} items to process, {len(summary.skipped)} already completed.")
+
+        with ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="batch") as executor:
+            futures = {executor.submit(self._run_item, item): item for item in pending}
+            for future in as_completed(futures):
+                item_id = futures[future].item_id
+                error = future.result()
+                if error is None:
+                    summary.completed.append(item_id)
+                else:
+                    summary.failed[item_id] = error
+        return summary
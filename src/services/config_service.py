@@ -1,15 +1,18 @@
 import os
-from typing import List
+from typing import Dict, List, Optional, Tuple
 
-from exceptions import LLMProviderError
-from llm_utils import DEFAULT_GEMINI_MODELS, DEFAULT_OPENAI_MODELS, get_available_models
+from llm_utils import DEFAULT_GEMINI_MODELS, DEFAULT_OPENAI_MODELS
 from logger import logger
+from services.model_catalog import model_catalog
 
 CHEAP_MODELS = {
     "Google": os.getenv("GEMINI_MODEL", "gemini-2.0-flash-lite"),
     "OpenAI": "gpt-4o-mini",
 }
 
+EXECUTION_MODES = ("sequential", "parallel")
+PROVIDERS = ("Google", "OpenAI")
+
 
 class ConfigService:
     @staticmethod
@@ -23,26 +26,73 @@ class ConfigService:
         return os.getenv("OPENAI_API_KEY", "")
 
     @staticmethod
-    def fetch_models(provider: str, api_key: str) -> List[str]:
+    def _default_models(provider: str) -> List[str]:
+        return list(DEFAULT_GEMINI_MODELS if provider == "Google" else DEFAULT_OPENAI_MODELS)
+
+    @staticmethod
+    def fetch_models(provider: str, api_key: str, timeout: Optional[float] = None) -> Tuple[List[str], bool]:
+        """Returns the models available to ``api_key``, from the shared model catalog, and whether the key is validated.
+
+        If the provider takes longer than ``timeout`` to list them, the default models are
+        returned unvalidated while the listing finishes in the background; an empty list
+        means the key was rejected.
+        """
         if not api_key:
             logger.warning(f"Attempted to fetch models for {provider} without an API key.")
-            return []
+            return [], False
 
         # Use defaults if using system key
         system_key = ConfigService.get_env_api_key(provider)
         if api_key == system_key:
             logger.info(f"Using system default models for {provider}.")
-            return DEFAULT_GEMINI_MODELS if provider == "Google" else DEFAULT_OPENAI_MODELS
+            return ConfigService._default_models(provider), True
+
+        models = model_catalog.get(provider, api_key, timeout)
+        if models is None:
+            return ConfigService._default_models(provider), False
+        return models, True
+
+    @staticmethod
+    def prefetch_models(api_keys: Dict[str, str]):
+        """Starts listing the models of every provider in ``api_keys`` concurrently, without waiting."""
+        for provider, api_key in api_keys.items():
+            if api_key and api_key != ConfigService.get_env_api_key(provider):
+                model_catalog.prefetch(provider, api_key)
+
+    @staticmethod
+    def get_execution_mode() -> str:
+        """Returns "parallel" to schedule tasks as a dependency graph, otherwise "sequential"."""
+        mode = os.getenv("EXECUTION_MODE", "sequential").lower()
+        return mode if mode in EXECUTION_MODES else "sequential"
 
+    @staticmethod
+    def get_max_workers() -> int:
         try:
-            logger.info(f"Fetching available models for {provider}...")
-            models = get_available_models(api_key, provider)
-            logger.info(f"Successfully fetched {len(models)} models for {provider}.")
-            return models
-        except Exception as e:
-            logger.error(f"Failed to fetch models for {provider}: {str(e)}")
-            raise LLMProviderError(f"Could not retrieve models from {provider}. Please check your API key.") from e
+            return max(1, int(os.getenv("MAX_PARALLEL_TASKS", "4")))
+        except ValueError:
+            return 4
+
+    @staticmethod
+    def get_response_cache_enabled() -> bool:
+        return os.getenv("LLM_CACHE_ENABLED", "true").lower() == "true"
+
+    @staticmethod
+    def get_memory_page_enabled() -> bool:
+        """Whether the session memory report is served at ``?page=memory``."""
+        return os.getenv("SESSION_MEMORY_PAGE_ENABLED", "false").lower() == "true"
 
     @staticmethod
     def get_cheap_model(provider: str) -> str:
         return CHEAP_MODELS.get(provider, "")
+
+    @staticmethod
+    def get_fallback_models() -> List[Tuple[str, str]]:
+        """Parses LLM_FALLBACK_MODELS, e.g. "Google:gemini-2.0-flash,OpenAI:gpt-4o-mini", into (provider, model) pairs."""
+        fallbacks = []
+        for entry in filter(None, (entry.strip() for entry in os.getenv("LLM_FALLBACK_MODELS", "").split(","))):
+            provider, _, model = entry.partition(":")
+            if provider.strip() not in PROVIDERS or not model.strip():
+                logger.warning(f"Ignoring invalid LLM_FALLBACK_MODELS entry '{entry}'.")
+                continue
+            fallbacks.append((provider.strip(), model.strip()))
+        return fallbacks
@@ -1,5 +1,14 @@
+import hashlib
 import io
-from typing import Optional
+import multiprocessing
+import os
+import signal
+import tempfile
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, List, Optional, Tuple
 
 from fpdf import FPDF
 from pypdf import PdfReader
@@ -12,26 +21,192 @@ A4_WIDTH_MM = 210
 MARGIN_MM = 20
 EFFECTIVE_WIDTH = A4_WIDTH_MM - (2 * MARGIN_MM) - 5  # 5mm safety buffer
 
+# Markdown Layout Constants
+BLOCK_BLANK = "blank"
+BLOCK_H1 = "h1"
+BLOCK_H2 = "h2"
+BLOCK_H3 = "h3"
+BLOCK_BULLET = "bullet"
+BLOCK_BODY = "body"
+GROUPABLE_BLOCKS = {BLOCK_BLANK, BLOCK_BULLET, BLOCK_BODY}
+BLOCK_FONTS = {
+    BLOCK_H1: ("B", 24),
+    BLOCK_H2: ("B", 16),
+    BLOCK_H3: ("B", 14),
+    BLOCK_BULLET: ("", 10),
+    BLOCK_BODY: ("", 10),
+}
+
+PDF_TRANSLATION_TABLE = str.maketrans(
+    {
+        "–": "-",
+        "—": "-",
+        "‘": "'",
+        "’": "'",
+        "“": '"',
+        "”": '"',
+        "•": "-",
+        "…": "...",
+    }
+)
+
+# PDF Extraction Constants
+PDF_WORKERS = int(os.getenv("PDF_WORKERS", str(min(4, os.cpu_count() or 1))))
+PDF_PARALLEL_MIN_PAGES = int(os.getenv("PDF_PARALLEL_MIN_PAGES", "4"))  # Smaller files are not worth a worker round trip
+PDF_PAGE_TIMEOUT_SECONDS = float(os.getenv("PDF_PAGE_TIMEOUT_SECONDS", "5"))
+PARSE_CACHE_SIZE = 32
+
+_parse_cache: "OrderedDict[str, str]" = OrderedDict()
+_parse_cache_lock = threading.Lock()
+_pdf_pool: Optional[ProcessPoolExecutor] = None
+_pdf_pool_lock = threading.Lock()
+
+# Generated PDF Cache
+PDF_CACHE_SIZE = 16
+
+_pdf_cache: "OrderedDict[str, bytes]" = OrderedDict()
+_pdf_in_flight: Dict[str, Future] = {}
+_pdf_cache_lock = threading.Lock()
+_pdf_render_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="pdf-render")
+
+# Per worker process: the reader for the file it last extracted from
+_worker_reader: Optional[Tuple[str, PdfReader]] = None
+
+
+class _PageTimeout(Exception):
+    pass
+
+
+def _raise_page_timeout(signum, frame):
+    raise _PageTimeout()
+
+
+def _can_time_pages() -> bool:
+    """Whether the calling thread can bound page extraction with an interval timer (main thread only)."""
+    return hasattr(signal, "setitimer") and threading.current_thread() is threading.main_thread()
+
+
+def _timed_page_text(page, timeout_seconds: float) -> Optional[str]:
+    """Extracts one page's text; returns None if it exceeds the time budget."""
+    use_timer = timeout_seconds > 0 and _can_time_pages()
+    if use_timer:
+        signal.signal(signal.SIGALRM, _raise_page_timeout)
+        signal.setitimer(signal.ITIMER_REAL, timeout_seconds)
+    try:
+        return page.extract_text() or ""
+    except _PageTimeout:
+        return None
+    finally:
+        if use_timer:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+
+
+def _extract_page_text(pdf_path: str, page_number: int, timeout_seconds: float) -> Optional[str]:
+    """Extracts one page in a worker process; returns None if it exceeds the time budget."""
+    global _worker_reader
+    if _worker_reader is None or _worker_reader[0] != pdf_path:
+        _worker_reader = (pdf_path, PdfReader(pdf_path))
+    # Tasks run on the worker's main thread, so the interval timer can interrupt a pathological page
+    return _timed_page_text(_worker_reader[1].pages[page_number], timeout_seconds)
+
+
+def _get_pdf_pool() -> ProcessPoolExecutor:
+    global _pdf_pool
+    with _pdf_pool_lock:
+        if _pdf_pool is None:
+            # Spawn rather than fork: the Streamlit server process is multi-threaded
+            _pdf_pool = ProcessPoolExecutor(max_workers=PDF_WORKERS, mp_context=multiprocessing.get_context("spawn"))
+        return _pdf_pool
+
+
+def _reset_pdf_pool():
+    global _pdf_pool
+    with _pdf_pool_lock:
+        if _pdf_pool is not None:
+            _pdf_pool.shutdown(wait=False, cancel_futures=True)
+        _pdf_pool = None
+
 
 class CVService:
+    @staticmethod
+    def _extract_pages_parallel(file_content: bytes, page_count: int) -> List[str]:
+        """Extracts pages on the process pool, skipping pages that exceed the per-page time budget."""
+        with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as tmp:
+            tmp.write(file_content)
+            pdf_path = tmp.name
+        try:
+            pool = _get_pdf_pool()
+            futures = [
+                pool.submit(_extract_page_text, pdf_path, page_number, PDF_PAGE_TIMEOUT_SECONDS)
+                for page_number in range(page_count)
+            ]
+            return CVService._drop_timed_out_pages([future.result() for future in futures])
+        finally:
+            os.unlink(pdf_path)
+
+    @staticmethod
+    def _drop_timed_out_pages(page_texts: List[Optional[str]]) -> List[str]:
+        texts = []
+        for page_number, page_text in enumerate(page_texts):
+            if page_text is None:
+                logger.warning(f"Skipped PDF page {page_number + 1}: extraction exceeded {PDF_PAGE_TIMEOUT_SECONDS}s")
+                continue
+            texts.append(page_text)
+        return texts
+
+    @staticmethod
+    def _extract_pdf_text(file_content: bytes) -> str:
+        reader = PdfReader(io.BytesIO(file_content))
+        page_count = len(reader.pages)
+
+        # Short files are extracted inline where the page timer can run; Streamlit script threads
+        # cannot install it, so there every file goes to the pool, which enforces the budget
+        timed_inline = PDF_PAGE_TIMEOUT_SECONDS <= 0 or _can_time_pages()
+        use_pool = (page_count >= PDF_PARALLEL_MIN_PAGES and PDF_WORKERS > 1) or (not timed_inline and PDF_WORKERS > 0)
+
+        texts = None
+        if use_pool:
+            try:
+                texts = CVService._extract_pages_parallel(file_content, page_count)
+            except BrokenProcessPool as e:
+                logger.warning(f"PDF worker pool failed, extracting serially: {str(e)}")
+                _reset_pdf_pool()
+        if texts is None:
+            # Without the pool, pages are unbounded off the main thread
+            texts = CVService._drop_timed_out_pages(
+                [_timed_page_text(page, PDF_PAGE_TIMEOUT_SECONDS) for page in reader.pages]
+            )
+
+        return "\n".join(text for text in texts if text).strip()
+
     @staticmethod
     def parse_cv_file(file_content: bytes, filename: str) -> str:
-        """Parses an uploaded CV file (PDF or TXT) and returns its text content."""
+        """Parses an uploaded CV file (PDF or TXT) and returns its text content.
+
+        Results are memoized by the SHA-256 of the file bytes, so re-uploads are instant.
+        """
         try:
             logger.info("Parsing CV file: %s", filename)
             lower_filename = filename.lower()
+            digest = f"{hashlib.sha256(file_content).hexdigest()}:{os.path.splitext(lower_filename)[1]}"
+            with _parse_cache_lock:
+                if digest in _parse_cache:
+                    _parse_cache.move_to_end(digest)
+                    logger.info("Using cached text for %s", filename)
+                    return _parse_cache[digest]
+
             if lower_filename.endswith(".pdf"):
-                reader = PdfReader(io.BytesIO(file_content))
-                content = ""
-                for page in reader.pages:
-                    page_text = page.extract_text()
-                    if page_text:
-                        content += page_text + "\n"
-                return content.strip()
+                content = CVService._extract_pdf_text(file_content)
             elif lower_filename.endswith(".txt"):
-                return file_content.decode("utf-8").strip()
+                content = file_content.decode("utf-8").strip()
             else:
                 raise FileProcessingError(f"Unsupported file format: {filename}. Please upload a PDF or TXT file.")
+
+            with _parse_cache_lock:
+                _parse_cache[digest] = content
+                while len(_parse_cache) > PARSE_CACHE_SIZE:
+                    _parse_cache.popitem(last=False)
+            return content
         except Exception as e:
             logger.error(f"Error parsing CV file {filename}: {str(e)}")
             raise FileProcessingError("Failed to read the CV file. Please ensure it is a valid PDF or TXT file.") from e
@@ -39,20 +214,43 @@ class CVService:
     @staticmethod
     def _sanitize_text_for_pdf(text: str) -> str:
         """Sanitizes text to be compatible with FPDF Latin-1 encoding."""
-        replacements = {
-            "–": "-",
-            "—": "-",
-            "‘": "'",
-            "’": "'",
-            "“": '"',
-            "”": '"',
-            "•": "-",
-            "…": "...",
-        }
-        for char, replacement in replacements.items():
-            text = text.replace(char, replacement)
+        text = text.translate(PDF_TRANSLATION_TABLE)
+        if text.isascii():
+            return text
         return text.encode("latin-1", "replace").decode("latin-1")
 
+    @staticmethod
+    def _tokenize_markdown(text: str) -> List[Tuple[str, List[str]]]:
+        """Splits markdown into blocks in one pass, grouping consecutive lines with the same style.
+
+        Lines with unbalanced inline markers stay in their own block so FPDF's
+        markdown styling cannot leak into the following lines.
+        """
+        blocks: List[Tuple[str, List[str]]] = []
+        can_extend = False
+        for raw_line in text.split("\n"):
+            line = raw_line.strip()
+            if not line:
+                kind, content = BLOCK_BLANK, ""
+            elif line.startswith("# "):
+                kind, content = BLOCK_H1, line[2:].upper()
+            elif line.startswith("## "):
+                kind, content = BLOCK_H2, line[3:].upper()
+            elif line.startswith("### "):
+                kind, content = BLOCK_H3, line[3:].strip()
+            elif line.startswith("- ") or line.startswith("* "):
+                kind, content = BLOCK_BULLET, "- " + line[2:]
+            else:
+                kind, content = BLOCK_BODY, line
+
+            balanced = all(content.count(marker) % 2 == 0 for marker in ("**", "__", "--"))
+            if can_extend and balanced and blocks[-1][0] == kind:
+                blocks[-1][1].append(content)
+            else:
+                blocks.append((kind, [content]))
+            can_extend = kind in GROUPABLE_BLOCKS and balanced
+        return blocks
+
     @staticmethod
     def clean_markdown_code_blocks(text: str) -> str:
         """Removes markdown code block syntax if present."""
@@ -65,6 +263,50 @@ class CVService:
             cleaned = cleaned[:-3]
         return cleaned.strip()
 
+    @staticmethod
+    def _pdf_cache_key(cv_markdown: str) -> str:
+        return hashlib.sha256(CVService.clean_markdown_code_blocks(cv_markdown).encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def _render_and_cache_pdf(key: str, cv_markdown: str) -> Optional[bytes]:
+        try:
+            pdf_bytes = CVService.generate_pdf(cv_markdown)
+            if pdf_bytes:
+                with _pdf_cache_lock:
+                    _pdf_cache[key] = pdf_bytes
+                    while len(_pdf_cache) > PDF_CACHE_SIZE:
+                        _pdf_cache.popitem(last=False)
+            return pdf_bytes
+        finally:
+            with _pdf_cache_lock:
+                _pdf_in_flight.pop(key, None)
+
+    @staticmethod
+    def prerender_pdf(cv_markdown: str) -> Future:
+        """Starts rendering the PDF in the background so a later ``get_pdf`` call is served from cache."""
+        key = CVService._pdf_cache_key(cv_markdown)
+        with _pdf_cache_lock:
+            if key in _pdf_in_flight:
+                return _pdf_in_flight[key]
+            future: Future = Future()
+            if key in _pdf_cache:
+                future.set_result(_pdf_cache[key])
+                return future
+            future = _pdf_render_pool.submit(CVService._render_and_cache_pdf, key, cv_markdown)
+            _pdf_in_flight[key] = future
+            return future
+
+    @staticmethod
+    def get_pdf(cv_markdown: str) -> Optional[bytes]:
+        """Returns the PDF for the markdown, cached by the hash of the cleaned content."""
+        key = CVService._pdf_cache_key(cv_markdown)
+        with _pdf_cache_lock:
+            if key in _pdf_cache:
+                _pdf_cache.move_to_end(key)
+                return _pdf_cache[key]
+        # Wait for an in-flight pre-render instead of laying the document out twice
+        return CVService.prerender_pdf(cv_markdown).result()
+
     @staticmethod
     def generate_pdf(cv_markdown: str) -> Optional[bytes]:
         """Generates a professional PDF document from Markdown content (A4, Arial)."""
@@ -79,27 +321,31 @@ class CVService:
             pdf.add_page()
             pdf.set_margins(MARGIN_MM, MARGIN_MM, MARGIN_MM)
 
-            lines = safe_cv.split("\n")
-            for line in lines:
-                line = line.strip()
-                if not line:
-                    pdf.ln(2)
+            current_font = None
+            for kind, lines in CVService._tokenize_markdown(safe_cv):
+                if kind == BLOCK_BLANK:
+                    pdf.ln(2 * len(lines))
                     continue
 
-                if line.startswith("# "):
+                # Consecutive lines of the same style share one font change and one multi_cell call
+                font = BLOCK_FONTS[kind]
+                if font != current_font:
+                    pdf.set_font("helvetica", *font)
+                    current_font = font
+                text = "\n".join(lines)
+
+                if kind == BLOCK_H1:
                     # H1 - Name or Main Title
                     pdf.ln(4)
                     pdf.set_x(MARGIN_MM)
-                    pdf.set_font("helvetica", "B", 24)
-                    pdf.multi_cell(EFFECTIVE_WIDTH, 10, line[2:].upper(), align="C", markdown=True)
+                    pdf.multi_cell(EFFECTIVE_WIDTH, 10, text, align="C", markdown=True)
                     pdf.ln(6)
 
-                elif line.startswith("## "):
+                elif kind == BLOCK_H2:
                     # H2 - Section Headers
                     pdf.ln(6)
                     pdf.set_x(MARGIN_MM)
-                    pdf.set_font("helvetica", "B", 16)
-                    pdf.multi_cell(EFFECTIVE_WIDTH, 8, line[3:].upper(), align="L", markdown=True)
+                    pdf.multi_cell(EFFECTIVE_WIDTH, 8, text, align="L", markdown=True)
 
                     # Horizontal Line
                     current_y = pdf.get_y()
@@ -108,26 +354,21 @@ class CVService:
                     pdf.set_line_width(0.2)
                     pdf.ln(4)
 
-                elif line.startswith("### "):
+                elif kind == BLOCK_H3:
                     # H3 - Subsections
                     pdf.ln(3)
                     pdf.set_x(MARGIN_MM)
-                    pdf.set_font("helvetica", "B", 14)
-                    pdf.multi_cell(EFFECTIVE_WIDTH, 6, line[3:].strip(), align="L", markdown=True)
+                    pdf.multi_cell(EFFECTIVE_WIDTH, 6, text, align="L", markdown=True)
 
-                elif line.startswith("- ") or line.startswith("* "):
+                elif kind == BLOCK_BULLET:
                     # List Items
-                    pdf.set_font("helvetica", size=10)
-                    pdf.set_x(MARGIN_MM)
-                    current_x = pdf.get_x()
-                    pdf.set_x(current_x + 5)
-                    pdf.multi_cell(EFFECTIVE_WIDTH - 5, 5, "- " + line[2:], align="L", markdown=True)
+                    pdf.set_x(MARGIN_MM + 5)
+                    pdf.multi_cell(EFFECTIVE_WIDTH - 5, 5, text, align="L", markdown=True)
 
                 else:
                     # Body Text
-                    pdf.set_font("helvetica", size=10)
                     pdf.set_x(MARGIN_MM)
-                    pdf.multi_cell(EFFECTIVE_WIDTH, 5, line, align="L", markdown=True)
+                    pdf.multi_cell(EFFECTIVE_WIDTH, 5, text, align="L", markdown=True)
 
             logger.info("PDF generated successfully.")
             return bytes(pdf.output())
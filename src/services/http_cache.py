@@ -0,0 +1,189 @@
+"""On-disk HTTP cache for scraped pages, with conditional revalidation and negative caching."""
+
+import os
+import re
+import sqlite3
+import threading
+import time
+import zlib
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterator, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from logger import logger
+
+DEFAULT_CACHE_PATH = os.getenv("HTTP_CACHE_PATH", ".cache/http_pages.sqlite")
+DEFAULT_MAX_BYTES = int(float(os.getenv("HTTP_CACHE_MAX_MB", "100")) * 1024 * 1024)
+DEFAULT_TTL_SECONDS = float(os.getenv("HTTP_CACHE_TTL_HOURS", "12")) * 3600
+DEFAULT_NEGATIVE_TTL_SECONDS = float(os.getenv("HTTP_NEGATIVE_CACHE_TTL_SECONDS", "300"))
+
+# Query parameters that only carry tracking or UI state and never change the page content
+TRACKING_PARAMS = frozenset({"trk", "trkinfo", "refid", "trackingid", "lipi", "position", "pagenum", "originalsubdomain"})
+LINKEDIN_JOB_ID = re.compile(r"/jobs/view/(?:[^/]*?-)?(\d+)/?$")
+
+
+def canonicalize_url(url: str) -> str:
+    """Normalizes a URL so different links to the same page share one cache entry.
+
+    The scheme and host are lower-cased, fragments and tracking parameters are dropped,
+    the remaining query is sorted, and LinkedIn job links are reduced to their job ID.
+    """
+    parts = urlsplit(url.strip())
+    scheme = (parts.scheme or "https").lower()
+    host = parts.netloc.lower()
+    query = [
+        (name, value)
+        for name, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not name.lower().startswith("utm_") and name.lower() not in TRACKING_PARAMS
+    ]
+
+    if host.endswith("linkedin.com"):
+        match = LINKEDIN_JOB_ID.search(parts.path)
+        job_id = match.group(1) if match else dict(query).get("currentJobId", "")
+        if job_id.isdigit():
+            return f"https://www.linkedin.com/jobs/view/{job_id}"
+
+    path = parts.path.rstrip("/") or "/"
+    return urlunsplit((scheme, host, path, urlencode(sorted(query)), ""))
+
+
+@dataclass
+class CachedPage:
+    """A cached response body with its validators, or a cached failure."""
+
+    url: str
+    body: str = ""
+    etag: str = ""
+    last_modified: str = ""
+    error: str = ""
+    fetched_at: float = 0.0
+
+    @property
+    def is_failure(self) -> bool:
+        return bool(self.error)
+
+    def validators(self) -> Dict[str, str]:
+        """Returns the conditional request headers for revalidating this page."""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class HttpCache:
+    """SQLite-backed page cache keyed by canonical URL.
+
+    Successful pages are fresh for ``ttl_seconds`` and may be revalidated with their
+    ETag/Last-Modified afterwards; failures are remembered for ``negative_ttl_seconds``
+    so a broken URL is not re-fetched on every click.
+    """
+
+    def __init__(
+        self,
+        path: str = DEFAULT_CACHE_PATH,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        ttl_seconds: float = DEFAULT_TTL_SECONDS,
+        negative_ttl_seconds: float = DEFAULT_NEGATIVE_TTL_SECONDS,
+    ):
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.negative_ttl_seconds = negative_ttl_seconds
+        self._lock = threading.Lock()
+        self._initialized = False
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """Opens a committed-on-exit connection, creating the schema on first use."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        connection = sqlite3.connect(self.path, timeout=10)
+        try:
+            if not self._initialized:
+                connection.execute(
+                    "CREATE TABLE IF NOT EXISTS pages ("
+                    "url TEXT PRIMARY KEY, body BLOB NOT NULL, etag TEXT NOT NULL, last_modified TEXT NOT NULL, "
+                    "error TEXT NOT NULL, size INTEGER NOT NULL, fetched_at REAL NOT NULL)"
+                )
+                self._initialized = True
+            with connection:
+                yield connection
+        finally:
+            connection.close()
+
+    def get(self, url: str) -> Optional[CachedPage]:
+        """Returns the cached page or failure for ``url``, including stale pages that can be revalidated."""
+        key = canonicalize_url(url)
+        try:
+            with self._lock, self._connect() as connection:
+                row = connection.execute(
+                    "SELECT body, etag, last_modified, error, fetched_at FROM pages WHERE url = ?", (key,)
+                ).fetchone()
+        except sqlite3.Error as e:
+            logger.warning(f"HTTP cache lookup failed: {str(e)}")
+            return None
+        if not row:
+            return None
+        body, etag, last_modified, error, fetched_at = row
+        if error and time.time() - fetched_at > self.negative_ttl_seconds:
+            return None
+        return CachedPage(key, zlib.decompress(body).decode("utf-8"), etag, last_modified, error, fetched_at)
+
+    def is_fresh(self, page: CachedPage) -> bool:
+        ttl = self.negative_ttl_seconds if page.is_failure else self.ttl_seconds
+        return time.time() - page.fetched_at <= ttl
+
+    def store(self, url: str, body: str, etag: str = "", last_modified: str = ""):
+        """Stores a successful response."""
+        self._write(CachedPage(canonicalize_url(url), body, etag or "", last_modified or ""))
+
+    def store_failure(self, url: str, error: str):
+        """Remembers that fetching ``url`` failed."""
+        self._write(CachedPage(canonicalize_url(url), error=error))
+
+    def touch(self, page: CachedPage):
+        """Marks a revalidated page as fresh again."""
+        try:
+            with self._lock, self._connect() as connection:
+                connection.execute("UPDATE pages SET fetched_at = ? WHERE url = ?", (time.time(), page.url))
+        except sqlite3.Error as e:
+            logger.warning(f"HTTP cache write failed: {str(e)}")
+
+    def _write(self, page: CachedPage):
+        now = time.time()
+        body = zlib.compress(page.body.encode("utf-8"))
+        try:
+            with self._lock, self._connect() as connection:
+                connection.execute(
+                    "INSERT OR REPLACE INTO pages (url, body, etag, last_modified, error, size, fetched_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (page.url, body, page.etag, page.last_modified, page.error, len(body), now),
+                )
+                self._evict(connection)
+        except sqlite3.Error as e:
+            logger.warning(f"HTTP cache write failed: {str(e)}")
+
+    def _evict(self, connection: sqlite3.Connection):
+        now = time.time()
+        connection.execute("DELETE FROM pages WHERE error != '' AND fetched_at < ?", (now - self.negative_ttl_seconds,))
+        total = connection.execute("SELECT COALESCE(SUM(size), 0) FROM pages").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for url, size in connection.execute("SELECT url, size FROM pages ORDER BY fetched_at ASC").fetchall():
+            connection.execute("DELETE FROM pages WHERE url = ?", (url,))
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+    def clear(self):
+        with self._lock:
+            if self.path.exists():
+                with self._connect() as connection:
+                    connection.execute("DELETE FROM pages")
+
+
+# Process-wide instance shared by all sessions
+http_cache = HttpCache()
@@ -0,0 +1,131 @@
+"""Background execution of analysis runs, detached from Streamlit reruns."""
+
+import hashlib
+import json
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+from logger import logger
+
+DEFAULT_MAX_WORKERS = int(os.getenv("ANALYSIS_WORKERS", "2"))
+DEFAULT_RETENTION_SECONDS = float(os.getenv("ANALYSIS_JOB_RETENTION_SECONDS", "3600"))
+
+JOB_PENDING = "pending"
+JOB_RUNNING = "running"
+JOB_COMPLETED = "completed"
+JOB_FAILED = "failed"
+
+
+@dataclass
+class AnalysisJob:
+    """State of a single background analysis run."""
+
+    job_id: str
+    key: str
+    status: str = JOB_PENDING
+    result: Any = None
+    error: str = ""
+    created_at: float = field(default_factory=time.time)
+    finished_at: Optional[float] = None
+    task_outputs: Dict[str, str] = field(default_factory=dict)
+    stream_chunks: Dict[str, List[str]] = field(default_factory=dict)
+    stream_calls: Dict[str, str] = field(default_factory=dict)
+    served_models: Dict[str, str] = field(default_factory=dict)
+    result_id: str = ""
+
+    @property
+    def is_finished(self) -> bool:
+        return self.status in (JOB_COMPLETED, JOB_FAILED)
+
+    def record_task_output(self, output: Any):
+        """Task callback that keeps the latest raw output per agent role for live progress views."""
+        role = output.agent
+        if hasattr(role, "role"):
+            role = role.role
+        self.task_outputs[str(role)] = str(output.raw)
+
+    def record_stream_chunk(self, role: str, chunk: str, call_id: str = ""):
+        """Stream callback that accumulates tokens per agent role until the task completes.
+
+        A chunk from a new LLM call (a retry, a failover or the agent's next step) replaces
+        the partial answer of the previous call instead of being appended to it.
+        """
+        if call_id and self.stream_calls.get(role) != call_id:
+            self.stream_calls[role] = call_id
+            self.stream_chunks[role] = []
+        self.stream_chunks.setdefault(role, []).append(chunk)
+
+    def streamed_text(self, role: str) -> str:
+        return "".join(self.stream_chunks.get(role, []))
+
+
+class JobManager:
+    """Runs analysis jobs on a bounded worker pool shared by every session in the process.
+
+    Jobs are deduplicated by an input key, so reruns, reconnects and other tabs
+    submitting the same inputs attach to the in-flight job instead of starting a new one.
+    """
+
+    def __init__(self, max_workers: int = DEFAULT_MAX_WORKERS, retention_seconds: float = DEFAULT_RETENTION_SECONDS):
+        self.retention_seconds = retention_seconds
+        self._executor = ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="analysis-job")
+        self._jobs: Dict[str, AnalysisJob] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(*parts: Any) -> str:
+        """Hashes the inputs of a run into a deduplication key."""
+        return hashlib.sha256(json.dumps(parts, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+    def submit(self, key: str, work: Callable[[AnalysisJob], Any]) -> str:
+        """Queues ``work`` unless a job with the same key is pending or running, and returns the job ID."""
+        with self._lock:
+            self._prune()
+            for job in self._jobs.values():
+                if job.key == key and not job.is_finished:
+                    logger.info(f"Attaching to in-flight analysis job {job.job_id}")
+                    return job.job_id
+
+            job = AnalysisJob(job_id=uuid.uuid4().hex, key=key)
+            self._jobs[job.job_id] = job
+
+        logger.info(f"Submitting analysis job {job.job_id}")
+        self._executor.submit(self._run, job, work)
+        return job.job_id
+
+    def _run(self, job: AnalysisJob, work: Callable[[AnalysisJob], Any]):
+        job.status = JOB_RUNNING
+        try:
+            job.result = work(job)
+            job.status = JOB_COMPLETED
+            logger.info(f"Analysis job {job.job_id} completed.")
+        except Exception as e:
+            job.error = str(e)
+            job.status = JOB_FAILED
+            logger.error(f"Analysis job {job.job_id} failed: {str(e)}")
+        finally:
+            job.finished_at = time.time()
+
+    def get(self, job_id: str) -> Optional[AnalysisJob]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def active_jobs(self) -> List[AnalysisJob]:
+        with self._lock:
+            return [job for job in self._jobs.values() if not job.is_finished]
+
+    def _prune(self):
+        """Drops finished jobs older than the retention window. Caller must hold the lock."""
+        cutoff = time.time() - self.retention_seconds
+        expired = [job_id for job_id, job in self._jobs.items() if job.finished_at and job.finished_at < cutoff]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+
+# Process-wide instance shared by all sessions
+job_manager = JobManager()
@@ -19,6 +19,9 @@ class JobService:
 
             logger.info(f"Successfully scraped {len(content)} characters from {url}")
             return content
+        except JobScrapingError as e:
+            logger.error(f"Error scraping job from {url}: {str(e)}")
+            raise
         except Exception as e:
             logger.error(f"Error scraping job from {url}: {str(e)}")
             raise JobScrapingError(f"Failed to extract job details from the provided URL. Error: {str(e)}") from e
@@ -0,0 +1,71 @@
+"""Provider SDK clients shared by the LLM instances of every session in the process."""
+
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Tuple
+
+from logger import logger
+
+DEFAULT_MAX_CLIENTS = int(os.getenv("LLM_CLIENT_POOL_SIZE", "32"))
+
+ClientKey = Tuple[str, str, str, str]
+
+
+class LLMClientPool:
+    """Reuses one provider SDK client per provider, API key and endpoint.
+
+    CrewAI builds a fresh SDK client, and with it a fresh HTTP connection pool, for every
+    LLM instance. Each analysis run creates its own LLM instances with an explicit API key,
+    so runs would otherwise never reuse a warm keep-alive connection. SDK clients are
+    thread-safe and carry the API key themselves, so sharing them across sessions with the
+    same key cannot leak one user's key into another user's requests.
+    """
+
+    def __init__(self, max_clients: int = DEFAULT_MAX_CLIENTS):
+        self.max_clients = max(1, max_clients)
+        self._clients: "OrderedDict[ClientKey, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(llm: Any) -> ClientKey:
+        api_key = getattr(llm, "api_key", None) or ""
+        return (
+            type(llm).__name__,
+            str(getattr(llm, "provider", "")),
+            hashlib.sha256(api_key.encode("utf-8")).hexdigest()[:16],
+            str(getattr(llm, "base_url", None) or ""),
+        )
+
+    def attach(self, llm: Any) -> Any:
+        """Swaps the SDK client of ``llm`` for the pooled one with the same key, or pools its own."""
+        client = getattr(llm, "_client", None)
+        if client is None:
+            return llm
+        key = self.make_key(llm)
+        with self._lock:
+            pooled = self._clients.get(key)
+            if pooled is None:
+                self._clients[key] = pooled = client
+                if len(self._clients) > self.max_clients:
+                    # In-flight requests keep their evicted client alive until they finish
+                    self._clients.popitem(last=False)
+                    logger.debug("LLM client pool full; evicted the least recently used client.")
+            else:
+                self._clients.move_to_end(key)
+        if pooled is not client:
+            llm._client = pooled
+        return llm
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._clients)
+
+    def clear(self):
+        with self._lock:
+            self._clients.clear()
+
+
+# Process-wide instance shared by all sessions
+llm_client_pool = LLMClientPool()
@@ -0,0 +1,358 @@
+"""Retries with jittered backoff, hedged requests, circuit breaking and model failover for LLM calls."""
+
+import contextvars
+import math
+import os
+import random
+import re
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple, TypeVar
+
+from exceptions import CircuitOpenError, LLMProviderError, RateLimitExceededError
+from logger import logger
+
+DEFAULT_MAX_ATTEMPTS = int(os.getenv("LLM_RETRY_ATTEMPTS", "3"))
+DEFAULT_BASE_DELAY_SECONDS = float(os.getenv("LLM_RETRY_BASE_DELAY_SECONDS", "1"))
+DEFAULT_MAX_DELAY_SECONDS = float(os.getenv("LLM_RETRY_MAX_DELAY_SECONDS", "30"))
+HEDGING_ENABLED = os.getenv("LLM_HEDGING_ENABLED", "false").lower() == "true"
+DEFAULT_FAILURE_THRESHOLD = int(os.getenv("LLM_CIRCUIT_FAILURE_THRESHOLD", "5"))
+DEFAULT_COOLDOWN_SECONDS = float(os.getenv("LLM_CIRCUIT_COOLDOWN_SECONDS", "60"))
+# Hedging only starts once enough calls have been timed to trust the p95
+LATENCY_WINDOW = 50
+MIN_LATENCY_SAMPLES = 10
+HEDGE_WORKERS = 16
+
+RETRYABLE_STATUS_CODES = {408, 429, 500, 502, 503, 504}
+RETRYABLE_STATUS_PATTERN = re.compile(r"\b(408|429|500|502|503|504)\b")
+RETRYABLE_MARKERS = (
+    "timeout",
+    "timed out",
+    "rate limit",
+    "ratelimit",
+    "resource_exhausted",
+    "overloaded",
+    "unavailable",
+    "connection",
+)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+T = TypeVar("T")
+
+
+def _status_code(error: BaseException) -> Optional[int]:
+    for candidate in (error, getattr(error, "response", None)):
+        for attribute in ("status_code", "code"):
+            value = getattr(candidate, attribute, None)
+            if isinstance(value, int):
+                return value
+    return None
+
+
+def is_retryable(error: BaseException) -> bool:
+    """Tells transient provider errors (throttling, 5xx, timeouts, dropped connections) from permanent ones."""
+    if isinstance(error, LLMProviderError):
+        # Our own quota and circuit errors must not be retried
+        return False
+    if isinstance(error, (TimeoutError, ConnectionError)):
+        return True
+    status = _status_code(error)
+    if status is not None:
+        return status in RETRYABLE_STATUS_CODES
+    message = f"{type(error).__name__} {error}".lower()
+    return bool(RETRYABLE_STATUS_PATTERN.search(message)) or any(marker in message for marker in RETRYABLE_MARKERS)
+
+
+class LatencyTracker:
+    """Rolling window of successful call durations for one provider/model."""
+
+    def __init__(self, window: int = LATENCY_WINDOW):
+        self._samples: Deque[float] = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float):
+        with self._lock:
+            self._samples.append(seconds)
+
+    def p95(self) -> Optional[float]:
+        """Returns the 95th percentile latency, or None until enough calls have been timed."""
+        with self._lock:
+            if len(self._samples) < MIN_LATENCY_SAMPLES:
+                return None
+            samples = sorted(self._samples)
+        return samples[min(len(samples) - 1, math.ceil(0.95 * len(samples)) - 1)]
+
+
+class CircuitBreaker:
+    """Stops calling a provider/model after repeated transient failures.
+
+    After ``failure_threshold`` failures in a row the circuit opens and calls fail fast for
+    ``cooldown_seconds``; then a single probe call is let through, which closes the circuit
+    again on success or re-opens it on failure.
+    """
+
+    def __init__(self, failure_threshold: int = DEFAULT_FAILURE_THRESHOLD, cooldown_seconds: float = DEFAULT_COOLDOWN_SECONDS):
+        self.failure_threshold = max(1, failure_threshold)
+        self.cooldown_seconds = cooldown_seconds
+        self.state = CLOSED
+        self.failures = 0
+        self._opened_at = 0.0
+        self._probing = False
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.state == OPEN:
+                if time.monotonic() - self._opened_at < self.cooldown_seconds:
+                    return False
+                self.state = HALF_OPEN
+                self._probing = False
+            if self.state == HALF_OPEN:
+                if self._probing:
+                    return False
+                self._probing = True
+            return True
+
+    def retry_after(self) -> float:
+        with self._lock:
+            if self.state != OPEN:
+                return 0.0
+            return max(0.0, self.cooldown_seconds - (time.monotonic() - self._opened_at))
+
+    def record_success(self):
+        with self._lock:
+            self.state = CLOSED
+            self.failures = 0
+            self._probing = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+                self.state = OPEN
+                self._opened_at = time.monotonic()
+                self._probing = False
+
+
+class ResiliencePolicy:
+    """Retries, hedges and circuit-breaks LLM calls, with breakers and latencies shared per provider/model.
+
+    Retries wait a random "full jitter" delay of up to ``base_delay * 2 ** (attempt - 1)`` seconds.
+    With hedging, a call still running after the model's p95 latency is duplicated and the
+    first response wins; the slower request is abandoned but still runs to completion.
+    """
+
+    def __init__(
+        self,
+        max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+        base_delay: float = DEFAULT_BASE_DELAY_SECONDS,
+        max_delay: float = DEFAULT_MAX_DELAY_SECONDS,
+        hedging: bool = HEDGING_ENABLED,
+        failure_threshold: int = DEFAULT_FAILURE_THRESHOLD,
+        cooldown_seconds: float = DEFAULT_COOLDOWN_SECONDS,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        self.max_attempts = max(1, max_attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.hedging = hedging
+        self.failure_threshold = failure_threshold
+        self.cooldown_seconds = cooldown_seconds
+        self._sleep = sleep
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._latencies: Dict[str, LatencyTracker] = {}
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def breaker(self, key: str) -> CircuitBreaker:
+        with self._lock:
+            if key not in self._breakers:
+                self._breakers[key] = CircuitBreaker(self.failure_threshold, self.cooldown_seconds)
+            return self._breakers[key]
+
+    def latency(self, key: str) -> LatencyTracker:
+        with self._lock:
+            if key not in self._latencies:
+                self._latencies[key] = LatencyTracker()
+            return self._latencies[key]
+
+    def backoff_delay(self, attempt: int) -> float:
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))
+
+    def call(
+        self,
+        key: str,
+        operation: Callable[[], T],
+        admit: Optional[Callable[[], Any]] = None,
+        hedge: bool = False,
+    ) -> T:
+        """Runs ``operation`` for the provider/model ``key``, retrying transient failures.
+
+        ``admit`` is called before every request (the first attempt, retries and hedges) once the
+        circuit allows it, so only requests actually sent pass through the rate limiter.
+
+        Raises:
+            CircuitOpenError: If the provider/model is failing and its circuit is open.
+        """
+        breaker = self.breaker(key)
+        for attempt in range(1, self.max_attempts + 1):
+            if not breaker.allow():
+                raise CircuitOpenError(
+                    f"The AI provider ({key}) is failing repeatedly; calls are paused for "
+                    f"{breaker.retry_after():.0f}s. Please try again shortly."
+                )
+            if admit is not None:
+                admit()
+
+            started = time.monotonic()
+            try:
+                result = self._hedged(key, operation, admit) if hedge else operation()
+            except Exception as e:
+                if not is_retryable(e):
+                    # The provider answered, so it is healthy even though the request was rejected
+                    breaker.record_success()
+                    raise
+                breaker.record_failure()
+                if attempt == self.max_attempts:
+                    raise
+                delay = self.backoff_delay(attempt)
+                logger.warning(
+                    f"LLM call to {key} failed ({type(e).__name__}: {str(e)[:200]}); "
+                    f"retry {attempt}/{self.max_attempts - 1} in {delay:.1f}s."
+                )
+                self._sleep(delay)
+                continue
+
+            breaker.record_success()
+            self.latency(key).record(time.monotonic() - started)
+            return result
+        raise RuntimeError("LLM retry loop finished without a result")
+
+    def _submit(self, operation: Callable[[], T]):
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=HEDGE_WORKERS, thread_name_prefix="llm-hedge")
+            executor = self._executor
+        # CrewAI keeps per-call state (call IDs, stop words) in context variables
+        return executor.submit(contextvars.copy_context().run, operation)
+
+    def _hedged(self, key: str, operation: Callable[[], T], admit: Optional[Callable[[], Any]]) -> T:
+        threshold = self.latency(key).p95()
+        if threshold is None:
+            return operation()
+
+        primary = self._submit(operation)
+        if wait([primary], timeout=threshold).done:
+            return primary.result()
+        if admit is not None:
+            admit()
+        if primary.done():
+            return primary.result()
+
+        logger.info(f"LLM call to {key} exceeded its p95 latency of {threshold:.1f}s; sending a hedged request.")
+        pending = {primary, self._submit(operation)}
+        error: Optional[BaseException] = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    return future.result()
+                error = error or future.exception()
+        raise error
+
+    def wrap(self, llm: Any, key: str, admit: Optional[Callable[[], Any]] = None) -> Any:
+        """Routes every ``llm.call`` through this policy, keeping the LLM instance itself.
+
+        CrewAI identifies LLMs by instance (stop words, hooks), so the
+        call method is replaced in place rather than wrapping the LLM in another object.
+        Streaming LLMs are never hedged, as both requests would stream to the user.
+        """
+        call = llm.call
+        hedge = self.hedging and not getattr(llm, "stream", False)
+
+        def resilient_call(*args: Any, **kwargs: Any) -> Any:
+            return self.call(key, lambda: call(*args, **kwargs), admit=admit, hedge=hedge)
+
+        llm.call = resilient_call
+        return llm
+
+
+def should_fail_over(error: BaseException) -> bool:
+    """True if another model may succeed where this one failed: transient errors and open circuits."""
+    return isinstance(error, CircuitOpenError) or is_retryable(error)
+
+
+class FailoverChain:
+    """Serves each call from the first model of an ordered chain that answers.
+
+    ``routes`` are ``(key, llm)`` pairs, primary model first; each LLM admits its own requests
+    (see ``ResiliencePolicy.wrap``), so only the models a call is actually sent to are charged.
+    A call moves to the next model only on errors another model may not have (see
+    ``should_fail_over``). The key of the model that served each task is kept in ``served``,
+    by task ID.
+    """
+
+    def __init__(self, routes: List[Tuple[str, Any]]):
+        self.routes = [(key, llm, llm.call) for key, llm in routes]
+        self.served: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def primary(self) -> Any:
+        return self.routes[0][1]
+
+    @property
+    def llms(self) -> List[Any]:
+        return [llm for _, llm, _ in self.routes]
+
+    def install(self) -> Any:
+        """Routes the primary LLM's calls through the chain and returns the primary LLM."""
+        self.primary.call = self.call
+        return self.primary
+
+    def call(self, *args: Any, **kwargs: Any) -> Any:
+        from crewai.hooks import HookAborted
+        from crewai.llms.base_llm import call_stop_override
+
+        error: Optional[BaseException] = None
+        for index, (key, llm, call) in enumerate(self.routes):
+            try:
+                if index == 0:
+                    result = call(*args, **kwargs)
+                else:
+                    # CrewAI sets the agent's stop words on the primary LLM for this call only
+                    with call_stop_override(llm, self.primary.stop_sequences):
+                        result = call(*args, **kwargs)
+            except RateLimitExceededError as e:
+                # A used-up quota is a deliberate stop; CrewAI retries the whole task on other errors
+                raise HookAborted(str(e), source="rate_limiter") from e
+            except Exception as e:
+                if index == len(self.routes) - 1 or not should_fail_over(e):
+                    raise
+                logger.warning(f"LLM call to {key} failed ({type(e).__name__}); failing over to {self.routes[index + 1][0]}.")
+                error = e
+                continue
+
+            task = kwargs.get("from_task")
+            if task is not None:
+                with self._lock:
+                    self.served[str(task.id)] = key
+            if error is not None:
+                logger.info(f"LLM call served by fallback model {key}.")
+            return result
+        raise RuntimeError("LLM failover chain has no models")
+
+
+def failover_chain(llm: Any) -> Optional[FailoverChain]:
+    """Returns the chain installed on ``llm`` by ``FailoverChain.install``, if any."""
+    chain = getattr(getattr(llm, "call", None), "__self__", None)
+    return chain if isinstance(chain, FailoverChain) else None
+
+
+# Process-wide instance; circuit state and latency history are shared by all sessions
+llm_resilience = ResiliencePolicy()
@@ -0,0 +1,110 @@
+"""Process-wide cache of the models each provider offers to an API key."""
+
+import hashlib
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import Callable, Dict, List, Optional, Tuple
+
+from llm_utils import get_available_models
+from logger import logger
+
+DEFAULT_TTL_SECONDS = float(os.getenv("MODEL_LIST_CACHE_TTL_SECONDS", "3600"))
+# Empty lists (invalid key or provider error) are retried sooner
+DEFAULT_NEGATIVE_TTL_SECONDS = float(os.getenv("MODEL_LIST_NEGATIVE_TTL_SECONDS", "60"))
+DEFAULT_TIMEOUT_SECONDS = float(os.getenv("MODEL_LIST_TIMEOUT_SECONDS", "5"))
+FETCH_WORKERS = 4
+
+CatalogKey = Tuple[str, str]
+
+
+class ModelCatalog:
+    """Caches model lists per provider and API key fingerprint, shared by every session.
+
+    Lists are fetched on a small thread pool, so several providers load concurrently and
+    callers only ever wait ``timeout_seconds``; a fetch that takes longer keeps running
+    and fills the cache for the next caller. Raw API keys are never stored.
+    """
+
+    def __init__(
+        self,
+        fetch: Callable[[str, str], List[str]] = get_available_models,
+        ttl_seconds: float = DEFAULT_TTL_SECONDS,
+        negative_ttl_seconds: float = DEFAULT_NEGATIVE_TTL_SECONDS,
+        timeout_seconds: float = DEFAULT_TIMEOUT_SECONDS,
+    ):
+        self._fetch = fetch
+        self.ttl_seconds = ttl_seconds
+        self.negative_ttl_seconds = negative_ttl_seconds
+        self.timeout_seconds = timeout_seconds
+        self._entries: Dict[CatalogKey, Tuple[float, List[str]]] = {}
+        self._pending: Dict[CatalogKey, Future] = {}
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(provider: str, api_key: str) -> CatalogKey:
+        return provider, hashlib.sha256(api_key.encode("utf-8")).hexdigest()[:16]
+
+    def _cached(self, key: CatalogKey) -> Optional[List[str]]:
+        """Returns the unexpired list for ``key``. Caller must hold the lock."""
+        entry = self._entries.get(key)
+        if entry is None or entry[0] < time.monotonic():
+            return None
+        return list(entry[1])
+
+    def prefetch(self, provider: str, api_key: str) -> Optional[Future]:
+        """Starts loading the list in the background unless it is cached or already loading."""
+        key = self.make_key(provider, api_key)
+        with self._lock:
+            if self._cached(key) is not None:
+                return None
+            if key not in self._pending:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(max_workers=FETCH_WORKERS, thread_name_prefix="model-list")
+                self._pending[key] = self._executor.submit(self._load, key, provider, api_key)
+            return self._pending[key]
+
+    def _load(self, key: CatalogKey, provider: str, api_key: str) -> List[str]:
+        try:
+            logger.info(f"Fetching available models for {provider}...")
+            models = self._fetch(api_key, provider)
+            logger.info(f"Successfully fetched {len(models)} models for {provider}.")
+        except Exception as e:
+            logger.error(f"Failed to fetch models for {provider}: {str(e)}")
+            models = []
+        ttl = self.ttl_seconds if models else self.negative_ttl_seconds
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, list(models))
+            self._pending.pop(key, None)
+        return list(models)
+
+    def get(self, provider: str, api_key: str, timeout: Optional[float] = None) -> Optional[List[str]]:
+        """Returns the models available to ``api_key``, or None if listing them takes longer than the timeout."""
+        with self._lock:
+            cached = self._cached(self.make_key(provider, api_key))
+        if cached is not None:
+            return cached
+
+        future = self.prefetch(provider, api_key)
+        if future is None:
+            # Another thread finished loading it in the meantime
+            return self.get(provider, api_key, timeout)
+        timeout = self.timeout_seconds if timeout is None else timeout
+        try:
+            return list(future.result(timeout=timeout))
+        except FutureTimeoutError:
+            # A zero timeout only polls whether the list is ready
+            if timeout > 0:
+                logger.warning(f"Listing {provider} models is taking longer than {timeout:g}s.")
+            return None
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+# Process-wide instance shared by all sessions
+model_catalog = ModelCatalog()
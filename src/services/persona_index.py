@@ -0,0 +1,109 @@
+"""In-memory inverted index for searching large persona catalogs."""
+
+import re
+from bisect import bisect_left
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Set
+
+from models import Persona
+
+TOKEN_PATTERN = re.compile(r"\w+")
+
+# Matches in the name or role rank above matches that only appear in the goal or backstory
+NAME_WEIGHT = 3
+TEXT_WEIGHT = 1
+
+
+def tokenize(text: str) -> List[str]:
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+@dataclass
+class SearchPage:
+    """One page of persona search results."""
+
+    names: List[str] = field(default_factory=list)
+    total: int = 0
+    page: int = 0
+    page_size: int = 20
+
+    @property
+    def page_count(self) -> int:
+        return max(1, -(-self.total // self.page_size))
+
+
+class PersonaIndex:
+    """Inverted index over persona name, role, goal and backstory.
+
+    Every query term matches indexed tokens by prefix, so partially typed words
+    already narrow the results; all terms must match (AND semantics).
+    """
+
+    def __init__(self, personas: Dict[str, Persona]):
+        self.names: List[str] = list(personas)
+        self.sources: List[str] = [persona.source for persona in personas.values()]
+        self._postings: Dict[str, Dict[int, int]] = {}
+
+        for doc_id, persona in enumerate(personas.values()):
+            for weight, text in (
+                (NAME_WEIGHT, f"{persona.name} {persona.role}"),
+                (TEXT_WEIGHT, f"{persona.goal} {persona.backstory}"),
+            ):
+                for token in tokenize(text):
+                    postings = self._postings.setdefault(token, {})
+                    if postings.get(doc_id, 0) < weight:
+                        postings[doc_id] = weight
+
+        self._vocabulary = sorted(self._postings)
+
+    @property
+    def available_sources(self) -> List[str]:
+        return sorted(set(self.sources))
+
+    def _match_prefix(self, prefix: str) -> Dict[int, int]:
+        """Returns the best weight per document for any token starting with ``prefix``."""
+        matches: Dict[int, int] = {}
+        start = bisect_left(self._vocabulary, prefix)
+        for token in self._vocabulary[start:]:
+            if not token.startswith(prefix):
+                break
+            for doc_id, weight in self._postings[token].items():
+                if matches.get(doc_id, 0) < weight:
+                    matches[doc_id] = weight
+        return matches
+
+    def _filter_sources(self, doc_ids: Iterable[int], sources: Optional[Iterable[str]]) -> List[int]:
+        if not sources:
+            return list(doc_ids)
+        allowed: Set[str] = set(sources)
+        return [doc_id for doc_id in doc_ids if self.sources[doc_id] in allowed]
+
+    def search(
+        self, query: str = "", sources: Optional[Iterable[str]] = None, page: int = 0, page_size: int = 20
+    ) -> SearchPage:
+        """Returns one page of display names matching ``query``, best matches first."""
+        terms = tokenize(query)
+        if not terms:
+            ranked = self._filter_sources(range(len(self.names)), sources)
+        else:
+            scores: Optional[Dict[int, int]] = None
+            for term in terms:
+                matches = self._match_prefix(term)
+                if scores is None:
+                    scores = matches
+                else:
+                    scores = {doc_id: score + matches[doc_id] for doc_id, score in scores.items() if doc_id in matches}
+                if not scores:
+                    break
+            candidates = self._filter_sources(scores or {}, sources)
+            ranked = sorted(candidates, key=lambda doc_id: (-scores[doc_id], self.names[doc_id]))
+
+        page_size = max(1, page_size)
+        page = max(0, min(page, max(0, (len(ranked) - 1) // page_size)))
+        start = page * page_size
+        return SearchPage(
+            names=[self.names[doc_id] for doc_id in ranked[start : start + page_size]],
+            total=len(ranked),
+            page=page,
+            page_size=page_size,
+        )
@@ -0,0 +1,86 @@
+"""Offline, job-aware persona ranking using precomputed TF-IDF vectors."""
+
+import math
+from collections import Counter
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from models import Persona
+from services.persona_index import tokenize
+
+STOPWORDS = frozenset(
+    """
+    a about above after all also an and any are as at be been being both but by can could did do does
+    for from had has have having he her here his how i if in into is it its just me more most my no nor
+    not of on once only or other our out over own same she should so some such than that the their them
+    then there these they this those through to too under until up very was we were what when where which
+    while who whom why will with would you your job_description
+    """.split()
+)
+
+
+def _terms(text: str) -> List[str]:
+    return [token for token in tokenize(text) if token not in STOPWORDS and len(token) > 1 and not token.isdigit()]
+
+
+class PersonaRecommender:
+    """Ranks personas against a job description by cosine similarity of TF-IDF vectors.
+
+    Persona vectors are L2-normalised once at construction and stored column-wise
+    (term -> persona ids and weights), so scoring a job description only touches the
+    columns of terms it actually contains.
+    """
+
+    def __init__(self, personas: Dict[str, Persona]):
+        self.names: List[str] = list(personas)
+        documents = [
+            Counter(_terms(f"{persona.name} {persona.role} {persona.goal} {persona.backstory}"))
+            for persona in personas.values()
+        ]
+
+        document_frequency: Counter = Counter()
+        for counts in documents:
+            document_frequency.update(counts.keys())
+        total = len(documents)
+        self._idf: Dict[str, float] = {
+            term: math.log((1 + total) / (1 + frequency)) + 1 for term, frequency in document_frequency.items()
+        }
+
+        columns: Dict[str, Tuple[List[int], List[float]]] = {}
+        for doc_id, counts in enumerate(documents):
+            weights = {term: (1 + math.log(count)) * self._idf[term] for term, count in counts.items()}
+            norm = math.sqrt(sum(weight * weight for weight in weights.values())) or 1.0
+            for term, weight in weights.items():
+                doc_ids, values = columns.setdefault(term, ([], []))
+                doc_ids.append(doc_id)
+                values.append(weight / norm)
+
+        self._columns: Dict[str, Tuple[np.ndarray, np.ndarray]] = {
+            term: (np.asarray(doc_ids, dtype=np.int32), np.asarray(values, dtype=np.float32))
+            for term, (doc_ids, values) in columns.items()
+        }
+
+    def score(self, text: str) -> np.ndarray:
+        """Returns the cosine similarity of every persona to ``text``."""
+        scores = np.zeros(len(self.names), dtype=np.float32)
+        counts = Counter(term for term in _terms(text) if term in self._columns)
+        if not counts:
+            return scores
+
+        query = {term: (1 + math.log(count)) * self._idf[term] for term, count in counts.items()}
+        norm = math.sqrt(sum(weight * weight for weight in query.values()))
+        for term, weight in query.items():
+            doc_ids, values = self._columns[term]
+            scores[doc_ids] += values * (weight / norm)
+        return scores
+
+    def recommend(self, job_description: str, top_k: int = 3) -> List[Tuple[str, float]]:
+        """Returns up to ``top_k`` (display name, score) pairs with a positive score, best first."""
+        scores = self.score(job_description)
+        if not len(scores) or top_k <= 0:
+            return []
+        k = min(top_k, len(scores))
+        candidates = np.argpartition(-scores, k - 1)[:k]
+        ranked = sorted(candidates, key=lambda doc_id: (-scores[doc_id], self.names[doc_id]))
+        return [(self.names[doc_id], float(scores[doc_id])) for doc_id in ranked if scores[doc_id] > 0]
@@ -1,58 +1,203 @@
 import os
+import pickle
+import threading
 from pathlib import Path
-from typing import Dict
+from typing import Dict, List, Optional, Tuple
 
 import yaml
 
 from logger import logger
 from models import Persona
+from services.persona_index import PersonaIndex
+from services.persona_recommender import PersonaRecommender
+
+# (mtime_ns, size) of a persona file; a change in either invalidates its cached entries
+FileSignature = Tuple[int, int]
+
+PERSONA_SNAPSHOT_ENABLED = os.getenv("PERSONA_SNAPSHOT_ENABLED", "true").lower() == "true"
+PERSONA_SNAPSHOT_PATH = os.getenv("PERSONA_SNAPSHOT_PATH", ".cache/persona_catalog.pickle")
+SNAPSHOT_VERSION = 2
+
+
+class PersonaCatalog:
+    """Process-wide cache of parsed persona files.
+
+    Each YAML file is parsed once and re-parsed only when its mtime or size changes,
+    so reruns only pay for a directory listing and a stat per file. The parsed catalog
+    can be persisted as a pickle snapshot so new worker processes skip YAML parsing.
+    """
+
+    def __init__(self, snapshot_path: Optional[str] = None):
+        self.snapshot_path = Path(snapshot_path) if snapshot_path else None
+        self._files: Dict[str, Tuple[FileSignature, Dict[str, Persona]]] = {}
+        self._merged: Dict[str, Persona] = {}
+        self._merged_signature: Optional[Tuple] = None
+        self._index: Optional[PersonaIndex] = None
+        self._recommender: Optional[PersonaRecommender] = None
+        self._snapshot_loaded = False
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _signature(file_path: Path) -> FileSignature:
+        stat = file_path.stat()
+        return stat.st_mtime_ns, stat.st_size
+
+    def _load_snapshot(self):
+        self._snapshot_loaded = True
+        if not self.snapshot_path or not self.snapshot_path.exists():
+            return
+        try:
+            with open(self.snapshot_path, "rb") as f:
+                version, files = pickle.load(f)
+            if version == SNAPSHOT_VERSION:
+                self._files.update(files)
+                logger.info(f"Loaded persona snapshot with {len(files)} files from {self.snapshot_path}")
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable persona snapshot {self.snapshot_path}: {str(e)}")
+
+    def _save_snapshot(self):
+        if not self.snapshot_path:
+            return
+        try:
+            self.snapshot_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.snapshot_path.with_suffix(".tmp")
+            with open(tmp_path, "wb") as f:
+                pickle.dump((SNAPSHOT_VERSION, self._files), f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, self.snapshot_path)
+        except Exception as e:
+            logger.warning(f"Could not write persona snapshot {self.snapshot_path}: {str(e)}")
+
+    def get(self, persona_dir: Path) -> Dict[str, Persona]:
+        """Returns the personas in ``persona_dir``, re-parsing only files that changed."""
+        with self._lock:
+            if not self._snapshot_loaded:
+                self._load_snapshot()
+
+            current = {str(path): self._signature(path) for path in sorted(persona_dir.glob("*.yaml"))}
+            signature = tuple(current.items())
+            if signature == self._merged_signature:
+                return self._merged
+
+            changed = False
+            for path, file_signature in current.items():
+                cached = self._files.get(path)
+                if cached is None or cached[0] != file_signature:
+                    self._files[path] = (file_signature, PersonaService._parse_persona_file(Path(path)))
+                    changed = True
+            for path in [path for path in self._files if path not in current]:
+                del self._files[path]
+                changed = True
+
+            merged: Dict[str, Persona] = {}
+            for path in current:
+                merged.update(self._files[path][1])
+            self._merged = merged
+            self._merged_signature = signature
+            self._index = None
+            self._recommender = None
+
+            if changed:
+                self._save_snapshot()
+            logger.info(f"Persona catalog refreshed: {len(merged)} personas from {len(current)} files.")
+            return self._merged
+
+    def get_index(self, persona_dir: Path) -> PersonaIndex:
+        """Returns a search index over the current catalog, rebuilt only when the catalog changes."""
+        self.get(persona_dir)
+        with self._lock:
+            if self._index is None:
+                self._index = PersonaIndex(self._merged)
+            return self._index
+
+    def get_recommender(self, persona_dir: Path) -> PersonaRecommender:
+        """Returns the recommender with persona vectors precomputed for the current catalog."""
+        self.get(persona_dir)
+        with self._lock:
+            if self._recommender is None:
+                self._recommender = PersonaRecommender(self._merged)
+            return self._recommender
+
+    def invalidate(self):
+        with self._lock:
+            self._files.clear()
+            self._merged = {}
+            self._merged_signature = None
+            self._index = None
+            self._recommender = None
 
 
 class PersonaService:
     @staticmethod
-    def load_personas() -> Dict[str, Persona]:
-        """Loads all agent personas from the personas directory and returns them as Persona objects."""
+    def _parse_persona_file(file_path: Path) -> Dict[str, Persona]:
+        """Parses one persona YAML file into display-name keyed Persona objects."""
+        personas: Dict[str, Persona] = {}
+        try:
+            with open(file_path, "r", encoding="utf-8") as f:
+                data = yaml.safe_load(f)
+                if not data:
+                    return personas
+
+                for p_data in data:
+                    # Map the legacy 'prompt' field to our new model if necessary
+                    # Existing personas use 'name' and 'prompt'
+                    name = p_data.get("name", "Unknown Specialist")
+                    prompt = p_data.get("prompt", "")
+
+                    # In the new model, we split prompt into role/goal/backstory
+                    # For compatibility, we'll map them reasonably
+                    persona = Persona(
+                        name=name,
+                        role=p_data.get("role", name),
+                        goal=p_data.get("goal", f"Analyze CV as a {name}"),
+                        backstory=p_data.get("backstory", prompt),
+                        tools=p_data.get("tools", []),
+                        source=file_path.stem,
+                    )
+
+                    # Create a unique display name including the source file
+                    display_name = f"{persona.name} ({file_path.stem})"
+                    personas[display_name] = persona
+
+        except Exception as e:
+            logger.error(f"Error loading personas from {file_path.name}: {str(e)}")
+        return personas
+
+    @staticmethod
+    def _persona_dir() -> Path:
         # Use current working directory to find personas
-        base_dir = Path(os.getcwd())
-        persona_dir = base_dir / "personas"
+        return Path(os.getcwd()) / "personas"
+
+    @staticmethod
+    def load_personas() -> Dict[str, Persona]:
+        """Loads all agent personas from the personas directory and returns them as Persona objects.
 
-        all_personas: Dict[str, Persona] = {}
+        Results come from the process-wide catalog, so the returned mapping must not be mutated.
+        """
+        persona_dir = PersonaService._persona_dir()
 
         if not persona_dir.exists():
             logger.error(f"Persona directory not found at {persona_dir}")
             return {}
 
-        logger.info(f"Loading personas from {persona_dir}")
-
-        for file_path in persona_dir.glob("*.yaml"):
-            try:
-                with open(file_path, "r", encoding="utf-8") as f:
-                    data = yaml.safe_load(f)
-                    if not data:
-                        continue
-
-                    for p_data in data:
-                        # Map the legacy 'prompt' field to our new model if necessary
-                        # Existing personas use 'name' and 'prompt'
-                        name = p_data.get("name", "Unknown Specialist")
-                        prompt = p_data.get("prompt", "")
-
-                        # In the new model, we split prompt into role/goal/backstory
-                        # For compatibility, we'll map them reasonably
-                        persona = Persona(
-                            name=name,
-                            role=p_data.get("role", name),
-                            goal=p_data.get("goal", f"Analyze CV as a {name}"),
-                            backstory=p_data.get("backstory", prompt),
-                            tools=p_data.get("tools", []),
-                        )
-
-                        # Create a unique display name including the source file
-                        display_name = f"{persona.name} ({file_path.stem})"
-                        all_personas[display_name] = persona
-
-            except Exception as e:
-                logger.error(f"Error loading personas from {file_path.name}: {str(e)}")
-
-        logger.info(f"Successfully loaded {len(all_personas)} personas.")
-        return all_personas
+        return persona_catalog.get(persona_dir)
+
+    @staticmethod
+    def get_persona_index() -> PersonaIndex:
+        """Returns the search index over the persona catalog."""
+        persona_dir = PersonaService._persona_dir()
+        if not persona_dir.exists():
+            logger.error(f"Persona directory not found at {persona_dir}")
+            return PersonaIndex({})
+        return persona_catalog.get_index(persona_dir)
+
+    @staticmethod
+    def recommend_personas(job_description: str, top_k: int = 3) -> List[Tuple[str, float]]:
+        """Returns the display names of the personas best matching the job description, with scores."""
+        persona_dir = PersonaService._persona_dir()
+        if not job_description or not persona_dir.exists():
+            return []
+        return persona_catalog.get_recommender(persona_dir).recommend(job_description, top_k)
+
+
+# Process-wide instance shared by all sessions
+persona_catalog = PersonaCatalog(PERSONA_SNAPSHOT_PATH if PERSONA_SNAPSHOT_ENABLED else None)
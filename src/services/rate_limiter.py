@@ -0,0 +1,188 @@
+"""Process-wide admission control for LLM calls: token buckets, fair queuing and session quotas."""
+
+import os
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Callable, Deque, Dict, Optional
+
+from exceptions import RateLimitExceededError
+from logger import logger
+
+DEFAULT_REQUESTS_PER_MINUTE = float(os.getenv("LLM_REQUESTS_PER_MINUTE", "60"))
+DEFAULT_BURST = int(os.getenv("LLM_REQUEST_BURST", "10"))
+DEFAULT_SESSION_QUOTA = int(os.getenv("LLM_SESSION_REQUESTS_PER_HOUR", "200"))
+QUOTA_WINDOW_SECONDS = 3600.0
+ANONYMOUS_SESSION = "anonymous"
+
+
+@dataclass
+class TokenBucket:
+    """Allows ``rate`` requests per second on average with bursts of up to ``capacity``."""
+
+    rate: float
+    capacity: float
+    tokens: float = 0.0
+    updated_at: float = field(default_factory=time.monotonic)
+
+    def __post_init__(self):
+        self.tokens = self.capacity
+
+    def refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    def seconds_until(self, tokens: float) -> float:
+        return max(0.0, (tokens - self.tokens) / self.rate)
+
+
+class FairQueue:
+    """Waiting calls for one provider/model, served round-robin across sessions."""
+
+    def __init__(self, bucket: TokenBucket):
+        self.bucket = bucket
+        self._tickets: Dict[str, Deque[object]] = {}
+        self._turns: Deque[str] = deque()
+
+    def __len__(self) -> int:
+        return sum(len(tickets) for tickets in self._tickets.values())
+
+    def waiting(self, session_id: str) -> int:
+        return len(self._tickets.get(session_id, ()))
+
+    def push(self, session_id: str, ticket: object):
+        if session_id not in self._tickets:
+            self._tickets[session_id] = deque()
+            self._turns.append(session_id)
+        self._tickets[session_id].append(ticket)
+
+    def head(self) -> Optional[object]:
+        return self._tickets[self._turns[0]][0] if self._turns else None
+
+    def remove(self, session_id: str, ticket: object):
+        """Removes ``ticket``; after a grant the session moves to the back of the rotation."""
+        tickets = self._tickets.get(session_id)
+        if not tickets or ticket not in tickets:
+            return
+        tickets.remove(ticket)
+        self._turns.remove(session_id)
+        if tickets:
+            self._turns.append(session_id)
+        else:
+            del self._tickets[session_id]
+
+
+class RateLimiter:
+    """Admits LLM calls through a token bucket per provider/model shared by every session.
+
+    Calls that cannot start immediately wait in a queue that takes turns between sessions,
+    so one session firing many calls cannot starve the others. Each session may also make
+    at most ``session_quota`` calls per hour, as measured by ``clock``.
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: float = DEFAULT_REQUESTS_PER_MINUTE,
+        burst: int = DEFAULT_BURST,
+        session_quota: int = DEFAULT_SESSION_QUOTA,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.rate = max(requests_per_minute, 0.001) / 60.0
+        self.burst = max(1, burst)
+        self.session_quota = session_quota
+        self._clock = clock
+        self._queues: Dict[str, FairQueue] = {}
+        self._usage: Dict[str, Deque[float]] = {}
+        self._last_usage_sweep = 0.0
+        self._condition = threading.Condition()
+
+    @staticmethod
+    def make_key(provider: str, model: str) -> str:
+        return f"{provider}/{model}"
+
+    def _queue(self, key: str) -> FairQueue:
+        if key not in self._queues:
+            self._queues[key] = FairQueue(TokenBucket(rate=self.rate, capacity=self.burst))
+        return self._queues[key]
+
+    def _recent_calls(self, session_id: str, now: float) -> int:
+        """Counts the session's calls within the quota window, dropping older ones. Caller must hold the lock."""
+        if now - self._last_usage_sweep >= QUOTA_WINDOW_SECONDS:
+            # Sessions that stopped calling would otherwise keep their entry for the life of the process
+            self._last_usage_sweep = now
+            for stale in [sid for sid, usage in self._usage.items() if usage[-1] < now - QUOTA_WINDOW_SECONDS]:
+                del self._usage[stale]
+        usage = self._usage.get(session_id)
+        if usage is None:
+            return 0
+        while usage and usage[0] < now - QUOTA_WINDOW_SECONDS:
+            usage.popleft()
+        if not usage:
+            del self._usage[session_id]
+        return len(usage)
+
+    def remaining_quota(self, session_id: str) -> Optional[int]:
+        """Returns the calls the session may still make this hour, or None without a quota."""
+        if self.session_quota <= 0:
+            return None
+        with self._condition:
+            return max(0, self.session_quota - self._recent_calls(session_id, self._clock()))
+
+    def tracked_sessions(self) -> int:
+        """Returns how many sessions have calls counted against their quota."""
+        with self._condition:
+            return len(self._usage)
+
+    def acquire(self, key: str, session_id: str = ANONYMOUS_SESSION) -> float:
+        """Blocks until a call for ``key`` may start and returns the seconds spent waiting.
+
+        Raises:
+            RateLimitExceededError: If the session has used up its hourly quota.
+        """
+        ticket = object()
+        started = time.monotonic()
+        with self._condition:
+            if self.session_quota > 0 and self._recent_calls(session_id, self._clock()) >= self.session_quota:
+                raise RateLimitExceededError(
+                    f"This session reached its limit of {self.session_quota} AI requests per hour. Please try again later."
+                )
+
+            queue = self._queue(key)
+            queue.push(session_id, ticket)
+            try:
+                while True:
+                    now = time.monotonic()
+                    queue.bucket.refill(now)
+                    if queue.head() is ticket and queue.bucket.tokens >= 1:
+                        queue.bucket.tokens -= 1
+                        queue.remove(session_id, ticket)
+                        if self.session_quota > 0:
+                            self._usage.setdefault(session_id, deque()).append(self._clock())
+                        self._condition.notify_all()
+                        waited = now - started
+                        if waited >= 1:
+                            logger.info(f"LLM call for {key} waited {waited:.1f}s for the rate limiter.")
+                        return waited
+                    timeout = queue.bucket.seconds_until(1) if queue.head() is ticket else None
+                    self._condition.wait(timeout)
+            except BaseException:
+                queue.remove(session_id, ticket)
+                self._condition.notify_all()
+                raise
+
+    def estimate_wait(self, key: str, requests: int = 1) -> float:
+        """Estimates the seconds until ``requests`` new calls for ``key`` will all have started."""
+        with self._condition:
+            queue = self._queue(key)
+            queue.bucket.refill(time.monotonic())
+            return queue.bucket.seconds_until(len(queue) + requests)
+
+    def waiting(self, key: str, session_id: str) -> int:
+        """Returns how many of the session's calls are queued for ``key``."""
+        with self._condition:
+            return self._queue(key).waiting(session_id)
+
+
+# Process-wide instance shared by all sessions
+rate_limiter = RateLimiter()
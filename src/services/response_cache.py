@@ -0,0 +1,148 @@
+"""Persistent, content-addressed cache of crew task responses."""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+from logger import logger
+
+DEFAULT_CACHE_PATH = os.getenv("LLM_CACHE_PATH", ".cache/llm_responses.sqlite")
+DEFAULT_MAX_BYTES = int(float(os.getenv("LLM_CACHE_MAX_MB", "200")) * 1024 * 1024)
+DEFAULT_MAX_AGE_SECONDS = float(os.getenv("LLM_CACHE_TTL_HOURS", "168")) * 3600
+
+
+def sha256_text(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """SQLite-backed cache of task outputs with size- and age-based eviction.
+
+    Keys are content hashes, so a hit is only possible when the provider, model,
+    rendered prompt and every upstream output are byte-identical.
+    """
+
+    def __init__(
+        self,
+        path: str = DEFAULT_CACHE_PATH,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        max_age_seconds: float = DEFAULT_MAX_AGE_SECONDS,
+    ):
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.max_age_seconds = max_age_seconds
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._initialized = False
+
+    @staticmethod
+    def make_key(scope: str, task: Any, upstream_outputs: List[str]) -> str:
+        """Builds the cache key from the model scope, the rendered task prompt and upstream output hashes."""
+        agent = task.agent
+        payload = [
+            scope,
+            str(getattr(agent, "role", "")),
+            str(getattr(agent, "goal", "")),
+            str(getattr(agent, "backstory", "")),
+            str(getattr(agent, "system_template", "") or ""),
+            task.description,
+            str(getattr(task, "expected_output", "")),
+            [sha256_text(output) for output in upstream_outputs],
+        ]
+        return sha256_text(json.dumps(payload, ensure_ascii=False))
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """Opens a committed-on-exit connection, creating the schema on first use."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        connection = sqlite3.connect(self.path, timeout=10)
+        try:
+            if not self._initialized:
+                connection.execute(
+                    "CREATE TABLE IF NOT EXISTS responses ("
+                    "key TEXT PRIMARY KEY, value TEXT NOT NULL, size INTEGER NOT NULL, "
+                    "created_at REAL NOT NULL, last_access REAL NOT NULL)"
+                )
+                self._initialized = True
+            with connection:
+                yield connection
+        finally:
+            connection.close()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Returns the cached value for the key, or None on a miss or expired entry."""
+        now = time.time()
+        try:
+            with self._lock:
+                with self._connect() as connection:
+                    row = connection.execute("SELECT value, created_at FROM responses WHERE key = ?", (key,)).fetchone()
+                    if row and now - row[1] <= self.max_age_seconds:
+                        connection.execute("UPDATE responses SET last_access = ? WHERE key = ?", (now, key))
+                        self.hits += 1
+                        return json.loads(row[0])
+                    self.misses += 1
+                    return None
+        except (sqlite3.Error, ValueError) as e:
+            logger.warning(f"Response cache lookup failed: {str(e)}")
+            self.misses += 1
+            return None
+
+    def set(self, key: str, value: Dict[str, Any]):
+        """Stores a value and evicts expired or least recently used entries."""
+        now = time.time()
+        encoded = json.dumps(value, ensure_ascii=False)
+        try:
+            with self._lock:
+                with self._connect() as connection:
+                    connection.execute(
+                        "INSERT OR REPLACE INTO responses (key, value, size, created_at, last_access) VALUES (?, ?, ?, ?, ?)",
+                        (key, encoded, len(encoded.encode("utf-8")), now, now),
+                    )
+                    self._evict(connection, now)
+        except sqlite3.Error as e:
+            logger.warning(f"Response cache write failed: {str(e)}")
+
+    def _evict(self, connection: sqlite3.Connection, now: float):
+        connection.execute("DELETE FROM responses WHERE created_at < ?", (now - self.max_age_seconds,))
+        total = connection.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for key, size in connection.execute("SELECT key, size FROM responses ORDER BY last_access ASC").fetchall():
+            connection.execute("DELETE FROM responses WHERE key = ?", (key,))
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+    def clear(self):
+        with self._lock:
+            if self.path.exists():
+                with self._connect() as connection:
+                    connection.execute("DELETE FROM responses")
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Returns hit/miss counters for this process plus the on-disk entry count and size."""
+        entries, size = 0, 0
+        if self.path.exists():
+            with self._lock, self._connect() as connection:
+                entries, size = connection.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses").fetchone()
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "entries": entries,
+            "bytes": size,
+        }
+
+
+# Process-wide instance shared by all sessions
+response_cache = ResponseCache()
@@ -0,0 +1,198 @@
+"""Persistent store of finished analysis results, keyed by the inputs that produced them."""
+
+import json
+import os
+import secrets
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+from logger import logger
+from models import AnalysisResult, Persona
+from services.response_cache import sha256_text
+
+DEFAULT_INDEX_PATH = os.getenv("RESULT_STORE_PATH", ".cache/results.sqlite")
+DEFAULT_BLOB_DIR = os.getenv("RESULT_STORE_DIR", ".cache/results")
+DEFAULT_MAX_BYTES = int(float(os.getenv("RESULT_STORE_MAX_MB", "500")) * 1024 * 1024)
+DEFAULT_MAX_AGE_SECONDS = float(os.getenv("RESULT_STORE_TTL_HOURS", "720")) * 3600
+
+
+@dataclass
+class StoredResult:
+    """A finished analysis loaded from the store."""
+
+    result_id: str
+    result: AnalysisResult
+    served_models: Dict[str, str] = field(default_factory=dict)
+    created_at: float = 0.0
+
+
+class ResultStore:
+    """SQLite index plus a directory of JSON blobs holding finished analysis results.
+
+    The index maps an input key to a random, unguessable result ID; the blob named after
+    the ID holds the task outputs. The ID doubles as a shareable link to the result.
+    """
+
+    def __init__(
+        self,
+        path: str = DEFAULT_INDEX_PATH,
+        blob_dir: str = DEFAULT_BLOB_DIR,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        max_age_seconds: float = DEFAULT_MAX_AGE_SECONDS,
+    ):
+        self.path = Path(path)
+        self.blob_dir = Path(blob_dir)
+        self.max_bytes = max_bytes
+        self.max_age_seconds = max_age_seconds
+        self._lock = threading.Lock()
+        self._initialized = False
+
+    @staticmethod
+    def make_key(
+        cv_content: str,
+        job_description: str,
+        personas: List[Persona],
+        provider: str,
+        model: str,
+        user_answers: str = "",
+    ) -> str:
+        """Builds the input key; the persona set is sorted so the selection order does not matter."""
+        payload = [
+            sha256_text(cv_content),
+            sha256_text(job_description),
+            sorted([persona.name, persona.goal, persona.backstory] for persona in personas),
+            provider,
+            model,
+            sha256_text(user_answers),
+        ]
+        return sha256_text(json.dumps(payload, ensure_ascii=False))
+
+    @staticmethod
+    def _encode(result: AnalysisResult, served_models: Dict[str, str]) -> str:
+        return json.dumps({"result": result.to_dict(), "served_models": served_models}, ensure_ascii=False)
+
+    @staticmethod
+    def _decode(result_id: str, encoded: str, created_at: float) -> StoredResult:
+        data = json.loads(encoded)
+        result = AnalysisResult.from_dict(data["result"])
+        return StoredResult(result_id, result, data.get("served_models", {}), created_at)
+
+    def _blob_path(self, result_id: str) -> Path:
+        return self.blob_dir / f"{result_id}.json"
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """Opens a committed-on-exit connection, creating the schema on first use."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        connection = sqlite3.connect(self.path, timeout=10)
+        try:
+            if not self._initialized:
+                connection.execute(
+                    "CREATE TABLE IF NOT EXISTS results ("
+                    "result_id TEXT PRIMARY KEY, key TEXT NOT NULL UNIQUE, size INTEGER NOT NULL, "
+                    "created_at REAL NOT NULL, last_access REAL NOT NULL)"
+                )
+                self._initialized = True
+            with connection:
+                yield connection
+        finally:
+            connection.close()
+
+    def _load(self, column: str, value: str) -> Optional[StoredResult]:
+        now = time.time()
+        try:
+            with self._lock:
+                with self._connect() as connection:
+                    row = connection.execute(
+                        f"SELECT result_id, created_at FROM results WHERE {column} = ?", (value,)
+                    ).fetchone()
+                    if not row or now - row[1] > self.max_age_seconds:
+                        return None
+                    result_id, created_at = row
+                    blob = self._blob_path(result_id)
+                    if not blob.exists():
+                        connection.execute("DELETE FROM results WHERE result_id = ?", (result_id,))
+                        return None
+                    connection.execute("UPDATE results SET last_access = ? WHERE result_id = ?", (now, result_id))
+                    encoded = blob.read_text(encoding="utf-8")
+            return self._decode(result_id, encoded, created_at)
+        except (sqlite3.Error, OSError, ValueError, TypeError, KeyError) as e:
+            logger.warning(f"Result store lookup failed: {str(e)}")
+            return None
+
+    def get_by_key(self, key: str) -> Optional[StoredResult]:
+        """Returns the stored result for an input key, or None if it is missing or expired."""
+        return self._load("key", key)
+
+    def get(self, result_id: str) -> Optional[StoredResult]:
+        """Returns the result behind a shareable result ID, or None if it is missing or expired."""
+        return self._load("result_id", result_id)
+
+    def put(self, key: str, result: AnalysisResult, served_models: Optional[Dict[str, str]] = None) -> str:
+        """Stores a finished result under its input key and returns its result ID ("" if the write failed)."""
+        now = time.time()
+        encoded = self._encode(result, served_models or {})
+        result_id = secrets.token_urlsafe(16)
+        try:
+            with self._lock:
+                self.blob_dir.mkdir(parents=True, exist_ok=True)
+                blob = self._blob_path(result_id)
+                temporary = blob.with_suffix(".tmp")
+                temporary.write_text(encoded, encoding="utf-8")
+                os.replace(temporary, blob)
+                with self._connect() as connection:
+                    previous = connection.execute("SELECT result_id FROM results WHERE key = ?", (key,)).fetchone()
+                    if previous:
+                        self._delete(connection, previous[0])
+                    connection.execute(
+                        "INSERT INTO results (result_id, key, size, created_at, last_access) VALUES (?, ?, ?, ?, ?)",
+                        (result_id, key, len(encoded.encode("utf-8")), now, now),
+                    )
+                    self._evict(connection, now)
+            return result_id
+        except (sqlite3.Error, OSError) as e:
+            logger.warning(f"Result store write failed: {str(e)}")
+            return ""
+
+    def _delete(self, connection: sqlite3.Connection, result_id: str):
+        connection.execute("DELETE FROM results WHERE result_id = ?", (result_id,))
+        self._blob_path(result_id).unlink(missing_ok=True)
+
+    def _evict(self, connection: sqlite3.Connection, now: float):
+        expired = connection.execute(
+            "SELECT result_id FROM results WHERE created_at < ?", (now - self.max_age_seconds,)
+        ).fetchall()
+        for (result_id,) in expired:
+            self._delete(connection, result_id)
+        total = connection.execute("SELECT COALESCE(SUM(size), 0) FROM results").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for result_id, size in connection.execute("SELECT result_id, size FROM results ORDER BY last_access ASC").fetchall():
+            self._delete(connection, result_id)
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+    def clear(self):
+        with self._lock:
+            if self.path.exists():
+                with self._connect() as connection:
+                    for (result_id,) in connection.execute("SELECT result_id FROM results").fetchall():
+                        self._delete(connection, result_id)
+
+    def stats(self) -> Dict[str, Any]:
+        """Returns the stored result count and their total size in bytes."""
+        entries, size = 0, 0
+        if self.path.exists():
+            with self._lock, self._connect() as connection:
+                entries, size = connection.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM results").fetchone()
+        return {"entries": entries, "bytes": size}
+
+
+# Process-wide instance shared by all sessions
+result_store = ResultStore()
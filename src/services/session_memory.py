@@ -0,0 +1,259 @@
+"""Per-session memory accounting, with large values of idle sessions spilled to disk."""
+
+import os
+import pickle
+import shutil
+import sys
+import threading
+import time
+import weakref
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from logger import logger
+
+DEFAULT_SPILL_DIR = os.getenv("SESSION_SPILL_DIR", ".cache/sessions")
+DEFAULT_IDLE_SECONDS = float(os.getenv("SESSION_IDLE_SECONDS", "900"))
+DEFAULT_EVICT_SECONDS = float(os.getenv("SESSION_EVICT_HOURS", "6")) * 3600
+DEFAULT_SPILL_MIN_BYTES = int(float(os.getenv("SESSION_SPILL_MIN_KB", "32")) * 1024)
+# Spilled values (CVs, job descriptions, results) are written to disk as plaintext pickles
+SPILL_ENABLED = os.getenv("SESSION_SPILL_ENABLED", "true").lower() == "true"
+SWEEP_INTERVAL_SECONDS = 60.0
+
+
+def measure(value: Any) -> int:
+    """Approximates the memory held by a value by the size of its pickle."""
+    try:
+        return len(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+    except Exception:
+        return sys.getsizeof(value)
+
+
+@dataclass
+class SpilledValue:
+    """Placeholder left in session state for a value moved to disk while the session was idle."""
+
+    path: str
+    size: int
+
+
+@dataclass
+class SessionFootprint:
+    """Bytes held per managed key by one session, as measured on its last run."""
+
+    session_id: str
+    last_seen: float
+    sizes: Dict[str, int] = field(default_factory=dict)
+    spilled: List[str] = field(default_factory=list)
+
+    @property
+    def total_bytes(self) -> int:
+        return sum(size for key, size in self.sizes.items() if key not in self.spilled)
+
+    @property
+    def spilled_bytes(self) -> int:
+        return sum(self.sizes[key] for key in self.spilled if key in self.sizes)
+
+
+@dataclass
+class _TrackedSession:
+    state: "weakref.ReferenceType[Any]"
+    keys: List[str]
+    spillable: List[str]
+    footprint: SessionFootprint
+    # Locked view of ``state`` used by the session's current run, if that run is still alive
+    guard: Optional["weakref.ReferenceType[Any]"] = None
+    busy: int = 0
+    # Values as last measured; a key still holding the same object keeps its size without re-pickling
+    values: Dict[str, Any] = field(default_factory=dict)
+
+    def target(self) -> Any:
+        """Returns the mapping to mutate: the locked per-run view when there is one, else the state itself."""
+        guard = self.guard() if self.guard is not None else None
+        return guard if guard is not None else self.state()
+
+
+class SessionMemory:
+    """Tracks what every session keeps in its state and releases it when the session goes idle.
+
+    Streamlit keeps a session's state until its tab disconnects, so abandoned tabs hold their
+    CV, job description and results indefinitely. Sessions report their state on every run;
+    any run sweeps the others at most once per interval. After ``idle_seconds`` without a run,
+    large spillable values are pickled to disk and restored on the session's next run, unless
+    ``spill_enabled`` is off; after ``evict_seconds`` the managed keys are dropped, so a
+    returning session starts over. Values are only measured again once a run replaces them;
+    a value changed in place keeps its previous size until then.
+
+    Partial runs (fragments) call ``keep_alive`` and long synchronous steps run inside ``busy``,
+    so a session is never swept while its script is using its state.
+    """
+
+    def __init__(
+        self,
+        spill_dir: str = DEFAULT_SPILL_DIR,
+        idle_seconds: float = DEFAULT_IDLE_SECONDS,
+        evict_seconds: float = DEFAULT_EVICT_SECONDS,
+        spill_min_bytes: int = DEFAULT_SPILL_MIN_BYTES,
+        sweep_interval_seconds: float = SWEEP_INTERVAL_SECONDS,
+        spill_enabled: bool = SPILL_ENABLED,
+    ):
+        self.spill_dir = Path(spill_dir)
+        self.idle_seconds = idle_seconds
+        self.evict_seconds = evict_seconds
+        self.spill_min_bytes = spill_min_bytes
+        self.sweep_interval_seconds = sweep_interval_seconds
+        self.spill_enabled = spill_enabled
+        self._sessions: Dict[str, _TrackedSession] = {}
+        self._last_sweep = 0.0
+        self._lock = threading.Lock()
+
+    def touch(
+        self,
+        session_id: str,
+        state: Any,
+        keys: Iterable[str],
+        spillable: Iterable[str] = (),
+        guard: Any = None,
+        now: Optional[float] = None,
+    ) -> SessionFootprint:
+        """Restores spilled values of a session starting a run, measures its keys and sweeps idle sessions.
+
+        ``state`` is the session's mapping of keys to values; it is held weakly, so a session
+        Streamlit has discarded disappears from the report along with its spilled files.
+        ``guard`` is the locked view of ``state`` used by the current run; sweeps from other
+        sessions write through it while it is alive.
+        """
+        now = time.time() if now is None else now
+        keys = list(keys)
+        with self._lock:
+            view = guard if guard is not None else state
+            previous = self._sessions.get(session_id)
+            self._restore(session_id, view, [key for key in keys if key in view])
+            if previous is not None and previous.footprint.spilled:
+                # Spilled values the session overwrote since the sweep leave their files behind
+                shutil.rmtree(self._session_dir(session_id), ignore_errors=True)
+            keys = [key for key in keys if key in view]
+            values = {key: view[key] for key in keys}
+            sizes = {}
+            for key, value in values.items():
+                unchanged = previous is not None and key in previous.values and previous.values[key] is value
+                sizes[key] = previous.footprint.sizes[key] if unchanged else measure(value)
+            footprint = SessionFootprint(session_id, now, sizes)
+            self._sessions[session_id] = _TrackedSession(
+                weakref.ref(state),
+                keys,
+                list(spillable),
+                footprint,
+                guard=weakref.ref(guard) if guard is not None else None,
+                busy=previous.busy if previous is not None else 0,
+                values=values,
+            )
+            if now - self._last_sweep >= self.sweep_interval_seconds:
+                self._last_sweep = now
+                self._sweep(now)
+        return footprint
+
+    def keep_alive(self, session_id: str, guard: Any = None, now: Optional[float] = None):
+        """Marks a session active from a partial run, such as a fragment polling a job, without measuring it."""
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is None:
+                return
+            session.footprint.last_seen = time.time() if now is None else now
+            if guard is not None:
+                session.guard = weakref.ref(guard)
+
+    @contextmanager
+    def busy(self, session_id: str) -> Iterator[None]:
+        """Keeps a session from being spilled or evicted while a long step runs in its script thread."""
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is not None:
+                session.busy += 1
+        try:
+            yield
+        finally:
+            with self._lock:
+                session = self._sessions.get(session_id)
+                if session is not None:
+                    session.busy = max(0, session.busy - 1)
+                    session.footprint.last_seen = time.time()
+
+    def _session_dir(self, session_id: str) -> Path:
+        return self.spill_dir / session_id
+
+    def _restore(self, session_id: str, state: Any, keys: List[str]):
+        spilled = [key for key in keys if isinstance(state[key], SpilledValue)]
+        for key in spilled:
+            value = state[key]
+            try:
+                with open(value.path, "rb") as handle:
+                    state[key] = pickle.load(handle)
+            except (OSError, pickle.UnpicklingError, EOFError) as e:
+                logger.warning(f"Could not restore spilled session value {key}: {str(e)}")
+                # The session's defaults fill the key in again
+                del state[key]
+        if spilled:
+            shutil.rmtree(self._session_dir(session_id), ignore_errors=True)
+
+    def _spill(self, session: _TrackedSession, target: Any):
+        session_dir = self._session_dir(session.footprint.session_id)
+        for key in session.spillable:
+            size = session.footprint.sizes.get(key, 0)
+            if key not in session.keys or size < self.spill_min_bytes or key not in target:
+                continue
+            value = target[key]
+            if isinstance(value, SpilledValue):
+                continue
+            path = session_dir / f"{key}.pickle"
+            try:
+                session_dir.mkdir(parents=True, exist_ok=True)
+                with open(path, "wb") as handle:
+                    pickle.dump(value, handle, protocol=pickle.HIGHEST_PROTOCOL)
+            except (OSError, pickle.PicklingError) as e:
+                logger.warning(f"Could not spill session value {key}: {str(e)}")
+                continue
+            target[key] = SpilledValue(str(path), size)
+            # Holding on to the value would keep it in memory after all
+            session.values.pop(key, None)
+            session.footprint.spilled.append(key)
+
+    def _sweep(self, now: float):
+        for session_id, session in list(self._sessions.items()):
+            if session.busy:
+                continue
+            target = session.target()
+            idle = now - session.footprint.last_seen
+            if target is None or idle >= self.evict_seconds:
+                if target is not None:
+                    for key in session.keys:
+                        if key in target:
+                            del target[key]
+                del self._sessions[session_id]
+                shutil.rmtree(self._session_dir(session_id), ignore_errors=True)
+                logger.info(f"Evicted session {session_id[:8]} after {idle:.0f}s without activity.")
+            elif self.spill_enabled and idle >= self.idle_seconds:
+                self._spill(session, target)
+
+    def sweep(self, now: Optional[float] = None):
+        """Spills or evicts idle sessions now, regardless of the sweep interval."""
+        now = time.time() if now is None else now
+        with self._lock:
+            self._last_sweep = now
+            self._sweep(now)
+
+    def report(self, top: int = 10) -> List[SessionFootprint]:
+        """Returns the footprints of the ``top`` sessions holding the most memory."""
+        with self._lock:
+            footprints = [session.footprint for session in self._sessions.values()]
+        return sorted(footprints, key=lambda footprint: footprint.total_bytes, reverse=True)[:top]
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._sessions)
+
+
+# Process-wide instance shared by all sessions
+session_memory = SessionMemory()
@@ -0,0 +1,64 @@
+"""Routes streamed LLM tokens from the CrewAI event bus to per-run callbacks."""
+
+import threading
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterable, Iterator
+
+from crewai.events import LLMStreamChunkEvent, crewai_event_bus
+
+from logger import logger
+
+# Called with (role, chunk, call_id); a new call_id means the agent started another LLM call
+StreamCallback = Callable[[str, str, str], None]
+
+
+class StreamRouter:
+    """Dispatches ``LLMStreamChunkEvent`` chunks to the callback registered for the emitting agent.
+
+    The event bus is process-wide, so concurrent runs each subscribe with their own
+    agents and only ever see their own tokens.
+    """
+
+    def __init__(self):
+        self._callbacks: Dict[str, StreamCallback] = {}
+        self._lock = threading.Lock()
+        self._listening = False
+
+    def _ensure_listening(self):
+        with self._lock:
+            if self._listening:
+                return
+
+            @crewai_event_bus.on(LLMStreamChunkEvent)
+            def _on_chunk(source: Any, event: LLMStreamChunkEvent):
+                self.dispatch(event.agent_id, event.agent_role, event.chunk, event.call_id)
+
+            self._listening = True
+
+    def dispatch(self, agent_id: Any, agent_role: Any, chunk: str, call_id: Any = ""):
+        callback = self._callbacks.get(str(agent_id))
+        if callback is None or not chunk:
+            return
+        try:
+            callback(str(agent_role), chunk, str(call_id or ""))
+        except Exception as e:
+            logger.error(f"Error in stream callback: {e}")
+
+    @contextmanager
+    def subscribe(self, agents: Iterable[Any], callback: StreamCallback) -> Iterator[None]:
+        """Routes chunks emitted by ``agents`` to ``callback(role, chunk, call_id)`` for the duration of the block."""
+        self._ensure_listening()
+        agent_ids = [str(agent.id) for agent in agents]
+        with self._lock:
+            for agent_id in agent_ids:
+                self._callbacks[agent_id] = callback
+        try:
+            yield
+        finally:
+            with self._lock:
+                for agent_id in agent_ids:
+                    self._callbacks.pop(agent_id, None)
+
+
+# Process-wide instance shared by all sessions
+stream_router = StreamRouter()
@@ -0,0 +1,261 @@
+"""Dependency-aware parallel execution of CrewAI tasks."""
+
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from crewai import Crew
+from crewai.crews.crew_output import CrewOutput
+from crewai.tasks.task_output import TaskOutput
+from crewai.utilities.formatter import aggregate_raw_outputs_from_task_outputs
+
+from logger import logger
+from services.response_cache import ResponseCache
+
+
+@dataclass
+class ScheduleReport:
+    """Timing summary of a scheduled crew run."""
+
+    task_labels: List[str] = field(default_factory=list)
+    task_durations: List[float] = field(default_factory=list)
+    critical_path: List[int] = field(default_factory=list)
+    critical_path_seconds: float = 0.0
+    wall_clock_seconds: float = 0.0
+    reused_tasks: List[int] = field(default_factory=list)
+
+    @property
+    def sequential_seconds(self) -> float:
+        """Estimated latency of running the same tasks one after another."""
+        return sum(self.task_durations)
+
+    @property
+    def savings_seconds(self) -> float:
+        return self.sequential_seconds - self.wall_clock_seconds
+
+    def summary(self) -> str:
+        path = " -> ".join(self.task_labels[i] for i in self.critical_path)
+        return (
+            f"wall clock {self.wall_clock_seconds:.1f}s, critical path {self.critical_path_seconds:.1f}s ({path}), "
+            f"sequential estimate {self.sequential_seconds:.1f}s, saved {self.savings_seconds:.1f}s, "
+            f"reused {len(self.reused_tasks)}/{len(self.task_labels)} tasks"
+        )
+
+
+class TaskScheduler:
+    """Runs a crew's tasks as a DAG built from each task's ``context``.
+
+    Tasks without an explicit ``context`` list are treated as independent, so
+    they start as soon as a worker is free instead of waiting for every task
+    listed before them as ``Process.sequential`` would. With
+    ``implicit_context=True`` they get the sequential process's context instead.
+
+    When a ``ResponseCache`` is given, each task is looked up by its rendered
+    prompt and upstream outputs before it is sent to the LLM.
+
+    ``run`` can also be given the outputs of a previous run of the same crew
+    layout and their fingerprints; tasks whose fingerprint is unchanged and whose
+    upstream tasks were all reused keep their previous output instead of being
+    executed again.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = 4,
+        thread_initializer: Optional[Callable[[], None]] = None,
+        cache: Optional[ResponseCache] = None,
+        cache_scope: str = "",
+        implicit_context: bool = False,
+    ):
+        self.max_workers = max(1, max_workers)
+        self.thread_initializer = thread_initializer
+        self.cache = cache
+        self.cache_scope = cache_scope
+        self.implicit_context = implicit_context
+
+    @staticmethod
+    def build_dependencies(tasks: List[Any], implicit_context: bool = False) -> List[List[int]]:
+        """Returns, for every task, the indices of the tasks it takes as context."""
+        index_by_id = {id(task): i for i, task in enumerate(tasks)}
+        dependencies = []
+        last_sync: Optional[int] = None
+        for i, task in enumerate(tasks):
+            is_async = bool(getattr(task, "async_execution", False))
+            if isinstance(task.context, list):
+                deps = []
+                for upstream in task.context:
+                    if id(upstream) not in index_by_id:
+                        raise ValueError(f"Task '{task.description[:40]}' depends on a task that is not part of the crew.")
+                    deps.append(index_by_id[id(upstream)])
+            elif not implicit_context:
+                deps = []
+            elif is_async:
+                # Mirrors Process.sequential: async tasks only see the last synchronous output
+                deps = [last_sync] if last_sync is not None else []
+            else:
+                deps = list(range(i))
+            dependencies.append(deps)
+            if not is_async:
+                last_sync = i
+
+        # Reject cycles up front so the scheduler can never deadlock
+        visiting, done = set(), set()
+
+        def visit(i: int):
+            if i in done:
+                return
+            if i in visiting:
+                raise ValueError("Task context dependencies contain a cycle.")
+            visiting.add(i)
+            for dep in dependencies[i]:
+                visit(dep)
+            visiting.discard(i)
+            done.add(i)
+
+        for i in range(len(tasks)):
+            visit(i)
+        return dependencies
+
+    @staticmethod
+    def critical_path(dependencies: List[List[int]], durations: List[float]) -> Tuple[float, List[int]]:
+        """Returns the length and task indices of the longest dependency chain."""
+        finish: Dict[int, float] = {}
+        previous: Dict[int, Optional[int]] = {}
+
+        def finish_time(i: int) -> float:
+            if i not in finish:
+                best_dep = max(dependencies[i], key=finish_time, default=None)
+                previous[i] = best_dep
+                finish[i] = durations[i] + (finish_time(best_dep) if best_dep is not None else 0.0)
+            return finish[i]
+
+        if not durations:
+            return 0.0, []
+
+        end = max(range(len(durations)), key=finish_time)
+        path = []
+        node: Optional[int] = end
+        while node is not None:
+            path.append(node)
+            node = previous[node]
+        return finish[end], list(reversed(path))
+
+    def _execute(self, task: Any, upstream_outputs: List[TaskOutput]) -> Tuple[TaskOutput, float]:
+        start = time.perf_counter()
+        cache_key = None
+        if self.cache is not None:
+            cache_key = ResponseCache.make_key(self.cache_scope, task, [output.raw for output in upstream_outputs])
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                output = TaskOutput(**cached)
+                task.output = output
+                if task.callback:
+                    task.callback(output)
+                return output, time.perf_counter() - start
+
+        context = aggregate_raw_outputs_from_task_outputs(upstream_outputs) if upstream_outputs else ""
+        agent = task.agent
+        output = task.execute_sync(agent=agent, context=context, tools=getattr(agent, "tools", None))
+
+        if cache_key is not None and output.raw:
+            self.cache.set(
+                cache_key,
+                {
+                    "description": output.description,
+                    "expected_output": output.expected_output,
+                    "raw": output.raw,
+                    "agent": output.agent,
+                },
+            )
+        return output, time.perf_counter() - start
+
+    @staticmethod
+    def fingerprint(task: Any, scope: str = "") -> str:
+        """Hashes everything a task's prompt is rendered from, including the agent's system template.
+
+        The CV and job description live in the system template rather than the task description,
+        so comparing descriptions alone would treat a task run on another CV as unchanged.
+        ``scope`` names the provider/model, so an answer from another model is never reused.
+        """
+        return ResponseCache.make_key(scope, task, [])
+
+    def _can_reuse(self, task: Any, previous: Optional[TaskOutput], previous_fingerprint: str, upstream_reused: bool) -> bool:
+        if previous is None or not upstream_reused or not previous.raw:
+            return False
+        return bool(previous_fingerprint) and previous_fingerprint == self.fingerprint(task, self.cache_scope)
+
+    def run(
+        self,
+        crew: Crew,
+        previous_outputs: Optional[List[TaskOutput]] = None,
+        previous_fingerprints: Optional[List[str]] = None,
+    ) -> Tuple[CrewOutput, ScheduleReport]:
+        """Executes the crew's tasks concurrently, respecting context dependencies.
+
+        Args:
+            crew: The crew whose tasks should be executed.
+            previous_outputs: Task outputs of an earlier run with the same task layout, reused where inputs are unchanged.
+            previous_fingerprints: The ``fingerprint`` of each task of that earlier run under this scheduler's
+                ``cache_scope``; outputs without one are never reused.
+        """
+        tasks = list(crew.tasks)
+        dependencies = self.build_dependencies(tasks, self.implicit_context)
+        previous_outputs = previous_outputs or []
+        previous_fingerprints = previous_fingerprints or []
+        outputs: Dict[int, TaskOutput] = {}
+        durations: Dict[int, float] = {}
+        reused: List[int] = []
+        pending = set(range(len(tasks)))
+        running: Dict[Future, int] = {}
+
+        logger.info(f"Scheduling {len(tasks)} tasks with up to {self.max_workers} workers...")
+        start = time.perf_counter()
+
+        with ThreadPoolExecutor(max_workers=self.max_workers, initializer=self.thread_initializer) as pool:
+            while pending or running:
+                ready = [i for i in sorted(pending) if all(dep in outputs for dep in dependencies[i])]
+                for i in ready:
+                    pending.discard(i)
+                    previous = previous_outputs[i] if i < len(previous_outputs) else None
+                    previous_fingerprint = previous_fingerprints[i] if i < len(previous_fingerprints) else ""
+                    upstream_reused = all(dep in reused for dep in dependencies[i])
+                    if self._can_reuse(tasks[i], previous, previous_fingerprint, upstream_reused):
+                        outputs[i], durations[i] = previous, 0.0
+                        reused.append(i)
+                        # Like a cache hit, a reused answer still reaches the task's callback
+                        tasks[i].output = previous
+                        if tasks[i].callback:
+                            tasks[i].callback(previous)
+                        continue
+                    upstream = [outputs[dep] for dep in dependencies[i]]
+                    running[pool.submit(self._execute, tasks[i], upstream)] = i
+
+                if not running:
+                    continue
+                completed, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in completed:
+                    i = running.pop(future)
+                    outputs[i], durations[i] = future.result()
+
+        ordered_durations = [durations[i] for i in range(len(tasks))]
+        path_seconds, path = self.critical_path(dependencies, ordered_durations)
+        report = ScheduleReport(
+            task_labels=[str(getattr(task.agent, "role", task.agent)) for task in tasks],
+            task_durations=ordered_durations,
+            critical_path=path,
+            critical_path_seconds=path_seconds,
+            wall_clock_seconds=time.perf_counter() - start,
+            reused_tasks=sorted(reused),
+        )
+
+        tasks_output = [outputs[i] for i in range(len(tasks))]
+        final_output = tasks_output[-1]
+        result = CrewOutput(
+            raw=final_output.raw,
+            pydantic=final_output.pydantic,
+            json_dict=final_output.json_dict,
+            tasks_output=tasks_output,
+            token_usage=crew.calculate_usage_metrics(),
+        )
+        return result, report
@@ -0,0 +1,218 @@
+"""Token counting, context-window budgeting and pre-flight cost estimates for analysis runs."""
+
+import threading
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from logger import logger
+
+# Used when no tiktoken encoding can be loaded (e.g. offline without a cached BPE file)
+CHARS_PER_TOKEN = 4
+# Share of the context window kept free for tokenizer differences between providers
+SAFETY_MARGIN = 0.05
+# Upper bound on the job description's share of the input when both inputs must be cut
+JOB_DESCRIPTION_SHARE = 0.25
+TRUNCATION_MARKER = "\n[... truncated to fit the model's context window ...]"
+
+
+@dataclass(frozen=True)
+class ModelProfile:
+    """Context window, list price (USD per million tokens) and throughput of a model."""
+
+    context_window: int
+    max_output_tokens: int
+    input_price: float
+    output_price: float
+    output_tokens_per_second: float
+    request_overhead_seconds: float = 1.0
+
+
+# Matched by longest prefix, so dated or "-exp" variants share their family's profile
+MODEL_PROFILES: Dict[str, ModelProfile] = {
+    "gemini-1.5-flash": ModelProfile(1_048_576, 8_192, 0.075, 0.30, 150),
+    "gemini-1.5-pro": ModelProfile(2_097_152, 8_192, 1.25, 5.00, 60),
+    "gemini-2.0-flash": ModelProfile(1_048_576, 8_192, 0.10, 0.40, 180),
+    "gemini-2.0-flash-lite": ModelProfile(1_048_576, 8_192, 0.075, 0.30, 200),
+    "gemini-2.5-flash": ModelProfile(1_048_576, 65_536, 0.30, 2.50, 180),
+    "gemini-2.5-pro": ModelProfile(1_048_576, 65_536, 1.25, 10.00, 80, 3.0),
+    "gemini-3": ModelProfile(1_048_576, 65_536, 2.00, 12.00, 80, 3.0),
+    "gpt-4o": ModelProfile(128_000, 16_384, 2.50, 10.00, 70),
+    "gpt-4o-mini": ModelProfile(128_000, 16_384, 0.15, 0.60, 90),
+    "gpt-4-turbo": ModelProfile(128_000, 4_096, 10.00, 30.00, 30),
+    "gpt-4.1": ModelProfile(1_047_576, 32_768, 2.00, 8.00, 80),
+    "gpt-4.1-mini": ModelProfile(1_047_576, 32_768, 0.40, 1.60, 100),
+}
+DEFAULT_PROFILE = ModelProfile(128_000, 4_096, 2.50, 10.00, 50)
+
+
+def get_model_profile(model: str) -> ModelProfile:
+    """Returns the profile of the longest known prefix of ``model``, or a conservative default."""
+    name = model.split("/")[-1].lower()
+    matches = [prefix for prefix in MODEL_PROFILES if name.startswith(prefix)]
+    return MODEL_PROFILES[max(matches, key=len)] if matches else DEFAULT_PROFILE
+
+
+class TokenCounter:
+    """Counts and truncates text in tokens using tiktoken.
+
+    OpenAI models use their own encoding; other providers are approximated with
+    ``o200k_base``. If no encoding can be loaded, a characters-per-token estimate is used.
+    """
+
+    def __init__(self):
+        self._encodings: Dict[str, object] = {}
+        self._lock = threading.Lock()
+
+    def _encoding(self, model: str):
+        name = model.split("/")[-1]
+        with self._lock:
+            if name not in self._encodings:
+                try:
+                    import tiktoken
+
+                    try:
+                        encoding = tiktoken.encoding_for_model(name)
+                    except KeyError:
+                        encoding = tiktoken.get_encoding("o200k_base")
+                except Exception as e:
+                    logger.warning(f"No tiktoken encoding available for {name}, estimating tokens: {str(e)}")
+                    encoding = None
+                self._encodings[name] = encoding
+            return self._encodings[name]
+
+    def count(self, text: str, model: str) -> int:
+        if not text:
+            return 0
+        encoding = self._encoding(model)
+        if encoding is None:
+            return -(-len(text) // CHARS_PER_TOKEN)
+        return len(encoding.encode(text, disallowed_special=()))
+
+    def truncate(self, text: str, max_tokens: int, model: str) -> str:
+        """Returns ``text`` cut to at most ``max_tokens`` tokens, marking the cut if one was made."""
+        if self.count(text, model) <= max_tokens:
+            return text
+        keep = max(0, max_tokens - self.count(TRUNCATION_MARKER, model))
+        encoding = self._encoding(model)
+        if encoding is None:
+            return text[: keep * CHARS_PER_TOKEN] + TRUNCATION_MARKER
+        return encoding.decode(encoding.encode(text, disallowed_special=())[:keep]) + TRUNCATION_MARKER
+
+
+@dataclass
+class TaskBudget:
+    """The prompt of one task, split into fixed text and the shared CV / job description inputs.
+
+    ``cv_copies`` and ``job_copies`` say how many times each input appears in the prompt;
+    ``context_tokens`` estimates the upstream outputs the task receives as context.
+    """
+
+    label: str
+    fixed_text: str
+    cv_copies: int = 0
+    job_copies: int = 0
+    context_tokens: int = 0
+    expected_output_tokens: int = 1_000
+    parallel: bool = False
+
+
+@dataclass
+class TaskEstimate:
+    label: str
+    input_tokens: int
+    output_tokens: int
+    seconds: float
+    parallel: bool = False
+
+
+@dataclass
+class RunEstimate:
+    """Pre-flight estimate of a whole analysis run."""
+
+    model: str
+    tasks: List[TaskEstimate] = field(default_factory=list)
+    cost_usd: float = 0.0
+    seconds: float = 0.0
+    cv_truncated: bool = False
+    job_truncated: bool = False
+
+    @property
+    def input_tokens(self) -> int:
+        return sum(task.input_tokens for task in self.tasks)
+
+    @property
+    def output_tokens(self) -> int:
+        return sum(task.output_tokens for task in self.tasks)
+
+
+class PromptBudget:
+    """Fits the CV and job description into a model's context window and estimates a run."""
+
+    def __init__(self, model: str, counter: Optional["TokenCounter"] = None):
+        self.model = model
+        self.profile = get_model_profile(model)
+        self.counter = counter or token_counter
+
+    def count(self, text: str) -> int:
+        return self.counter.count(text, self.model)
+
+    def _available(self, task: TaskBudget) -> int:
+        window = int(self.profile.context_window * (1 - SAFETY_MARGIN))
+        output = min(task.expected_output_tokens, self.profile.max_output_tokens)
+        return window - output - self.count(task.fixed_text) - task.context_tokens
+
+    def fit(self, tasks: List[TaskBudget], cv_content: str, job_description: str) -> Tuple[str, str]:
+        """Returns the CV and job description, truncated only as far as the tightest task requires."""
+        cv_tokens, job_tokens = self.count(cv_content), self.count(job_description)
+        limits = [(self._available(task), task.cv_copies, task.job_copies) for task in tasks]
+
+        def fits(cv: int, job: int) -> bool:
+            return all(cv * cv_copies + job * job_copies <= available for available, cv_copies, job_copies in limits)
+
+        if fits(cv_tokens, job_tokens):
+            return cv_content, job_description
+
+        job_limit = job_tokens
+        for available, _, job_copies in limits:
+            if job_copies:
+                job_limit = min(job_limit, int(max(0, available) * JOB_DESCRIPTION_SHARE) // job_copies)
+        cv_limit = cv_tokens
+        for available, cv_copies, job_copies in limits:
+            if cv_copies:
+                cv_limit = min(cv_limit, max(0, available - job_limit * job_copies) // cv_copies)
+
+        logger.warning(
+            f"Inputs exceed the context window of {self.model}: CV {cv_tokens} -> {cv_limit} tokens, "
+            f"job description {job_tokens} -> {job_limit} tokens."
+        )
+        return (
+            self.counter.truncate(cv_content, cv_limit, self.model),
+            self.counter.truncate(job_description, job_limit, self.model),
+        )
+
+    def estimate(self, tasks: List[TaskBudget], cv_content: str, job_description: str) -> RunEstimate:
+        """Estimates tokens, list-price cost and wall-clock time of running ``tasks`` once."""
+        fitted_cv, fitted_job = self.fit(tasks, cv_content, job_description)
+        cv_tokens, job_tokens = self.count(fitted_cv), self.count(fitted_job)
+        profile = self.profile
+
+        run = RunEstimate(model=self.model, cv_truncated=fitted_cv != cv_content, job_truncated=fitted_job != job_description)
+        parallel_seconds = 0.0
+        for task in tasks:
+            input_tokens = (
+                self.count(task.fixed_text) + task.cv_copies * cv_tokens + task.job_copies * job_tokens + task.context_tokens
+            )
+            output_tokens = min(task.expected_output_tokens, profile.max_output_tokens)
+            seconds = profile.request_overhead_seconds + output_tokens / profile.output_tokens_per_second
+            run.tasks.append(TaskEstimate(task.label, input_tokens, output_tokens, seconds, task.parallel))
+            run.cost_usd += (input_tokens * profile.input_price + output_tokens * profile.output_price) / 1_000_000
+            if task.parallel:
+                parallel_seconds = max(parallel_seconds, seconds)
+            else:
+                run.seconds += seconds
+        run.seconds += parallel_seconds
+        return run
+
+
+# Process-wide instance; loaded encodings are shared by all sessions
+token_counter = TokenCounter()
@@ -0,0 +1,77 @@
+"""Background warm-up of heavy modules and shared caches when a server process starts."""
+
+import importlib
+import os
+import threading
+import time
+from typing import Callable, List, Tuple
+
+from logger import logger
+
+# Step modules pull in crewai, fpdf, pypdf, bs4 and yaml; loading them early keeps later steps snappy
+WARMUP_MODULES = (
+    "steps.upload",
+    "steps.job",
+    "steps.team",
+    "steps.results",
+    "steps.personalize",
+)
+
+_started = False
+_lock = threading.Lock()
+
+
+def _warm_personas():
+    from services.persona_service import PersonaService
+
+    PersonaService.load_personas()
+    PersonaService.get_persona_index()
+
+
+def _warm_token_counter():
+    from services.config_service import CHEAP_MODELS
+    from services.token_budget import token_counter
+
+    for model in CHEAP_MODELS.values():
+        token_counter.count("warm-up", model)
+
+
+def _warm_http_session():
+    from scraper import get_session
+
+    get_session()
+
+
+WARMUP_TASKS: List[Tuple[str, Callable[[], None]]] = [
+    ("persona catalog", _warm_personas),
+    ("token counter", _warm_token_counter),
+    ("HTTP session", _warm_http_session),
+]
+
+
+def warm_up():
+    """Imports the step modules and fills the process-wide caches, logging how long each part took."""
+    started = time.perf_counter()
+    parts = [(module, lambda module=module: importlib.import_module(module)) for module in WARMUP_MODULES]
+    for label, task in parts + WARMUP_TASKS:
+        part_started = time.perf_counter()
+        try:
+            task()
+        except Exception as e:
+            logger.warning(f"Warm-up of {label} failed: {str(e)}")
+            continue
+        logger.debug(f"Warm-up of {label} took {time.perf_counter() - part_started:.2f}s")
+    logger.info(f"Startup warm-up finished in {time.perf_counter() - started:.2f}s")
+
+
+def start_warmup() -> bool:
+    """Starts ``warm_up`` on a daemon thread once per process; returns False if it already ran or is disabled."""
+    global _started
+    # Read at call time, after the app has loaded .env
+    enabled = os.getenv("STARTUP_WARMUP_ENABLED", "true").lower() == "true"
+    with _lock:
+        if _started or not enabled:
+            return False
+        _started = True
+    threading.Thread(target=warm_up, name="startup-warmup", daemon=True).start()
+    return True
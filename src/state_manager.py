@@ -1,7 +1,15 @@
+import uuid
+from typing import Dict, List, Optional
+
 import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
 
-from models import AppConfig, JobInfo
+from models import AnalysisResult, AppConfig, JobInfo, Persona
 from services.config_service import ConfigService
+from services.session_memory import session_memory
+
+# Large values released to disk while a session is idle; the config holds API keys and is never written out
+SPILLABLE_KEYS = ("cv_content", "job", "crew_result", "board_agents", "custom_agents", "interview_questions")
 
 
 class StateManager:
@@ -12,34 +20,71 @@ class StateManager:
         # when the module is first imported as a singleton.
         pass
 
-    def ensure_initialized(self):
-        """Ensures that all required session state variables are initialized."""
+    @staticmethod
+    def _defaults() -> dict:
+        """Returns the initial value of every session state variable the manager owns."""
         is_online = ConfigService.get_is_online()
         config = AppConfig(
             is_online=is_online,
             llm_provider="Google",
             api_key=ConfigService.get_env_api_key("Google") if is_online else "",
             selected_model=ConfigService.get_cheap_model("Google") if is_online else "",
+            execution_mode=ConfigService.get_execution_mode(),
+            max_workers=ConfigService.get_max_workers(),
+            use_response_cache=ConfigService.get_response_cache_enabled(),
+            fallback_models=ConfigService.get_fallback_models(),
         )
 
-        defaults = {
+        return {
             "step": 0,
             "config": config,
             "job": JobInfo(),
             "cv_content": "",
             "cv_filename": "",
             "selected_persona_names": ["LinkedIn Matchmaker (matchmaker)"],
+            "persona_selection_touched": False,
+            "recommended_for": "",
             "custom_agents": [],
             "crew_result": None,
+            "served_models": {},
+            "result_id": "",
+            "analysis_job_id": "",
+            "session_id": uuid.uuid4().hex,
             "interview_questions": [],
             "user_answers": {},
             "interview_done": False,
             "board_agents": [],
         }
-        for key, value in defaults.items():
+
+    def ensure_initialized(self):
+        """Ensures that all required session state variables are initialized."""
+        for key, value in self._defaults().items():
             if key not in st.session_state:
                 st.session_state[key] = value
 
+    def track_memory(self):
+        """Reports this session's state to the memory accounting, restoring values spilled while idle.
+
+        Must run before anything reads the session state in a script run.
+        """
+        self.ensure_initialized()
+        # st.session_state resolves to a locked per-run view; the accounting also holds the state that outlives it
+        guard = getattr(get_script_run_ctx(), "session_state", None)
+        state = getattr(guard, "_state", None)
+        if state is None:
+            return
+        session_memory.touch(self.session_id, state, list(self._defaults()), SPILLABLE_KEYS, guard=guard)
+        # Values whose spill file was lost are dropped and start over from their defaults
+        self.ensure_initialized()
+
+    def keep_alive(self):
+        """Marks the session active from a fragment run, which does not go through ``track_memory``."""
+        session_memory.keep_alive(self.session_id, getattr(get_script_run_ctx(), "session_state", None))
+
+    def busy(self):
+        """Context manager that keeps this session's state in memory while a long step runs."""
+        return session_memory.busy(self.session_id)
+
     @property
     def step(self) -> int:
         self.ensure_initialized()
@@ -76,15 +121,68 @@ class StateManager:
         st.session_state.selected_persona_names = value
 
     @property
-    def crew_result(self):
+    def crew_result(self) -> Optional[AnalysisResult]:
         self.ensure_initialized()
         return st.session_state.crew_result
 
     @crew_result.setter
-    def crew_result(self, value):
+    def crew_result(self, value: Optional[AnalysisResult]):
         self.ensure_initialized()
         st.session_state.crew_result = value
 
+    @property
+    def served_models(self) -> Dict[str, str]:
+        """The "provider/model" that answered each task of the current result, by agent role."""
+        self.ensure_initialized()
+        return st.session_state.served_models
+
+    @served_models.setter
+    def served_models(self, value: Dict[str, str]):
+        self.ensure_initialized()
+        st.session_state.served_models = value
+
+    @property
+    def result_id(self) -> str:
+        """Shareable ID of the current result in the result store, or "" if it is not stored."""
+        self.ensure_initialized()
+        return st.session_state.result_id
+
+    @result_id.setter
+    def result_id(self, value: str):
+        self.ensure_initialized()
+        st.session_state.result_id = value
+
+    @property
+    def analysis_job_id(self) -> str:
+        self.ensure_initialized()
+        return st.session_state.analysis_job_id
+
+    @analysis_job_id.setter
+    def analysis_job_id(self, value: str):
+        self.ensure_initialized()
+        st.session_state.analysis_job_id = value
+
+    @property
+    def session_id(self) -> str:
+        """Stable ID of this browser session, used for rate limiting and quotas."""
+        self.ensure_initialized()
+        return st.session_state.session_id
+
+    def get_board_personas(self) -> List[Persona]:
+        """Returns the selected pre-defined personas followed by the custom specialists."""
+        self.ensure_initialized()
+        personas = list(st.session_state.board_agents)
+        for custom in self.custom_agents:
+            personas.append(
+                Persona(
+                    name=custom["name"],
+                    role=custom["name"],
+                    goal=f"Provide specialized analysis as {custom['name']}",
+                    backstory=custom["prompt"],
+                )
+            )
+        return personas
+
     def next_step(self):
         self.step += 1
         st.rerun()
@@ -100,11 +198,17 @@ class StateManager:
         st.session_state.cv_filename = ""
         st.session_state.job = JobInfo()
         st.session_state.crew_result = None
+        st.session_state.served_models = {}
+        st.session_state.result_id = ""
+        st.session_state.analysis_job_id = ""
         st.session_state.interview_questions = []
         st.session_state.user_answers = {}
         st.session_state.interview_done = False
         st.session_state.board_agents = []
         st.session_state.selected_persona_names = ["LinkedIn Matchmaker (matchmaker)"]
+        st.session_state.persona_selection_touched = False
+        st.session_state.recommended_for = ""
+        st.query_params.clear()
         st.rerun()
 
     def update_config(self, **kwargs):
@@ -35,6 +35,8 @@ def on_api_key_change():
             new_key = ConfigService.get_env_api_key(state_manager.config.llm_provider)
 
         state_manager.update_config(api_key=new_key)
+        # Start listing models now, so the list is usually ready by the time the page reruns
+        ConfigService.prefetch_models({state_manager.config.llm_provider: new_key})
 
         if "available_models" in st.session_state:
             del st.session_state.available_models
@@ -45,6 +47,11 @@ def on_model_change():
     state_manager.update_config(selected_model=st.session_state.model_selector)
 
 
+def on_response_cache_change():
+    """Callback when the response cache toggle changes."""
+    state_manager.update_config(use_response_cache=st.session_state.response_cache_toggle)
+
+
 def _render_online_config(config):
     """Render configuration for online mode."""
     st.success(f"System is pre-configured with **{config.selected_model}** and ready to go!")
@@ -107,21 +114,26 @@ def _get_available_models(config, is_online):
     if is_online and not custom_key_input:
         active_key = system_key
 
-    available_models = []
-    if active_key:
-        cache_key = f"models_{config.llm_provider}_{active_key}"
-        if cache_key in st.session_state:
-            available_models = st.session_state[cache_key]
-        else:
-            available_models = ConfigService.fetch_models(config.llm_provider, active_key)
-            if available_models:
-                st.session_state[cache_key] = available_models
-    return available_models, custom_key_input, system_key
+    # Model lists are cached process-wide by key fingerprint, never in the session
+    available_models, validated = ConfigService.fetch_models(config.llm_provider, active_key) if active_key else ([], False)
+    return available_models, validated, custom_key_input, system_key
+
 
+@st.fragment(run_every=1)
+def _await_key_validation(provider, api_key):
+    """Poll the model catalog until the provider has answered for the key, then redraw the step."""
+    _, validated = ConfigService.fetch_models(provider, api_key, timeout=0)
+    if validated:
+        st.rerun()
 
-def _render_model_selection(config, available_models, custom_key_input, system_key):
+
+def _render_model_selection(config, available_models, validated, custom_key_input, system_key):
     """Render model selection dropdown."""
-    if available_models:
+    if config.api_key and not validated:
+        # The provider has not answered yet; the default list says nothing about whether the key works
+        st.info(f"⏳ Validating your {config.llm_provider} API key...")
+        _await_key_validation(config.llm_provider, config.api_key)
+    elif available_models:
         st.success(f"{config.llm_provider} API Key Validated!")
 
         current_selection = config.selected_model
@@ -162,8 +174,16 @@ def render_config_step():
     else:
         _render_offline_config(config)
 
-    models, custom_key, sys_key = _get_available_models(config, config.is_online)
-    _render_model_selection(config, models, custom_key, sys_key)
+    models, validated, custom_key, sys_key = _get_available_models(config, config.is_online)
+    _render_model_selection(config, models, validated, custom_key, sys_key)
+
+    st.checkbox(
+        "♻️ Reuse saved AI responses when the inputs are identical",
+        value=config.use_response_cache,
+        key="response_cache_toggle",
+        on_change=on_response_cache_change,
+        help="Re-running the same CV, job and board returns instantly. Untick to always ask the AI again.",
+    )
 
-    if st.button("Next: Upload CV ➡️", type="primary", disabled=not models, use_container_width=True):
+    if st.button("Next: Upload CV ➡️", type="primary", disabled=not (models and validated), use_container_width=True):
         state_manager.next_step()
@@ -0,0 +1,51 @@
+"""Module for rendering the session memory report, opened with ``?page=memory``."""
+
+import time
+
+import streamlit as st
+
+from services.session_memory import session_memory
+
+TOP_SESSIONS = 20
+
+
+def _format_bytes(size: int) -> str:
+    for unit in ("B", "KB", "MB"):
+        if size < 1024:
+            return f"{size:.0f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GB"
+
+
+def render_memory_page():
+    """Render the report of the sessions holding the most memory in this server process."""
+    st.subheader("Session Memory")
+    footprints = session_memory.report(top=len(session_memory))
+
+    sessions_col, memory_col, spilled_col = st.columns(3)
+    sessions_col.metric("Sessions", len(footprints))
+    memory_col.metric("In memory", _format_bytes(sum(footprint.total_bytes for footprint in footprints)))
+    spilled_col.metric("Spilled to disk", _format_bytes(sum(footprint.spilled_bytes for footprint in footprints)))
+    st.caption(
+        f"Measured on each session's latest run. Idle sessions spill large values after "
+        f"{session_memory.idle_seconds / 60:.0f} min and are evicted after {session_memory.evict_seconds / 3600:.0f} h."
+    )
+
+    if not footprints:
+        st.info("No sessions tracked yet.")
+        return
+
+    now = time.time()
+    rows = []
+    for footprint in footprints[:TOP_SESSIONS]:
+        largest = sorted(footprint.sizes.items(), key=lambda item: item[1], reverse=True)[:3]
+        rows.append(
+            {
+                "Session": footprint.session_id[:8],
+                "Idle": f"{(now - footprint.last_seen) / 60:.0f} min",
+                "In memory": _format_bytes(footprint.total_bytes),
+                "Spilled": _format_bytes(footprint.spilled_bytes),
+                "Largest keys": ", ".join(f"{key} ({_format_bytes(size)})" for key, size in largest),
+            }
+        )
+    st.table(rows)
@@ -1,9 +1,6 @@
 """Module for rendering the personalization/interview step in the application."""
 
-import os
-
 import streamlit as st
-from crewai import Agent, Crew, Task
 
 
 def render_personalize_step():
@@ -22,32 +19,12 @@ def render_personalize_step():
 
         if not st.session_state.interview_questions:
             if st.button("🎤 Generate Questions", use_container_width=True, type="primary"):
-                with st.spinner("Board is reviewing documents..."):
-                    config = state_manager.config
-                    provider = config.llm_provider
-                    api_key = config.api_key
-                    model = config.selected_model
-
-                    if provider == "Google":
-                        os.environ["GEMINI_API_KEY"] = api_key
-                        crew_model = f"gemini/{model}"
-                    else:
-                        os.environ["OPENAI_API_KEY"] = api_key
-                        crew_model = f"openai/{model}"
+                with st.spinner("Board is reviewing documents..."), state_manager.busy():
+                    from services.analysis_service import AnalysisService
 
-                    interviewer = Agent(
-                        role="Board Interviewer",
-                        goal="Identify gaps and ask 3-4 targeted questions.",
-                        backstory="You are an expert recruiter gathering achievements.",
-                        llm=crew_model,
-                        allow_delegation=False,
-                    )
-                    it_task = Task(
-                        description=f"Based on CV: {st.session_state.cv_content[:1500]}, ask 3 specific questions.",
-                        expected_output="3 numbered questions.",
-                        agent=interviewer,
+                    interview_crew = AnalysisService.create_interview_crew(
+                        st.session_state.cv_content, state_manager.config, session_id=state_manager.session_id
                     )
-                    interview_crew = Crew(agents=[interviewer], tasks=[it_task], verbose=False)
                     q_result = str(interview_crew.kickoff())
                     st.session_state.interview_questions = [
                         q.strip() for q in q_result.split("\n") if q.strip() and q.strip()[0].isdigit()
@@ -62,7 +39,7 @@ def render_personalize_step():
                     )
 
                 if st.form_submit_button("✨ Generate Optimized CV ➡️", use_container_width=True, type="primary"):
-                    with st.spinner("Board is incorporating your answers..."):
+                    with st.spinner("Board is incorporating your answers..."), state_manager.busy():
                         combined_answers = "\n".join(
                             [
                                 f"Q: {q}\nA: {st.session_state.user_answers.get(f'q_{i}', '')}"
@@ -71,19 +48,36 @@ def render_personalize_step():
                         )
                         # We use AnalysisService instead of create_crew for consistency with state_manager
                         from services.analysis_service import AnalysisService
-                        from services.persona_service import PersonaService
-
-                        available_personas = PersonaService.load_personas()
-                        selected_personas = [available_personas[name] for name in state_manager.selected_persona_names]
 
                         crew = AnalysisService.create_analysis_crew(
-                            selected_personas=selected_personas,
+                            selected_personas=state_manager.get_board_personas(),
                             cv_content=st.session_state.cv_content,
                             job_description=state_manager.job.description,
                             config=state_manager.config,
                             user_answers=combined_answers,
+                            session_id=state_manager.session_id,
+                        )
+                        # Only the reformatter consumes the answers, so every other output is reused
+                        state_manager.crew_result = AnalysisService.rerun_changed_tasks(
+                            crew, state_manager.crew_result, state_manager.config
+                        )
+                        state_manager.served_models = {
+                            **state_manager.served_models,
+                            **AnalysisService.served_models(crew),
+                        }
+                        from services.result_store import result_store
+
+                        store_key = result_store.make_key(
+                            st.session_state.cv_content,
+                            state_manager.job.description,
+                            state_manager.get_board_personas(),
+                            state_manager.config.llm_provider,
+                            state_manager.config.selected_model,
+                            user_answers=combined_answers,
+                        )
+                        state_manager.result_id = result_store.put(
+                            store_key, state_manager.crew_result, state_manager.served_models
                         )
-                        state_manager.crew_result = crew.kickoff()
                         st.session_state.interview_done = True
                         state_manager.step = 5  # Back to results
                         st.rerun()
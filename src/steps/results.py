@@ -3,103 +3,213 @@
 import streamlit as st
 
 from logger import logger
-from models import Persona
 from services.analysis_service import AnalysisService
 from services.cv_service import CVService
+from services.job_manager import JOB_FAILED, AnalysisJob, job_manager
+from services.rate_limiter import rate_limiter
+from services.result_store import StoredResult, result_store
 from state_manager import state_manager
 
+# How often the live board polls the background job; also caps the redraw rate while tokens stream in
+POLL_INTERVAL_SECONDS = 0.5
 
-def _run_analysis():
-    """Execute the CrewAI analysis process."""
+LIVE_OUTPUTS = [
+    ("Board Head", "⏳ Waiting for Board Head synthesis...", "✅ Board Report Ready!", "📋"),
+    ("Optimizer", "⏳ Waiting for optimization suggestions...", "✅ Minimal Changes Ready!", "🛠️"),
+    ("Reformatter", "⏳ Waiting for final CV reformatting...", "✅ Final CV Ready!", "📄"),
+]
+
+
+def _show_stored_result(stored: StoredResult):
+    state_manager.crew_result = stored.result
+    state_manager.served_models = stored.served_models
+    state_manager.result_id = stored.result_id
+
+
+def open_shared_result(result_id: str) -> bool:
+    """Loads the result behind a shared ``?result=`` link into this session and opens the results step."""
+    if result_id == state_manager.result_id:
+        return True
+    stored = result_store.get(result_id)
+    if stored is None:
+        del st.query_params["result"]
+        st.warning("This result link has expired or does not exist.")
+        return False
+    _show_stored_result(stored)
+    state_manager.analysis_job_id = ""
+    state_manager.step = 5
+    return True
+
+
+def _start_analysis():
+    """Submit the CrewAI analysis to the background job manager and remember its job ID."""
     try:
         # Combine selected pre-defined personas and custom personas
-        selected_personas = list(st.session_state.get("board_agents", []))
-
-        # Add custom personas (as Persona objects)
-        for custom in state_manager.custom_agents:
-            selected_personas.append(
-                Persona(
-                    name=custom["name"],
-                    role=custom["name"],
-                    goal=f"Provide specialized analysis as {custom['name']}",
-                    backstory=custom["prompt"],
-                )
-            )
+        selected_personas = state_manager.get_board_personas()
+        cv_content = st.session_state.cv_content
+        job_description = state_manager.job.description
+        config = state_manager.config
+        session_id = state_manager.session_id
+
+        store_key = result_store.make_key(
+            cv_content, job_description, selected_personas, config.llm_provider, config.selected_model
+        )
+        # Unticking "reuse saved AI responses" asks for a fresh analysis; the new result is still stored
+        stored = result_store.get_by_key(store_key) if config.use_response_cache else None
+        if stored is not None:
+            logger.info(f"Reusing stored analysis result {stored.result_id}")
+            _show_stored_result(stored)
+            st.rerun()
+            return
+
+        key = job_manager.make_key(
+            cv_content,
+            job_description,
+            [(p.name, p.goal, p.backstory) for p in selected_personas],
+            config.llm_provider,
+            config.selected_model,
+            AnalysisService.hash_api_key(config.api_key),
+        )
+
+        def work(job: AnalysisJob):
+            def on_task_complete(output):
+                job.record_task_output(output)
+                if "Reformatter" in str(getattr(output.agent, "role", output.agent)):
+                    # Lay the PDF out now so the results tab only has to serve cached bytes
+                    CVService.prerender_pdf(str(output.raw))
 
-        # Create containers for real-time updates
-        st.write("### 📊 Live Analysis Board")
-        tabs = st.tabs(["📋 Board Report", "🛠️ Minimal Changes", "📄 PDF Generated"])
-
-        with tabs[0]:
-            board_placeholder = st.empty()
-            board_placeholder.info("⏳ Waiting for Board Head synthesis...")
-        with tabs[1]:
-            changes_placeholder = st.empty()
-            changes_placeholder.info("⏳ Waiting for optimization suggestions...")
-        with tabs[2]:
-            final_cv_placeholder = st.empty()
-            final_cv_placeholder.info("⏳ Waiting for final CV reformatting...")
-
-        def on_task_complete(output):
-            """Callback for updating UI when a task completes."""
-            try:
-                # Determine which agent completed the task
-                role = output.agent
-                if hasattr(role, "role"):
-                    role = role.role
-                role = str(role)
-
-                result_text = output.raw
-
-                # Clean markdown
-                clean_text = CVService.clean_markdown_code_blocks(str(result_text))
-
-                if "Board Head" in role:
-                    board_placeholder.markdown(clean_text)
-                    st.toast("✅ Board Report Ready!", icon="📋")
-
-                elif "Optimizer" in role:
-                    changes_placeholder.markdown(clean_text)
-                    st.toast("✅ Minimal Changes Ready!", icon="🛠️")
-
-                elif "Reformatter" in role:
-                    final_cv_placeholder.markdown(clean_text)
-                    # We can't generate the download button here effectively inside a callback
-                    # because it might reset on rerun.
-                    # But we can show the text.
-                    st.toast("✅ Final CV Ready!", icon="📄")
-
-            except Exception as e:
-                logger.error(f"Error in task callback: {e}")
-
-        with st.status("🚀 The Board is now in session...", expanded=True) as status:
-            st.write("🔍 Assembling the team of specialists...")
             crew = AnalysisService.create_analysis_crew(
                 selected_personas=selected_personas,
-                cv_content=st.session_state.cv_content,
-                job_description=state_manager.job.description,
-                config=state_manager.config,
+                cv_content=cv_content,
+                job_description=job_description,
+                config=config,
                 task_callback=on_task_complete,
+                stream_output=True,
+                session_id=session_id,
             )
-
-            st.write("🤖 Specialists are analyzing your CV against the job description...")
-            # This is the blocking call where the main work happens
-            result = crew.kickoff()
-
-            st.write("📝 Analysis complete!")
-            status.update(label="✅ Analysis Complete!", state="complete", expanded=False)
-
-            state_manager.crew_result = result
-            st.rerun()
+            result = AnalysisService.run_crew(crew, config, stream_callback=job.record_stream_chunk)
+            job.served_models = AnalysisService.served_models(crew)
+            job.result_id = result_store.put(store_key, result, job.served_models)
+            return result
+
+        state_manager.analysis_job_id = job_manager.submit(key, work)
+        st.session_state.announced_outputs = []
+        st.rerun()
     except Exception as e:
         logger.error(f"Analysis failed: {str(e)}")
         st.error(f"Analysis failed: {str(e)}")
 
 
+def _render_job_outputs(job: AnalysisJob):
+    """Render the outputs the background job has produced so far."""
+    st.write("### 📊 Live Analysis Board")
+    tabs = st.tabs(["📋 Board Report", "🛠️ Minimal Changes", "📄 PDF Generated"])
+    announced = st.session_state.setdefault("announced_outputs", [])
+
+    for tab, (role_marker, waiting_text, ready_text, icon) in zip(tabs, LIVE_OUTPUTS):
+        text = next((raw for role, raw in job.task_outputs.items() if role_marker in role), None)
+        with tab:
+            if text is None:
+                partial = next((job.streamed_text(role) for role in list(job.stream_chunks) if role_marker in role), "")
+                if partial:
+                    # Agents may prefix the answer with their reasoning; only show the answer itself
+                    partial = partial.split("Final Answer:", 1)[-1]
+                    st.markdown(CVService.clean_markdown_code_blocks(partial) + " ▌")
+                else:
+                    st.info(waiting_text)
+                continue
+            st.markdown(CVService.clean_markdown_code_blocks(text))
+        if role_marker not in announced:
+            announced.append(role_marker)
+            st.toast(ready_text, icon=icon)
+
+
+def _render_run_estimate():
+    """Show the pre-flight token, cost and duration estimate for the current inputs."""
+    config = state_manager.config
+    try:
+        estimate = AnalysisService.estimate_run(
+            state_manager.get_board_personas(), st.session_state.cv_content, state_manager.job.description, config
+        )
+    except Exception as e:
+        logger.warning(f"Could not estimate the analysis run: {str(e)}")
+        return
+
+    st.markdown(f"**Estimated usage** for `{config.selected_model}`")
+    tokens_col, cost_col, time_col = st.columns(3)
+    tokens_col.metric("Tokens", f"{estimate.input_tokens + estimate.output_tokens:,}")
+    cost_col.metric("Cost", f"${estimate.cost_usd:.4f}")
+    time_col.metric("Duration", f"~{estimate.seconds:.0f}s")
+    st.caption(
+        f"{estimate.input_tokens:,} input + {estimate.output_tokens:,} output tokens across {len(estimate.tasks)} tasks "
+        "at list prices. Actual usage depends on the answers the AI writes."
+    )
+    if estimate.cv_truncated or estimate.job_truncated:
+        st.warning("Your CV or job description is longer than this model can read and will be shortened.")
+
+    # Each task is at least one LLM call through the shared rate limiter
+    wait = rate_limiter.estimate_wait(AnalysisService.rate_limit_key(config), len(estimate.tasks))
+    if wait >= 1:
+        st.info(f"🚦 High demand right now: expect about **{wait:.0f}s** of extra queueing.")
+    remaining = rate_limiter.remaining_quota(state_manager.session_id)
+    if remaining is not None and remaining < len(estimate.tasks):
+        st.warning(f"This session has {remaining} AI requests left this hour; a review needs about {len(estimate.tasks)}.")
+
+
+def _render_fallback_notice():
+    """Tell the user which tasks were answered by a fallback model instead of the selected one."""
+    selected = AnalysisService.rate_limit_key(state_manager.config)
+    fallbacks = {role: model for role, model in state_manager.served_models.items() if model != selected}
+    if fallbacks:
+        st.info(
+            f"🔁 {selected} was unavailable for some tasks, so they were answered by fallback models: "
+            + ", ".join(f"{role} → {model}" for role, model in fallbacks.items())
+        )
+
+
+@st.fragment(run_every=POLL_INTERVAL_SECONDS)
+def _render_live_board():
+    """Poll the background job, showing progress until it finishes."""
+    state_manager.keep_alive()
+    job = job_manager.get(state_manager.analysis_job_id)
+    if job is None:
+        # The job expired or the server restarted; fall back to the start screen
+        state_manager.analysis_job_id = ""
+        st.rerun()
+        return
+
+    if job.is_finished:
+        state_manager.analysis_job_id = ""
+        if job.status == JOB_FAILED:
+            st.session_state.analysis_error = job.error
+        else:
+            state_manager.crew_result = job.result
+            state_manager.served_models = job.served_models
+            state_manager.result_id = job.result_id
+        st.rerun()
+        return
+
+    with st.status("🚀 The Board is now in session...", expanded=True):
+        st.write("🤖 Specialists are analyzing your CV against the job description...")
+        st.caption("You can refresh or open another tab; the analysis keeps running in the background.")
+        key = AnalysisService.rate_limit_key(state_manager.config)
+        queued = rate_limiter.waiting(key, state_manager.session_id)
+        if queued:
+            st.caption(f"🚦 {queued} AI request(s) waiting for capacity, about {rate_limiter.estimate_wait(key, 0):.0f}s.")
+    _render_job_outputs(job)
+
+
 def render_results_step():
     """Render the analysis results step UI."""
     st.subheader("Step 5: Board Recommendations")
 
+    if state_manager.analysis_job_id:
+        _render_live_board()
+        return
+
+    if st.session_state.get("analysis_error"):
+        st.error(f"Analysis failed: {st.session_state.pop('analysis_error')}")
+
     if not state_manager.crew_result:
         # Show summary of selection
         # Collect all specialists names
@@ -120,13 +230,16 @@ def render_results_step():
         else:
             st.warning("No specialists selected. Please go back and choose at least one.")
 
+        if all_specialists:
+            _render_run_estimate()
+
         st.info("Click the button below to start the analysis.")
 
         st.warning("⏳ **Note:** The process could take up to **2 minutes**. ")
 
         is_ready = len(all_specialists) > 0
         if st.button("🚀 Start Board Review", type="primary", use_container_width=True, disabled=not is_ready):
-            _run_analysis()
+            _start_analysis()
 
         if st.button("⬅️ Back to Team Selection", use_container_width=True):
             state_manager.prev_step()
@@ -135,36 +248,28 @@ def render_results_step():
     # Results available
     result = state_manager.crew_result
 
-    # In CrewAI, result.tasks_output contains the output of each task
-    # Our tasks: [...specialists, board_head, optimization, reformat]
-    tasks_output = getattr(result, "tasks_output", [])
-
-    # Safely extract outputs
-    # Last task is Reformatter
-    final_cv = tasks_output[-1].raw if len(tasks_output) >= 1 else str(result)
-    # Second to last is Optimization
-    minimal_changes = tasks_output[-2].raw if len(tasks_output) >= 2 else "Optimization data not found."
-    # Third to last is Board Head (Synthesized Report)
-    board_report = tasks_output[-3].raw if len(tasks_output) >= 3 else str(result)
-
-    final_cv = CVService.clean_markdown_code_blocks(str(final_cv))
-    minimal_changes = CVService.clean_markdown_code_blocks(str(minimal_changes))
-    board_report = CVService.clean_markdown_code_blocks(str(board_report))
-
     st.success("Analysis Complete!")
+    if result.wall_clock_seconds:
+        tokens = result.token_usage.get("prompt_tokens", 0) + result.token_usage.get("completion_tokens", 0)
+        st.caption(f"⏱️ Finished in {result.wall_clock_seconds:.0f}s using {tokens:,} tokens.")
+    _render_fallback_notice()
+    if state_manager.result_id:
+        # Keeps the result in the URL, so a refresh or a shared link reopens it without a re-run
+        st.query_params["result"] = state_manager.result_id
+        st.caption("🔗 This result is saved: share or bookmark the page link to reopen it later.")
 
     tabs = st.tabs(["📋 Board Report", "🛠️ Minimal Changes", "📄 PDF Generated"])
 
     with tabs[0]:
-        st.markdown(board_report)
+        st.markdown(result.board_report)
 
     with tabs[1]:
         st.info("Specific keywords and phrasing tweaks identified by the board.")
-        st.markdown(minimal_changes)
+        st.markdown(result.minimal_changes)
 
     with tabs[2]:
         # PDF Download - Moved to Top
-        pdf_bytes = CVService.generate_pdf(final_cv)
+        pdf_bytes = CVService.get_pdf(result.final_cv)
         if pdf_bytes:
             st.download_button(
                 label="📥 Download Generated PDF",
@@ -184,7 +289,7 @@ def render_results_step():
         st.info(
             "💡 **Note:** The text below is a preview. The **Downloaded PDF** will have a professional layout and formatting."
         )
-        st.markdown(final_cv)
+        st.markdown(result.final_cv)
 
         if pdf_bytes:
             st.caption("👉 For a full rewrite tailored to your interview answers, use the **Personalize** step below.")
@@ -197,7 +302,15 @@ def render_results_step():
     with col2:
         if st.button("⬅️ Step Back", use_container_width=True):
             state_manager.crew_result = None
+            state_manager.result_id = ""
+            st.query_params.clear()
             st.rerun()
     with col3:
-        if st.button("✨ Personalize (WIP) ➡️", type="primary", use_container_width=True):
+        # A result opened from a shared link has no CV in this session to rewrite
+        if st.button(
+            "✨ Personalize (WIP) ➡️",
+            type="primary",
+            use_container_width=True,
+            disabled=not st.session_state.cv_content,
+        ):
             state_manager.next_step()
@@ -1,10 +1,87 @@
 """Module for rendering the team selection step in the application."""
 
+import hashlib
+
 import streamlit as st
 
 from services.persona_service import PersonaService
 from state_manager import state_manager
 
+# Number of persona checkboxes rendered per page
+PAGE_SIZE = 10
+
+
+def _change_page(delta: int):
+    st.session_state.persona_page = st.session_state.get("persona_page", 0) + delta
+
+
+def _reset_page():
+    st.session_state.persona_page = 0
+
+
+def _use_recommended(names):
+    """Replace the selection with the recommended personas and refresh the checkboxes."""
+    state_manager.selected_persona_names = list(names)
+    st.session_state.persona_selection_touched = False
+    for key in [key for key in st.session_state if str(key).startswith("chk_")]:
+        del st.session_state[key]
+
+
+def _apply_recommendations():
+    """Recommend personas for the target job and pre-select them until the user picks manually."""
+    description = state_manager.job.description
+    recommendations = PersonaService.recommend_personas(description, top_k=3)
+    if not recommendations:
+        return
+
+    names = [name for name, _ in recommendations]
+    description_hash = hashlib.sha256(description.encode("utf-8")).hexdigest()
+    if not st.session_state.persona_selection_touched and st.session_state.recommended_for != description_hash:
+        _use_recommended(names)
+        st.session_state.recommended_for = description_hash
+
+    rec_col, btn_col = st.columns([4, 1])
+    rec_col.markdown("✨ **Recommended for this job:** " + ", ".join(names))
+    btn_col.button(
+        "Use",
+        on_click=_use_recommended,
+        args=(names,),
+        disabled=set(names) == set(state_manager.selected_persona_names),
+        use_container_width=True,
+    )
+
+
+def _render_persona_search():
+    """Render the search and filter controls and return the visible page of results."""
+    index = PersonaService.get_persona_index()
+
+    search_col, source_col = st.columns([3, 2])
+    with search_col:
+        query = st.text_input(
+            "🔎 Search specialists",
+            key="persona_search",
+            placeholder="e.g. recruiter, startup, design",
+            on_change=_reset_page,
+        )
+    with source_col:
+        sources = st.multiselect("Library", options=index.available_sources, key="persona_sources", on_change=_reset_page)
+
+    results = index.search(query, sources, page=st.session_state.get("persona_page", 0), page_size=PAGE_SIZE)
+    st.session_state.persona_page = results.page
+    return results
+
+
+def _render_pagination(results):
+    """Render previous/next controls for the persona results."""
+    if results.page_count <= 1:
+        return
+    prev_col, label_col, next_col = st.columns([1, 2, 1])
+    prev_col.button("◀", on_click=_change_page, args=(-1,), disabled=results.page == 0, use_container_width=True)
+    label_col.caption(f"Page {results.page + 1} of {results.page_count} · {results.total} specialists")
+    next_col.button(
+        "▶", on_click=_change_page, args=(1,), disabled=results.page >= results.page_count - 1, use_container_width=True
+    )
+
 
 def _handle_custom_specialist():
     """Handle adding a custom specialist persona."""
@@ -38,12 +115,24 @@ def render_team_step():
 
     st.info("💡 **Note:** To manage API costs and ensure efficient processing, please select a **maximum of 3 specialists**.")
 
-    # Create a container for the checkboxes
+    _apply_recommendations()
+
     current_selection = state_manager.selected_persona_names
-    new_selection = []
+    # Filled once this run's checkbox changes are applied
+    selected_placeholder = st.empty()
+
+    results = _render_persona_search()
+    if not results.total:
+        st.warning("No specialists match your search.")
+
+    # Selections on other pages are kept; only the visible page is rendered as checkboxes
+    checked_names = []
 
     with st.container():
-        for name, persona in available_personas.items():
+        for name in results.names:
+            persona = available_personas.get(name)
+            if persona is None:
+                continue
             # Check if this persona is currently in the selected list
             is_selected = name in current_selection
 
@@ -60,7 +149,17 @@ def render_team_step():
             )
 
             if checked:
-                new_selection.append(name)
+                checked_names.append(name)
+
+    _render_pagination(results)
+
+    # Keep the existing order (e.g. recommendation rank) and append newly checked personas
+    new_selection = [
+        name
+        for name in current_selection
+        if name in available_personas and (name not in results.names or name in checked_names)
+    ]
+    new_selection += [name for name in checked_names if name not in new_selection]
 
     # Safety check (though disabled logic should prevent this)
     if len(new_selection) > 3:
@@ -68,7 +167,11 @@ def render_team_step():
         new_selection = new_selection[:3]
 
     # Update state_manager with the new selection list
+    if set(new_selection) != set(current_selection):
+        st.session_state.persona_selection_touched = True
     state_manager.selected_persona_names = new_selection
+    if new_selection:
+        selected_placeholder.markdown("**Selected:** " + ", ".join(new_selection))
 
     # Map selected names back to Persona objects for the board
     selected_personas = [available_personas[name] for name in new_selection]
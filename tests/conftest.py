@@ -0,0 +1,9 @@
+"""Shared pytest configuration for the AI CV Advisor Board test suite."""
+
+import sys
+from pathlib import Path
+
+# Application modules import each other relative to src/ (as when launched via `streamlit run src/app.py`)
+SRC_DIR = Path(__file__).resolve().parent.parent / "src"
+if str(SRC_DIR) not in sys.path:
+    sys.path.insert(0, str(SRC_DIR))
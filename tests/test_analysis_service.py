@@ -0,0 +1,150 @@
+"""Tests for analysis crew prompt assembly."""
+
+import json
+import os
+from dataclasses import replace
+from types import SimpleNamespace
+
+import pytest
+from crewai.llms.base_llm import BaseLLM
+from crewai.utilities.prompts import Prompts
+
+import services.analysis_service as analysis_service
+import services.token_budget as token_budget
+from models import AnalysisResult, AppConfig, Persona
+from services.analysis_service import AnalysisService
+from services.llm_resilience import ResiliencePolicy, llm_resilience
+from services.rate_limiter import RateLimiter
+from services.response_cache import ResponseCache
+
+CONFIG = AppConfig(llm_provider="OpenAI", selected_model="gpt-4o-mini", api_key="sk-test")
+PERSONAS = [
+    Persona(name="Recruiter", role="Recruiter", goal="Screen the CV", backstory="You hire for {job_description}"),
+    Persona(name="Coach", role="Coach", goal="Coach the candidate", backstory="You are a career coach"),
+]
+
+
+@pytest.fixture(autouse=True)
+def offline_token_counter(monkeypatch):
+    monkeypatch.setattr(token_budget.token_counter, "_encoding", lambda model: None)
+
+
+def _rendered_prompt(agent) -> str:
+    prompts = Prompts(
+        agent=agent, has_tools=False, system_template=agent.system_template, prompt_template=agent.prompt_template
+    )
+    return prompts.task_execution().prompt
+
+
+def test_every_agent_prompt_starts_with_the_shared_cv_and_job():
+    cv = "Jane Doe, engineer. Uses {role} templates. " * 20
+    crew = AnalysisService.create_analysis_crew(PERSONAS, cv, "Backend role at Acme", CONFIG)
+
+    prompts = [_rendered_prompt(agent) for agent in crew.agents]
+    shared = os.path.commonprefix(prompts)
+    assert "Uses { role } templates" in shared and "Backend role at Acme" in shared
+    assert all(cv.split(".")[0] not in task.description for task in crew.tasks)
+    assert "Backend role at Acme" not in crew.agents[0].backstory
+
+
+def test_response_cache_key_depends_on_shared_context():
+    first = AnalysisService.create_analysis_crew(PERSONAS, "CV one", "Job", CONFIG)
+    second = AnalysisService.create_analysis_crew(PERSONAS, "CV two", "Job", CONFIG)
+    assert ResponseCache.make_key("scope", first.tasks[0], []) != ResponseCache.make_key("scope", second.tasks[0], [])
+
+
+def test_token_usage_counts_shared_llms_once():
+    usage = SimpleNamespace(prompt_tokens=100, cached_prompt_tokens=60, completion_tokens=10)
+    llm = SimpleNamespace(get_token_usage_summary=lambda: usage)
+    crew = SimpleNamespace(agents=[SimpleNamespace(llm=llm), SimpleNamespace(llm=llm)])
+
+    assert AnalysisService.token_usage(crew) == {"prompt_tokens": 100, "cached_prompt_tokens": 60, "completion_tokens": 10}
+
+
+def test_model_chain_skips_fallbacks_without_an_api_key(monkeypatch):
+    monkeypatch.delenv("GOOGLE_API_KEY", raising=False)
+    config = AppConfig(
+        llm_provider="OpenAI",
+        selected_model="gpt-4o",
+        api_key="sk-test",
+        fallback_models=[("OpenAI", "gpt-4o"), ("Google", "gemini-2.0-flash"), ("OpenAI", "gpt-4o-mini")],
+    )
+    assert AnalysisService.model_chain(config) == [("OpenAI", "gpt-4o", "sk-test"), ("OpenAI", "gpt-4o-mini", "sk-test")]
+
+
+class OverloadedError(Exception):
+    status_code = 503
+
+
+class FakeLLM(BaseLLM):
+    def call(self, messages, *args, **kwargs):
+        if self.model == "overloaded-model":
+            raise OverloadedError("model overloaded")
+        return f"Final Answer: from {self.model}"
+
+
+def test_crew_llms_fail_over_and_record_the_serving_model(monkeypatch):
+    monkeypatch.setattr(AnalysisService, "_create_llm", lambda provider, model, api_key, stream=False: FakeLLM(model=model))
+    monkeypatch.setattr(llm_resilience, "_sleep", lambda seconds: None)
+    config = AppConfig(
+        llm_provider="OpenAI",
+        selected_model="overloaded-model",
+        api_key="sk-test",
+        fallback_models=[("OpenAI", "gpt-4o-mini")],
+    )
+    crew = AnalysisService.create_analysis_crew(PERSONAS[:1], "CV", "Job", config)
+    task = crew.tasks[0]
+    assert AnalysisService.served_models(crew) == {}
+
+    assert task.agent.llm.call("hello", from_task=task) == "Final Answer: from gpt-4o-mini"
+    assert AnalysisService.served_models(crew) == {"Recruiter": "OpenAI/gpt-4o-mini"}
+
+
+def test_failed_over_calls_are_charged_once_to_the_model_that_served_them(monkeypatch):
+    limiter = RateLimiter(requests_per_minute=6000, burst=10, session_quota=20)
+    policy = ResiliencePolicy(failure_threshold=1, sleep=lambda seconds: None)
+    policy.breaker("OpenAI/overloaded-model").record_failure()
+    monkeypatch.setattr(analysis_service, "rate_limiter", limiter)
+    monkeypatch.setattr(analysis_service, "llm_resilience", policy)
+    monkeypatch.setattr(AnalysisService, "_create_llm", lambda provider, model, api_key, stream=False: FakeLLM(model=model))
+    config = AppConfig(
+        llm_provider="OpenAI",
+        selected_model="overloaded-model",
+        api_key="sk-test",
+        fallback_models=[("OpenAI", "gpt-4o-mini")],
+        use_response_cache=False,
+    )
+    crew = AnalysisService.create_analysis_crew(PERSONAS[:1], "CV", "Job", config, session_id="session")
+
+    result = AnalysisService.run_crew(crew, config)
+
+    assert result.final_cv == "from gpt-4o-mini"
+    # One call per task, none charged to the model whose circuit is open
+    assert limiter.remaining_quota("session") == 20 - len(crew.tasks)
+
+
+def test_run_crew_returns_a_compact_serializable_result(monkeypatch):
+    monkeypatch.setattr(AnalysisService, "_create_llm", lambda provider, model, api_key, stream=False: FakeLLM(model=model))
+    config = AppConfig(llm_provider="OpenAI", selected_model="gpt-4o-mini", api_key="sk-test", use_response_cache=False)
+    crew = AnalysisService.create_analysis_crew(PERSONAS[:1], "CV", "Job", config)
+
+    result = AnalysisService.run_crew(crew, config)
+
+    assert not hasattr(result, "__dict__")
+    assert result.final_cv == result.minimal_changes == result.board_report == "from gpt-4o-mini"
+    assert [task.role for task in result.tasks] == [str(agent.role) for agent in crew.agents]
+    assert all(task.seconds > 0 for task in result.tasks)
+    assert AnalysisResult.from_dict(json.loads(json.dumps(result.to_dict()))) == result
+
+    rerun = AnalysisService.create_analysis_crew(PERSONAS[:1], "CV", "Job", config, user_answers="Q: Team size? A: 8")
+    updated = AnalysisService.rerun_changed_tasks(rerun, result, config)
+    assert [task.seconds > 0 for task in updated.tasks] == [False, False, False, True]
+
+    other_cv = AnalysisService.create_analysis_crew(PERSONAS[:1], "Another CV", "Job", config)
+    rerun_for_other_cv = AnalysisService.rerun_changed_tasks(other_cv, result, config)
+    assert all(task.seconds > 0 for task in rerun_for_other_cv.tasks)
+
+    other_model = replace(config, selected_model="gpt-4o")
+    same_inputs = AnalysisService.create_analysis_crew(PERSONAS[:1], "CV", "Job", other_model)
+    rerun_for_other_model = AnalysisService.rerun_changed_tasks(same_inputs, result, other_model)
+    assert all(task.seconds > 0 for task in rerun_for_other_model.tasks)
@@ -0,0 +1,76 @@
+"""Tests for the headless batch runner."""
+
+import json
+
+import pytest
+
+from exceptions import BatchManifestError
+from models import AppConfig
+from services.batch_service import ITEM_COMPLETED, BatchCheckpoint, BatchService, load_manifest
+
+
+def _write_manifest(tmp_path, rows):
+    path = tmp_path / "manifest.jsonl"
+    path.write_text("\n".join(json.dumps(row) for row in rows), encoding="utf-8")
+    return path
+
+
+def test_load_manifest_resolves_paths_and_defaults(tmp_path):
+    (tmp_path / "job.txt").write_text("Backend role", encoding="utf-8")
+    manifest = _write_manifest(
+        tmp_path,
+        [
+            {"id": "a", "cv": "cvs/a.pdf", "job_file": "job.txt", "personas": ["Recruiter"]},
+            {"cv": "cvs/b.pdf", "job_url": "https://www.linkedin.com/jobs/view/1"},
+        ],
+    )
+
+    first, second = load_manifest(manifest, default_personas=["Matchmaker"])
+    assert (first.item_id, first.cv_path, first.job_description, first.personas) == (
+        "a",
+        tmp_path / "cvs/a.pdf",
+        "Backend role",
+        ["Recruiter"],
+    )
+    assert second.personas == ["Matchmaker"]
+    assert second.item_id == load_manifest(manifest, ["Matchmaker"])[1].item_id
+
+
+def test_load_manifest_reads_csv(tmp_path):
+    path = tmp_path / "manifest.csv"
+    path.write_text("id,cv,job_description,personas\nx,a.txt,Role,One; Two\n", encoding="utf-8")
+    (item,) = load_manifest(path)
+    assert item.personas == ["One", "Two"]
+
+
+def test_load_manifest_rejects_rows_without_job(tmp_path):
+    with pytest.raises(BatchManifestError, match="row 1"):
+        load_manifest(_write_manifest(tmp_path, [{"cv": "a.pdf"}]))
+
+
+def test_load_manifest_names_the_row_with_an_unreadable_job_file(tmp_path):
+    manifest = tmp_path / "batch.jsonl"
+    manifest.write_text('{"id": "acme", "cv": "cv.md", "job_file": "missing.txt"}\n', encoding="utf-8")
+    with pytest.raises(BatchManifestError, match=r"row 1 \('acme'\).*missing.txt"):
+        load_manifest(manifest)
+
+
+def test_run_skips_checkpointed_items_and_records_failures(tmp_path, monkeypatch):
+    manifest = _write_manifest(tmp_path, [{"id": name, "cv": "cv.txt", "job_description": "Role"} for name in "abc"])
+    items = load_manifest(manifest)
+    BatchCheckpoint(tmp_path / "out" / "checkpoint.jsonl").record("a", ITEM_COMPLETED)
+
+    processed = []
+
+    def process_item(self, item):
+        processed.append(item.item_id)
+        if item.item_id == "c":
+            raise RuntimeError("quota exceeded")
+
+    monkeypatch.setattr(BatchService, "process_item", process_item)
+    service = BatchService(AppConfig(), tmp_path / "out", concurrency=2)
+    summary = service.run(items)
+
+    assert sorted(processed) == ["b", "c"]
+    assert (summary.skipped, summary.completed, summary.failed) == (["a"], ["b"], {"c": "quota exceeded"})
+    assert service.checkpoint.completed_ids() == {"a", "b"}
@@ -0,0 +1,136 @@
+"""Tests for CV parsing and PDF generation."""
+
+import threading
+
+import pytest
+from fpdf import FPDF
+
+import services.cv_service as cv_service
+from exceptions import FileProcessingError
+from services.cv_service import CVService
+
+
+def _make_pdf(pages):
+    pdf = FPDF()
+    pdf.set_font("helvetica", size=12)
+    for text in pages:
+        pdf.add_page()
+        pdf.cell(0, 10, text)
+    return bytes(pdf.output())
+
+
+def test_parse_pdf_joins_pages_in_order():
+    content = CVService.parse_cv_file(_make_pdf(["First page", "Second page"]), "cv.pdf")
+    assert content.splitlines() == ["First page", "Second page"]
+
+
+def test_parse_pdf_in_worker_pool_matches_serial(monkeypatch):
+    pages = [f"Experience entry {i}" for i in range(6)]
+    monkeypatch.setattr(cv_service, "PDF_PARALLEL_MIN_PAGES", 2)
+    monkeypatch.setattr(cv_service, "PDF_WORKERS", 2)
+
+    content = CVService._extract_pdf_text(_make_pdf(pages))
+    assert content.splitlines() == pages
+
+
+def test_parse_is_memoized_by_content_hash(monkeypatch):
+    data = _make_pdf(["Memo page"])
+    CVService.parse_cv_file(data, "cv.pdf")
+
+    def fail(_):
+        raise AssertionError("should have been served from cache")
+
+    monkeypatch.setattr(CVService, "_extract_pdf_text", staticmethod(fail))
+    assert CVService.parse_cv_file(data, "renamed.PDF") == "Memo page"
+
+
+def test_parse_txt_and_rejects_unknown_formats():
+    assert CVService.parse_cv_file(b"  plain text cv \n", "cv.txt") == "plain text cv"
+    with pytest.raises(FileProcessingError):
+        CVService.parse_cv_file(b"data", "cv.docx")
+
+
+def test_page_over_time_budget_is_skipped(monkeypatch):
+    class SlowPage:
+        def extract_text(self):
+            while True:
+                pass
+
+    class FakeReader:
+        def __init__(self, path):
+            self.pages = [SlowPage()]
+
+    monkeypatch.setattr(cv_service, "PdfReader", FakeReader)
+    monkeypatch.setattr(cv_service, "_worker_reader", None)
+    assert cv_service._extract_page_text("slow.pdf", 0, 0.05) is None
+
+
+def test_serial_extraction_skips_page_over_time_budget(monkeypatch):
+    class Page:
+        def extract_text(self):
+            return "Kept page"
+
+    class SlowPage:
+        def extract_text(self):
+            while True:
+                pass
+
+    class FakeReader:
+        def __init__(self, stream):
+            self.pages = [Page(), SlowPage()]
+
+    monkeypatch.setattr(cv_service, "PdfReader", FakeReader)
+    monkeypatch.setattr(cv_service, "PDF_PAGE_TIMEOUT_SECONDS", 0.05)
+    assert CVService._extract_pdf_text(b"") == "Kept page"
+
+
+def test_short_pdf_off_the_main_thread_uses_the_pool(monkeypatch):
+    calls = []
+
+    def parallel(file_content, page_count):
+        calls.append(page_count)
+        return ["Pooled page"]
+
+    monkeypatch.setattr(CVService, "_extract_pages_parallel", staticmethod(parallel))
+    results = []
+    thread = threading.Thread(target=lambda: results.append(CVService._extract_pdf_text(_make_pdf(["Short"]))))
+    thread.start()
+    thread.join()
+    assert calls == [1] and results == ["Pooled page"]
+
+
+def test_get_pdf_renders_once_per_markdown(monkeypatch):
+    calls = []
+    original = CVService.generate_pdf
+
+    def counting(cv_markdown):
+        calls.append(cv_markdown)
+        return original(cv_markdown)
+
+    monkeypatch.setattr(CVService, "generate_pdf", staticmethod(counting))
+    markdown = "# Jane Doe\n## Experience\n- Shipped the cache"
+
+    prerendered = CVService.prerender_pdf(f"```markdown\n{markdown}\n```").result()
+    assert prerendered.startswith(b"%PDF")
+    assert CVService.get_pdf(markdown) is prerendered
+    assert len(calls) == 1
+
+
+def test_tokenize_markdown_groups_runs_of_same_style():
+    blocks = CVService._tokenize_markdown("# Jane\n\n\n- one\n* two\nBody a\nBody b\n### Role")
+    assert blocks == [
+        ("h1", ["JANE"]),
+        ("blank", ["", ""]),
+        ("bullet", ["- one", "- two"]),
+        ("body", ["Body a", "Body b"]),
+        ("h3", ["Role"]),
+    ]
+
+
+def test_tokenize_markdown_isolates_unbalanced_markers():
+    blocks = CVService._tokenize_markdown("- **bold\n- next\n- last")
+    assert blocks == [("bullet", ["- **bold"]), ("bullet", ["- next", "- last"])]
+
+
+def test_sanitize_text_replaces_typography_and_non_latin1():
+    assert CVService._sanitize_text_for_pdf("“Led” – teams… • 日") == '"Led" - teams... - ?'
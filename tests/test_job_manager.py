@@ -0,0 +1,65 @@
+"""Tests for the background analysis job manager."""
+
+import threading
+import time
+
+from services.job_manager import JOB_COMPLETED, JOB_FAILED, JobManager
+
+
+def _wait_finished(manager, job_id, timeout=2.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        job = manager.get(job_id)
+        if job.is_finished:
+            return job
+        time.sleep(0.01)
+    raise AssertionError("job did not finish in time")
+
+
+def test_submit_runs_work_in_background():
+    manager = JobManager(max_workers=1)
+    job_id = manager.submit("key", lambda job: "report")
+
+    job = _wait_finished(manager, job_id)
+    assert job.status == JOB_COMPLETED
+    assert job.result == "report"
+
+
+def test_same_key_attaches_to_in_flight_job():
+    manager = JobManager(max_workers=2)
+    release = threading.Event()
+    calls = []
+
+    def work(job):
+        calls.append(job.job_id)
+        release.wait(2)
+        return "done"
+
+    first = manager.submit("key", work)
+    second = manager.submit("key", work)
+    release.set()
+
+    assert first == second
+    _wait_finished(manager, first)
+    assert len(calls) == 1
+
+
+def test_failed_work_records_error():
+    manager = JobManager(max_workers=1)
+
+    def work(job):
+        raise RuntimeError("provider unavailable")
+
+    job = _wait_finished(manager, manager.submit("key", work))
+    assert job.status == JOB_FAILED
+    assert "provider unavailable" in job.error
+
+
+def test_finished_jobs_are_pruned_after_retention():
+    manager = JobManager(max_workers=1, retention_seconds=0)
+    old_id = manager.submit("old", lambda job: None)
+    _wait_finished(manager, old_id)
+    time.sleep(0.01)
+
+    manager.submit("new", lambda job: None)
+    assert manager.get(old_id) is None
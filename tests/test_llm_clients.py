@@ -0,0 +1,65 @@
+"""Tests for the shared provider client pool."""
+
+import os
+
+from crewai import LLM
+
+from models import AppConfig
+from services.analysis_service import AnalysisService
+from services.llm_clients import LLMClientPool
+
+
+def test_llms_with_the_same_key_share_one_client():
+    pool = LLMClientPool()
+    first = pool.attach(LLM(model="gpt-4o-mini", api_key="sk-one"))
+    second = pool.attach(LLM(model="gpt-4o", api_key="sk-one"))
+    other = pool.attach(LLM(model="gpt-4o-mini", api_key="sk-two"))
+
+    assert first._client is second._client
+    assert other._client is not first._client
+    assert other._client.api_key == "sk-two"
+    assert len(pool) == 2
+
+
+def test_pool_evicts_the_least_recently_used_client():
+    pool = LLMClientPool(max_clients=1)
+    pool.attach(LLM(model="gpt-4o-mini", api_key="sk-one"))
+    pool.attach(LLM(model="gpt-4o-mini", api_key="sk-two"))
+    assert len(pool) == 1
+
+
+def test_configured_llms_never_touch_the_environment(monkeypatch):
+    monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+    llm = AnalysisService.configure_llm(AppConfig(llm_provider="OpenAI", selected_model="gpt-4o-mini", api_key="sk-user"))
+
+    assert "OPENAI_API_KEY" not in os.environ
+    assert llm._client.api_key == "sk-user"
+
+
+def test_listing_models_leaves_the_global_sdk_config_alone(monkeypatch):
+    import google.generativeai.client as genai_client
+    from google.ai import generativelanguage as glm
+
+    from llm_utils import get_available_models
+
+    class FakeClient:
+        def __init__(self, client_options):
+            self.api_key = client_options["api_key"]
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc_info):
+            return False
+
+        def list_models(self):
+            return []
+
+    monkeypatch.delenv("GOOGLE_API_KEY", raising=False)
+    monkeypatch.setattr(glm, "ModelServiceClient", FakeClient)
+    before = genai_client._client_manager.client_config["client_options"].api_key
+
+    get_available_models("google-user", "Google")
+
+    assert genai_client._client_manager.client_config["client_options"].api_key == before
+    assert "GOOGLE_API_KEY" not in os.environ
@@ -0,0 +1,139 @@
+"""Tests for retries, hedging and circuit breaking around LLM calls."""
+
+import time
+
+import pytest
+from crewai import LLM
+
+from exceptions import CircuitOpenError, RateLimitExceededError
+from services.llm_resilience import CircuitBreaker, FailoverChain, ResiliencePolicy, is_retryable
+
+
+class ProviderError(Exception):
+    def __init__(self, message: str, status_code: int):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+def flaky(failures, result="ok"):
+    """Returns an operation that raises ``failures`` in order, then returns ``result``."""
+    calls = []
+
+    def operation():
+        calls.append(1)
+        if len(calls) <= len(failures):
+            raise failures[len(calls) - 1]
+        return result
+
+    return operation, calls
+
+
+def test_is_retryable_classifies_transient_errors():
+    assert is_retryable(ProviderError("quota", 429))
+    assert is_retryable(ProviderError("down", 503))
+    assert is_retryable(TimeoutError("read timed out"))
+    assert is_retryable(Exception("503 UNAVAILABLE: the model is overloaded"))
+    assert not is_retryable(ProviderError("bad key", 401))
+    assert not is_retryable(ValueError("context length exceeded"))
+    assert not is_retryable(RateLimitExceededError("session quota"))
+
+
+def test_call_retries_transient_errors_with_backoff():
+    delays = []
+    policy = ResiliencePolicy(max_attempts=3, base_delay=1, max_delay=10, sleep=delays.append)
+    admitted = []
+    operation, calls = flaky([ProviderError("busy", 503), ProviderError("busy", 429)])
+
+    assert policy.call("google/model", operation, admit=lambda: admitted.append(1)) == "ok"
+    assert len(calls) == 3
+    assert len(admitted) == 3
+    assert 0 <= delays[0] <= 1 and 0 <= delays[1] <= 2
+
+
+def test_call_does_not_retry_permanent_errors():
+    policy = ResiliencePolicy(max_attempts=3, sleep=lambda _: None)
+    operation, calls = flaky([ProviderError("bad request", 400)])
+
+    with pytest.raises(ProviderError):
+        policy.call("google/model", operation)
+    assert len(calls) == 1
+
+
+def test_circuit_opens_after_repeated_failures_and_probes_after_cooldown():
+    policy = ResiliencePolicy(max_attempts=2, failure_threshold=2, cooldown_seconds=0.05, sleep=lambda _: None)
+    operation, calls = flaky([ProviderError("down", 503)] * 2)
+
+    with pytest.raises(ProviderError):
+        policy.call("google/model", operation)
+    with pytest.raises(CircuitOpenError):
+        policy.call("google/model", operation)
+    assert len(calls) == 2
+    # Other models keep their own circuit
+    assert policy.call("openai/model", lambda: "ok") == "ok"
+
+    time.sleep(0.06)
+    assert policy.call("google/model", operation) == "ok"
+    assert policy.breaker("google/model").state == "closed"
+
+
+def test_half_open_circuit_lets_a_single_probe_through():
+    breaker = CircuitBreaker(failure_threshold=1, cooldown_seconds=0)
+    breaker.record_failure()
+    assert breaker.allow()
+    assert not breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == "open"
+
+
+def test_slow_call_is_hedged_and_first_response_wins():
+    policy = ResiliencePolicy(hedging=True)
+    for _ in range(10):
+        policy.latency("google/model").record(0.01)
+    calls = []
+
+    def operation():
+        calls.append(1)
+        if len(calls) == 1:
+            time.sleep(0.5)
+            return "slow"
+        return "fast"
+
+    started = time.monotonic()
+    assert policy.call("google/model", operation, hedge=True) == "fast"
+    assert time.monotonic() - started < 0.4
+
+
+def test_wrap_replaces_call_on_the_same_instance():
+    policy = ResiliencePolicy(max_attempts=2, sleep=lambda _: None)
+    llm = LLM(model="gpt-4o-mini", api_key="test-key")
+    failures = [ProviderError("busy", 503)]
+
+    def call(messages, **kwargs):
+        if failures:
+            raise failures.pop()
+        return f"answer to {messages}"
+
+    llm.call = call
+    assert policy.wrap(llm, "openai/gpt-4o-mini") is llm
+    assert llm.call("hi") == "answer to hi"
+
+
+class StubLLM:
+    stop_sequences = []
+
+    def __init__(self, error=None):
+        self.error = error
+
+    def call(self, *args, **kwargs):
+        if self.error:
+            raise self.error
+        return "answer"
+
+
+def test_failover_chain_only_moves_on_for_transient_errors():
+    chain = FailoverChain([("google/model", StubLLM(ProviderError("down", 503))), ("openai/model", StubLLM())])
+    assert chain.call("hi") == "answer"
+
+    chain = FailoverChain([("google/model", StubLLM(ProviderError("bad key", 401))), ("openai/model", StubLLM())])
+    with pytest.raises(ProviderError):
+        chain.call("hi")
@@ -0,0 +1,109 @@
+"""Tests for the shared model list cache."""
+
+import threading
+import time
+
+from services.model_catalog import ModelCatalog
+
+
+def test_lists_are_cached_by_key_fingerprint():
+    calls = []
+
+    def fetch(api_key, provider):
+        calls.append((api_key, provider))
+        return [f"{provider}-model"]
+
+    catalog = ModelCatalog(fetch=fetch)
+    assert catalog.get("OpenAI", "sk-secret") == ["OpenAI-model"]
+    assert catalog.get("OpenAI", "sk-secret") == ["OpenAI-model"]
+    assert catalog.get("OpenAI", "sk-other") == ["OpenAI-model"]
+
+    assert len(calls) == 2
+    assert all("sk-secret" not in str(key) for key in catalog._entries)
+
+
+def test_empty_lists_expire_after_the_negative_ttl():
+    results = [[], ["gpt-4o"]]
+    catalog = ModelCatalog(fetch=lambda api_key, provider: results.pop(0), negative_ttl_seconds=0.05)
+
+    assert catalog.get("OpenAI", "sk-new") == []
+    assert catalog.get("OpenAI", "sk-new") == []
+    time.sleep(0.06)
+    assert catalog.get("OpenAI", "sk-new") == ["gpt-4o"]
+
+
+def test_slow_listing_times_out_and_fills_the_cache_later():
+    release = threading.Event()
+
+    def fetch(api_key, provider):
+        release.wait(1)
+        return ["gemini-2.0-flash"]
+
+    catalog = ModelCatalog(fetch=fetch, timeout_seconds=0.05)
+    assert catalog.get("Google", "key") is None
+    release.set()
+    assert catalog.get("Google", "key", timeout=1) == ["gemini-2.0-flash"]
+
+
+def test_prefetch_lists_providers_concurrently():
+    started = threading.Barrier(2, timeout=1)
+
+    def fetch(api_key, provider):
+        # Both fetches must be running at once to pass the barrier
+        started.wait()
+        return [provider]
+
+    catalog = ModelCatalog(fetch=fetch)
+    futures = [catalog.prefetch("Google", "g-key"), catalog.prefetch("OpenAI", "o-key")]
+    assert [future.result(timeout=2) for future in futures] == [["Google"], ["OpenAI"]]
+    assert catalog.prefetch("Google", "g-key") is None
+
+
+def test_config_service_reports_unvalidated_defaults_until_the_key_is_listed(monkeypatch):
+    import services.config_service as config_service
+
+    release = threading.Event()
+
+    def fetch(api_key, provider):
+        release.wait(1)
+        return ["gpt-4o"]
+
+    monkeypatch.setattr(config_service, "model_catalog", ModelCatalog(fetch=fetch, timeout_seconds=0.05))
+    models, validated = config_service.ConfigService.fetch_models("OpenAI", "sk-custom")
+    assert models and not validated
+
+    release.set()
+    assert config_service.ConfigService.fetch_models("OpenAI", "sk-custom", timeout=1) == (["gpt-4o"], True)
+
+
+def test_concurrent_google_listings_use_their_own_keys(monkeypatch):
+    from google.ai import generativelanguage as glm
+
+    started = threading.Barrier(2, timeout=1)
+
+    class FakeModel:
+        def __init__(self, name):
+            self.name = f"models/{name}"
+            self.supported_generation_methods = ["generateContent"]
+
+    class FakeClient:
+        def __init__(self, client_options):
+            self.api_key = client_options["api_key"]
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc_info):
+            return False
+
+        def list_models(self):
+            # Both listings must be in flight at once to pass the barrier
+            started.wait()
+            return [FakeModel(f"model-for-{self.api_key}")]
+
+    monkeypatch.setattr(glm, "ModelServiceClient", FakeClient)
+    catalog = ModelCatalog()
+    futures = [catalog.prefetch("Google", "key-a"), catalog.prefetch("Google", "key-b")]
+    assert [future.result(timeout=2) for future in futures] == [["model-for-key-a"], ["model-for-key-b"]]
+    assert catalog.get("Google", "key-a") == ["model-for-key-a"]
+    assert catalog.get("Google", "key-b") == ["model-for-key-b"]
@@ -0,0 +1,50 @@
+"""Tests for the persona search index."""
+
+from models import Persona
+from services.persona_index import PersonaIndex
+
+
+def _persona(name, backstory="", source="general"):
+    return Persona(name=name, role=name, goal=f"Analyze CV as a {name}", backstory=backstory, source=source)
+
+
+def _index():
+    return PersonaIndex(
+        {
+            "Technical Recruiter (general)": _persona("Technical Recruiter", "Hires engineers at tech companies."),
+            "Startup Founder (startup)": _persona("Startup Founder", "Recruits generalists for early teams.", "startup"),
+            "UX Designer (design)": _persona("UX Designer", "Reviews portfolios and design systems.", "design"),
+        }
+    )
+
+
+def test_prefix_search_matches_partial_words():
+    assert _index().search("recr").names == ["Technical Recruiter (general)", "Startup Founder (startup)"]
+
+
+def test_name_matches_rank_above_backstory_matches():
+    # "Recruiter" is in the first persona's name but only in the second persona's backstory
+    results = _index().search("recruit")
+    assert results.names[0] == "Technical Recruiter (general)"
+
+
+def test_all_terms_must_match():
+    assert _index().search("design portfolio").names == ["UX Designer (design)"]
+    assert _index().search("design recruiter").names == []
+
+
+def test_source_filter_and_empty_query():
+    index = _index()
+    assert index.available_sources == ["design", "general", "startup"]
+    assert index.search("", sources=["startup"]).names == ["Startup Founder (startup)"]
+    assert index.search("").total == 3
+
+
+def test_pagination_clamps_to_last_page():
+    personas = {f"Persona {i} (bulk)": _persona(f"Persona {i}", source="bulk") for i in range(25)}
+    index = PersonaIndex(personas)
+
+    page = index.search("persona", page=10, page_size=10)
+    assert page.page == 2
+    assert page.page_count == 3
+    assert len(page.names) == 5
@@ -0,0 +1,41 @@
+"""Tests for the job-aware persona recommender."""
+
+import numpy as np
+
+from models import Persona
+from services.persona_recommender import PersonaRecommender
+
+
+def _recommender():
+    def persona(name, backstory):
+        return Persona(name=name, role=name, goal=f"Analyze CV as a {name}", backstory=backstory)
+
+    return PersonaRecommender(
+        {
+            "SRE (it)": persona("SRE", "Reliability, Kubernetes clusters, on-call and infrastructure automation."),
+            "UX Critic (design)": persona("UX Critic", "Portfolios, Figma prototypes and user research."),
+            "CFO (executive)": persona("CFO", "Budgets, ROI and cost savings at the {job_description} level."),
+        }
+    )
+
+
+def test_recommend_ranks_best_match_first():
+    results = _recommender().recommend("Platform engineer to run our Kubernetes infrastructure", top_k=2)
+    assert results[0][0] == "SRE (it)"
+    assert all(score > 0 for _, score in results)
+
+
+def test_recommend_omits_unrelated_personas():
+    names = [name for name, _ in _recommender().recommend("Figma user research lead", top_k=3)]
+    assert names == ["UX Critic (design)"]
+
+
+def test_scores_are_cosine_similarities():
+    scores = _recommender().score("Kubernetes reliability infrastructure budgets")
+    assert scores.shape == (3,)
+    assert np.all((scores >= 0) & (scores <= 1.0001))
+
+
+def test_empty_description_recommends_nothing():
+    assert _recommender().recommend("") == []
+    assert _recommender().recommend("the and of") == []
@@ -0,0 +1,72 @@
+"""Tests for the cached persona catalog."""
+
+import os
+
+import yaml
+
+import services.persona_service as persona_service
+from services.persona_service import PersonaCatalog
+
+
+def _write_personas(path, names):
+    with open(path, "w", encoding="utf-8") as f:
+        yaml.dump([{"name": name, "prompt": f"{name} prompt"} for name in names], f)
+
+
+def _count_parses(monkeypatch):
+    calls = []
+    original = persona_service.PersonaService._parse_persona_file
+
+    def counting(file_path):
+        calls.append(file_path.name)
+        return original(file_path)
+
+    monkeypatch.setattr(persona_service.PersonaService, "_parse_persona_file", staticmethod(counting))
+    return calls
+
+
+def test_catalog_parses_each_file_once(tmp_path, monkeypatch):
+    _write_personas(tmp_path / "tech.yaml", ["Recruiter"])
+    _write_personas(tmp_path / "design.yaml", ["Designer"])
+    calls = _count_parses(monkeypatch)
+    catalog = PersonaCatalog()
+
+    first = catalog.get(tmp_path)
+    second = catalog.get(tmp_path)
+
+    assert set(first) == {"Recruiter (tech)", "Designer (design)"}
+    assert first["Recruiter (tech)"].backstory == "Recruiter prompt"
+    assert second is first
+    assert sorted(calls) == ["design.yaml", "tech.yaml"]
+
+
+def test_catalog_reparses_only_changed_files(tmp_path, monkeypatch):
+    _write_personas(tmp_path / "tech.yaml", ["Recruiter"])
+    _write_personas(tmp_path / "design.yaml", ["Designer"])
+    calls = _count_parses(monkeypatch)
+    catalog = PersonaCatalog()
+    catalog.get(tmp_path)
+
+    _write_personas(tmp_path / "tech.yaml", ["Recruiter", "Staff Engineer"])
+    stat = os.stat(tmp_path / "tech.yaml")
+    os.utime(tmp_path / "tech.yaml", ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    (tmp_path / "design.yaml").unlink()
+
+    personas = catalog.get(tmp_path)
+    assert set(personas) == {"Recruiter (tech)", "Staff Engineer (tech)"}
+    assert calls.count("tech.yaml") == 2
+    assert calls.count("design.yaml") == 1
+
+
+def test_snapshot_lets_a_new_catalog_skip_parsing(tmp_path, monkeypatch):
+    persona_dir = tmp_path / "personas"
+    persona_dir.mkdir()
+    _write_personas(persona_dir / "tech.yaml", ["Recruiter"])
+    snapshot = tmp_path / "snapshot.pickle"
+    PersonaCatalog(str(snapshot)).get(persona_dir)
+
+    calls = _count_parses(monkeypatch)
+    personas = PersonaCatalog(str(snapshot)).get(persona_dir)
+
+    assert set(personas) == {"Recruiter (tech)"}
+    assert calls == []
@@ -0,0 +1,85 @@
+"""Tests for the shared LLM rate limiter."""
+
+import time
+
+import pytest
+from crewai.hooks import HookAborted
+
+from exceptions import RateLimitExceededError
+from services.rate_limiter import FairQueue, RateLimiter, TokenBucket
+
+
+def test_fair_queue_takes_turns_between_sessions():
+    queue = FairQueue(TokenBucket(rate=1, capacity=1))
+    for ticket in ("a1", "a2", "a3"):
+        queue.push("a", ticket)
+    queue.push("b", "b1")
+
+    served = []
+    while queue.head() is not None:
+        ticket = queue.head()
+        served.append(ticket)
+        queue.remove(ticket[0], ticket)
+    assert served == ["a1", "b1", "a2", "a3"]
+
+
+def test_acquire_waits_for_the_bucket_to_refill():
+    limiter = RateLimiter(requests_per_minute=600, burst=2, session_quota=0)
+    assert limiter.acquire("google/model") == pytest.approx(0, abs=0.01)
+    assert limiter.acquire("google/model") == pytest.approx(0, abs=0.01)
+
+    started = time.monotonic()
+    limiter.acquire("google/model")
+    assert time.monotonic() - started >= 0.08
+    # Other models have their own bucket
+    assert limiter.acquire("openai/model") == pytest.approx(0, abs=0.01)
+
+
+def test_estimate_wait_counts_requested_calls():
+    limiter = RateLimiter(requests_per_minute=60, burst=2, session_quota=0)
+    assert limiter.estimate_wait("key", 2) == pytest.approx(0, abs=0.01)
+    assert limiter.estimate_wait("key", 5) == pytest.approx(3, abs=0.05)
+
+
+def test_session_quota_is_enforced_per_session():
+    limiter = RateLimiter(requests_per_minute=6000, burst=10, session_quota=2)
+    limiter.acquire("key", "a")
+    limiter.acquire("key", "a")
+
+    with pytest.raises(RateLimitExceededError):
+        limiter.acquire("key", "a")
+    assert limiter.remaining_quota("a") == 0
+    assert limiter.remaining_quota("b") == 2
+
+
+def test_quota_frees_up_and_forgets_sessions_once_outside_the_window():
+    now = [10_000.0]
+    limiter = RateLimiter(requests_per_minute=6000, burst=10, session_quota=2, clock=lambda: now[0])
+    limiter.acquire("key", "active")
+    limiter.acquire("key", "gone")
+    now[0] += 3000
+    limiter.acquire("key", "active")
+    assert limiter.remaining_quota("active") == 0
+
+    now[0] += 700
+    assert limiter.remaining_quota("never-called") == 2
+    assert limiter.remaining_quota("active") == 1
+    assert limiter.tracked_sessions() == 1
+
+
+def test_a_used_up_quota_stops_the_agent_instead_of_failing_over(monkeypatch):
+    from services.llm_resilience import FailoverChain
+
+    limiter = RateLimiter(requests_per_minute=6000, burst=10, session_quota=1)
+    limiter.acquire("openai/model", "session")
+
+    class StubLLM:
+        stop_sequences = []
+
+        def call(self, *args, **kwargs):
+            limiter.acquire("openai/model", "session")
+            return "answer"
+
+    chain = FailoverChain([("openai/model", StubLLM()), ("openai/other", StubLLM())])
+    with pytest.raises(HookAborted):
+        chain.call("hi")
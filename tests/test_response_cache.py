@@ -0,0 +1,35 @@
+"""Tests for the persistent LLM response cache."""
+
+import time
+
+from services.response_cache import ResponseCache
+
+
+def test_get_returns_stored_value_and_counts(tmp_path):
+    cache = ResponseCache(path=str(tmp_path / "cache.sqlite"))
+    assert cache.get("missing") is None
+
+    cache.set("key", {"raw": "answer"})
+    assert cache.get("key") == {"raw": "answer"}
+
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["entries"]) == (1, 1, 1)
+
+
+def test_expired_entries_are_ignored(tmp_path):
+    cache = ResponseCache(path=str(tmp_path / "cache.sqlite"), max_age_seconds=0.05)
+    cache.set("key", {"raw": "answer"})
+    time.sleep(0.1)
+    assert cache.get("key") is None
+
+
+def test_size_eviction_drops_least_recently_used(tmp_path):
+    cache = ResponseCache(path=str(tmp_path / "cache.sqlite"), max_bytes=150)
+    cache.set("old", {"raw": "a" * 50})
+    cache.set("recent", {"raw": "b" * 50})
+    cache.get("old")
+    cache.set("new", {"raw": "c" * 50})
+
+    assert cache.get("recent") is None
+    assert cache.get("old") is not None
+    assert cache.get("new") is not None
@@ -0,0 +1,65 @@
+"""Tests for the persistent analysis result store."""
+
+import time
+
+from models import AnalysisResult, Persona, TaskResult
+from services.result_store import ResultStore
+
+
+def _result(final_cv: str = "# CV") -> AnalysisResult:
+    tasks = [
+        TaskResult(role=role, description=f"task {role}", raw=raw, seconds=1.5)
+        for role, raw in [("Board Head", "report"), ("Optimizer", "changes"), ("Reformatter", final_cv)]
+    ]
+    return AnalysisResult(board_report="report", minimal_changes="changes", final_cv=final_cv, tasks=tasks)
+
+
+def _store(tmp_path, **kwargs) -> ResultStore:
+    return ResultStore(path=str(tmp_path / "results.sqlite"), blob_dir=str(tmp_path / "blobs"), **kwargs)
+
+
+def test_key_ignores_persona_order_but_not_answers():
+    first = Persona(name="A", role="A", goal="a", backstory="a")
+    second = Persona(name="B", role="B", goal="b", backstory="b")
+
+    key = ResultStore.make_key("cv", "job", [first, second], "Google", "gemini")
+    assert key == ResultStore.make_key("cv", "job", [second, first], "Google", "gemini")
+    assert key != ResultStore.make_key("cv", "job", [first, second], "Google", "gemini", user_answers="Q: A:")
+    assert key != ResultStore.make_key("cv", "job", [first], "Google", "gemini")
+
+
+def test_stored_result_is_found_by_key_and_result_id(tmp_path):
+    store = _store(tmp_path)
+    assert store.get_by_key("key") is None
+
+    result_id = store.put("key", _result(), {"Reformatter": "Google/gemini"})
+    by_key = store.get_by_key("key")
+    by_id = store.get(result_id)
+
+    assert by_key.result_id == by_id.result_id == result_id
+    assert by_id.result == _result()
+    assert by_id.served_models == {"Reformatter": "Google/gemini"}
+    assert store.get("unknown") is None
+
+
+def test_replacing_a_key_removes_the_old_blob(tmp_path):
+    store = _store(tmp_path)
+    old_id = store.put("key", _result("old"))
+    new_id = store.put("key", _result("new"))
+
+    assert store.get(old_id) is None
+    assert store.get_by_key("key").result.final_cv == "new"
+    assert [path.stem for path in (tmp_path / "blobs").iterdir()] == [new_id]
+
+
+def test_eviction_by_age_and_size(tmp_path):
+    store = _store(tmp_path, max_age_seconds=0.05)
+    result_id = store.put("key", _result())
+    time.sleep(0.1)
+    assert store.get(result_id) is None
+
+    store = _store(tmp_path, max_bytes=1)
+    store.put("old", _result())
+    store.put("new", _result())
+    assert store.get_by_key("old") is None
+    assert store.stats()["entries"] <= 1
@@ -0,0 +1,111 @@
+"""Tests for the LinkedIn scraper and its HTTP cache."""
+
+from pathlib import Path
+
+import pytest
+import requests
+
+import scraper
+from exceptions import JobScrapingError
+from services.http_cache import HttpCache, canonicalize_url
+
+CORPUS_DIR = Path(__file__).parent / "fixtures" / "job_pages"
+PAGE = '<html><body><div class="description__text"><p>Build things</p></div></body></html>'
+
+
+class FakeResponse:
+    def __init__(self, status_code=200, text="", headers=None):
+        self.status_code = status_code
+        self.text = text
+        self.headers = headers or {}
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.exceptions.HTTPError(f"{self.status_code} error")
+
+
+class FakeSession:
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.requests = []
+
+    def get(self, url, headers=None, timeout=None):
+        self.requests.append((url, headers or {}))
+        response = self.responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    cache = HttpCache(path=str(tmp_path / "http.sqlite"))
+    monkeypatch.setattr(scraper, "http_cache", cache)
+    monkeypatch.setattr(scraper, "HTTP_CACHE_ENABLED", True)
+    return cache
+
+
+def _use_session(monkeypatch, session):
+    monkeypatch.setattr(scraper, "get_session", lambda: session)
+    return session
+
+
+def test_canonicalize_url_collapses_linkedin_variants():
+    expected = "https://www.linkedin.com/jobs/view/4012345678"
+    assert canonicalize_url("https://WWW.linkedin.com/jobs/view/senior-engineer-at-acme-4012345678/?trk=abc") == expected
+    assert canonicalize_url("https://www.linkedin.com/jobs/search/?currentJobId=4012345678&keywords=x") == expected
+    assert canonicalize_url("HTTPS://Example.com/a/?b=2&utm_source=x&a=1#frag") == "https://example.com/a?a=1&b=2"
+
+
+def test_fresh_page_is_served_from_cache(cache, monkeypatch):
+    session = _use_session(monkeypatch, FakeSession(FakeResponse(text=PAGE)))
+
+    assert scraper.scrape_linkedin_job("https://www.linkedin.com/jobs/view/1/?trk=a") == "Build things"
+    assert scraper.scrape_linkedin_job("https://www.linkedin.com/jobs/view/1") == "Build things"
+    assert len(session.requests) == 1
+
+
+def test_stale_page_is_revalidated_with_validators(cache, monkeypatch):
+    cache.ttl_seconds = 0
+    session = _use_session(
+        monkeypatch, FakeSession(FakeResponse(text=PAGE, headers={"ETag": '"v1"'}), FakeResponse(status_code=304))
+    )
+
+    scraper.fetch_page("https://www.linkedin.com/jobs/view/1")
+    assert scraper.fetch_page("https://www.linkedin.com/jobs/view/1") == PAGE
+    assert session.requests[1][1] == {"If-None-Match": '"v1"'}
+
+
+def test_failures_are_raised_and_negatively_cached(cache, monkeypatch):
+    session = _use_session(monkeypatch, FakeSession(FakeResponse(status_code=503)))
+
+    for _ in range(2):
+        with pytest.raises(JobScrapingError, match="503"):
+            scraper.scrape_linkedin_job("https://www.linkedin.com/jobs/view/2")
+    assert len(session.requests) == 1
+
+
+def test_missing_description_raises(cache, monkeypatch):
+    _use_session(monkeypatch, FakeSession(FakeResponse(text="<html><body>Sign in</body></html>")))
+    with pytest.raises(JobScrapingError, match="paste it manually"):
+        scraper.scrape_linkedin_job("https://www.linkedin.com/jobs/view/3")
+
+
+@pytest.mark.parametrize("html_path", sorted(CORPUS_DIR.glob("*.html")), ids=lambda path: path.stem)
+def test_extraction_matches_saved_corpus(html_path):
+    expected_path = html_path.with_suffix(".txt")
+    expected = expected_path.read_text(encoding="utf-8").strip() if expected_path.exists() else None
+    assert scraper.extract_job_description(html_path.read_text(encoding="utf-8")) == expected
+
+
+def test_json_ld_job_posting_is_preferred_over_markup():
+    page = (
+        '<script type="application/ld+json">{"@type": "JobPosting", "description": "&lt;p&gt;From data&lt;/p&gt;"}</script>'
+        '<div class="description__text">From markup</div>'
+    )
+    assert scraper.extract_job_description(page) == "From data"
+
+
+def test_sliced_element_includes_nested_tags_of_the_same_name():
+    page = '<div class="job-view-main-content"><div>Inner</div><p>Tail</p></div><div>Outside</div>'
+    assert scraper.extract_job_description(page) == "Inner\nTail"
@@ -0,0 +1,125 @@
+"""Tests for per-session memory accounting and idle session spilling."""
+
+from services.session_memory import SessionMemory, SpilledValue
+
+KEYS = ["step", "cv_content", "config"]
+
+
+class State(dict):
+    """Session state stand-in; plain dicts cannot be weakly referenced."""
+
+
+def _memory(tmp_path, **kwargs) -> SessionMemory:
+    return SessionMemory(spill_dir=str(tmp_path), idle_seconds=60, evict_seconds=600, spill_min_bytes=1024, **kwargs)
+
+
+def test_touch_measures_keys_and_reports_largest_sessions_first(tmp_path):
+    memory = _memory(tmp_path)
+    small, large = State(step=1, cv_content="cv"), State(step=1, cv_content="x" * 10_000)
+
+    memory.touch("small", small, KEYS, now=0)
+    footprint = memory.touch("large", large, KEYS, now=0)
+
+    assert set(footprint.sizes) == {"step", "cv_content"}
+    assert footprint.sizes["cv_content"] > 10_000
+    assert [footprint.session_id for footprint in memory.report()] == ["large", "small"]
+
+
+def test_idle_sessions_spill_large_values_and_restore_them_on_return(tmp_path):
+    memory = _memory(tmp_path)
+    idle = State(step=1, cv_content="x" * 10_000, config="api key")
+    memory.touch("idle", idle, KEYS, spillable=["cv_content", "step"], now=0)
+
+    memory.sweep(now=120)
+    assert isinstance(idle["cv_content"], SpilledValue)
+    assert idle["step"] == 1 and idle["config"] == "api key"
+    assert memory.report()[0].spilled_bytes > 10_000
+
+    memory.touch("idle", idle, KEYS, spillable=["cv_content"], now=130)
+    assert idle["cv_content"] == "x" * 10_000
+    assert not any(tmp_path.iterdir())
+
+
+def test_sessions_are_evicted_after_the_ttl_or_once_discarded(tmp_path):
+    memory = _memory(tmp_path)
+    abandoned = State(step=3, cv_content="x" * 10_000, widget="kept")
+    memory.touch("abandoned", abandoned, KEYS, spillable=["cv_content"], now=0)
+    memory.touch("closed", State(step=1), KEYS, now=0)
+
+    memory.sweep(now=700)
+
+    assert abandoned == {"widget": "kept"}
+    assert len(memory) == 0
+
+
+def test_busy_and_polling_sessions_are_not_spilled(tmp_path):
+    memory = _memory(tmp_path)
+    busy, polling = State(cv_content="x" * 10_000), State(cv_content="y" * 10_000)
+    memory.touch("busy", busy, KEYS, spillable=["cv_content"], now=0)
+    memory.touch("polling", polling, KEYS, spillable=["cv_content"], now=0)
+
+    memory.keep_alive("polling", now=100)
+    with memory.busy("busy"):
+        memory.sweep(now=120)
+
+    assert busy["cv_content"] == "x" * 10_000
+    assert polling["cv_content"] == "y" * 10_000
+
+
+def test_sweeps_write_through_the_running_view_and_clean_overwritten_spills(tmp_path):
+    memory = _memory(tmp_path)
+    state = State(cv_content="x" * 10_000)
+    writes = []
+
+    class View(State):
+        def __setitem__(self, key, value):
+            writes.append(key)
+            state[key] = value
+
+    view = View(state)
+    memory.touch("session", state, KEYS, spillable=["cv_content"], guard=view, now=0)
+    memory.sweep(now=120)
+    assert writes == ["cv_content"] and isinstance(state["cv_content"], SpilledValue)
+
+    # The session replaced the placeholder itself before its next full run
+    state["cv_content"] = "new cv"
+    memory.touch("session", state, KEYS, spillable=["cv_content"], now=130)
+    assert state["cv_content"] == "new cv"
+    assert not any(tmp_path.iterdir())
+
+
+def test_only_replaced_values_are_measured_again(tmp_path, monkeypatch):
+    import services.session_memory as session_memory
+
+    measured = []
+
+    def measure(value):
+        measured.append(value)
+        return len(str(value))
+
+    monkeypatch.setattr(session_memory, "measure", measure)
+    memory = _memory(tmp_path)
+    state = State(step=1, cv_content="x" * 10_000)
+    memory.touch("session", state, KEYS, now=0)
+    assert len(measured) == 2
+
+    memory.touch("session", state, KEYS, now=1)
+    assert len(measured) == 2
+
+    state["cv_content"] = "y" * 20_000
+    footprint = memory.touch("session", state, KEYS, now=2)
+    assert measured[2:] == ["y" * 20_000]
+    assert footprint.sizes == {"step": 1, "cv_content": 20_000}
+
+
+def test_spilling_can_be_turned_off(tmp_path):
+    memory = _memory(tmp_path, spill_enabled=False)
+    idle = State(step=1, cv_content="x" * 10_000)
+    memory.touch("idle", idle, KEYS, spillable=["cv_content"], now=0)
+
+    memory.sweep(now=120)
+    assert idle["cv_content"] == "x" * 10_000
+    assert not any(tmp_path.iterdir())
+
+    memory.sweep(now=700)
+    assert idle == {}
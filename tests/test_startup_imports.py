@@ -0,0 +1,20 @@
+"""Guards the app's cold start against eager imports of heavy dependencies."""
+
+import subprocess
+import sys
+from pathlib import Path
+
+SRC_DIR = Path(__file__).resolve().parent.parent / "src"
+
+STARTUP_MODULES = ["services.warmup", "state_manager", "ui_components", "steps.welcome", "steps.config"]
+HEAVY_MODULES = ["crewai", "fpdf", "pypdf", "bs4", "yaml", "numpy", "google.generativeai", "openai"]
+
+
+def test_welcome_and_config_steps_do_not_import_heavy_dependencies():
+    code = (
+        "import importlib, sys\n"
+        f"for name in {STARTUP_MODULES!r}: importlib.import_module(name)\n"
+        f"print(','.join(name for name in {HEAVY_MODULES!r} if name in sys.modules))\n"
+    )
+    completed = subprocess.run([sys.executable, "-c", code], cwd=SRC_DIR, capture_output=True, text=True, check=True)
+    assert completed.stdout.strip() == ""
@@ -0,0 +1,45 @@
+"""Tests for routing streamed LLM tokens to per-run callbacks."""
+
+from types import SimpleNamespace
+
+from services.job_manager import AnalysisJob
+from services.stream_router import StreamRouter
+
+
+def test_chunks_reach_only_the_subscribed_run():
+    router = StreamRouter()
+    board_head = SimpleNamespace(id="agent-1")
+    other_run = SimpleNamespace(id="agent-2")
+    received, other = [], []
+
+    with router.subscribe([board_head], lambda role, chunk, call_id: received.append((role, chunk))):
+        with router.subscribe([other_run], lambda role, chunk, call_id: other.append(chunk)):
+            router.dispatch("agent-1", "Board Head", "Hello")
+            router.dispatch("agent-1", "Board Head", " world")
+
+    assert received == [("Board Head", "Hello"), ("Board Head", " world")]
+    assert other == []
+
+
+def test_unsubscribed_agents_are_ignored():
+    router = StreamRouter()
+    received = []
+    with router.subscribe([SimpleNamespace(id="agent-1")], lambda role, chunk, call_id: received.append(chunk)):
+        pass
+
+    router.dispatch("agent-1", "Board Head", "late token")
+    assert received == []
+
+
+def test_a_new_llm_call_replaces_the_partial_answer_of_the_previous_one():
+    router = StreamRouter()
+    job = AnalysisJob(job_id="job", key="key")
+
+    with router.subscribe([SimpleNamespace(id="agent-1")], job.record_stream_chunk):
+        router.dispatch("agent-1", "Board Head", "Abandoned ", "call-1")
+        router.dispatch("agent-1", "Board Head", "partial", "call-1")
+        # A retry or failover streams its answer from the start under a new call id
+        router.dispatch("agent-1", "Board Head", "Final ", "call-2")
+        router.dispatch("agent-1", "Board Head", "answer", "call-2")
+
+    assert job.streamed_text("Board Head") == "Final answer"
@@ -0,0 +1,210 @@
+"""Tests for the dependency-aware crew task scheduler."""
+
+import threading
+import time
+
+import pytest
+from crewai.tasks.task_output import TaskOutput
+from crewai.types.usage_metrics import UsageMetrics
+from crewai.utilities.constants import NOT_SPECIFIED
+
+from services.response_cache import ResponseCache
+from services.task_scheduler import TaskScheduler
+
+
+class FakeAgent:
+    def __init__(self, role):
+        self.role = role
+        self.tools = []
+
+
+class FakeTask:
+    def __init__(self, role, delay=0.0, context=NOT_SPECIFIED, async_execution=False):
+        self.agent = FakeAgent(role)
+        self.description = f"{role} task"
+        self.expected_output = f"{role} report"
+        self.context = context
+        self.async_execution = async_execution
+        self.callback = None
+        self.delay = delay
+        self.received_context = None
+        self.thread = None
+        self.calls = 0
+
+    def execute_sync(self, agent=None, context=None, tools=None):
+        self.calls += 1
+        self.received_context = context
+        self.thread = threading.current_thread().name
+        time.sleep(self.delay)
+        return TaskOutput(description=self.description, raw=f"{self.agent.role} output", agent=self.agent.role)
+
+
+class FakeCrew:
+    def __init__(self, tasks):
+        self.tasks = tasks
+
+    def calculate_usage_metrics(self):
+        return UsageMetrics()
+
+
+def _fingerprints(tasks):
+    return [TaskScheduler.fingerprint(task) for task in tasks]
+
+
+def _analysis_like_tasks(delay=0.0):
+    specialist_a = FakeTask("Specialist A", delay, async_execution=True)
+    specialist_b = FakeTask("Specialist B", delay, async_execution=True)
+    board_head = FakeTask("Board Head", delay, context=[specialist_a, specialist_b])
+    optimizer = FakeTask("Optimizer", delay)
+    reformatter = FakeTask("Reformatter", delay, context=[optimizer])
+    return [specialist_a, specialist_b, board_head, optimizer, reformatter]
+
+
+def test_build_dependencies_uses_explicit_context_only():
+    tasks = _analysis_like_tasks()
+    assert TaskScheduler.build_dependencies(tasks) == [[], [], [0, 1], [], [3]]
+
+
+def test_build_dependencies_mirrors_sequential_process_when_implicit():
+    tasks = _analysis_like_tasks()
+    assert TaskScheduler.build_dependencies(tasks, implicit_context=True) == [[], [], [0, 1], [0, 1, 2], [3]]
+
+
+def test_build_dependencies_rejects_foreign_context():
+    orphan = FakeTask("Orphan")
+    with pytest.raises(ValueError):
+        TaskScheduler.build_dependencies([FakeTask("Consumer", context=[orphan])])
+
+
+def test_critical_path_follows_longest_chain():
+    dependencies = [[], [], [0, 1], [], [3]]
+    seconds, path = TaskScheduler.critical_path(dependencies, [1.0, 3.0, 2.0, 1.0, 1.0])
+    assert seconds == pytest.approx(5.0)
+    assert path == [1, 2]
+
+
+def test_run_preserves_task_order_and_passes_context():
+    tasks = _analysis_like_tasks()
+    result, report = TaskScheduler(max_workers=3).run(FakeCrew(tasks))
+
+    assert [t.raw for t in result.tasks_output] == [f"{t.agent.role} output" for t in tasks]
+    assert result.raw == "Reformatter output"
+    assert "Optimizer output" in tasks[4].received_context
+    assert "Specialist A output" in tasks[2].received_context
+    assert tasks[3].received_context == ""
+    assert len(report.task_durations) == len(tasks)
+
+
+def test_run_overlaps_independent_branches():
+    tasks = _analysis_like_tasks(delay=0.1)
+    _, report = TaskScheduler(max_workers=4).run(FakeCrew(tasks))
+
+    # Two levels deep, so well under the five-task sequential time
+    assert report.wall_clock_seconds < report.sequential_seconds * 0.7
+    assert report.critical_path_seconds == pytest.approx(0.2, abs=0.08)
+
+
+def test_run_invokes_thread_initializer():
+    calls = []
+    TaskScheduler(max_workers=2, thread_initializer=lambda: calls.append(1)).run(FakeCrew(_analysis_like_tasks()))
+    assert calls
+
+
+def test_run_serves_repeated_tasks_from_cache(tmp_path):
+    cache = ResponseCache(path=str(tmp_path / "cache.sqlite"))
+    first_run = _analysis_like_tasks()
+    TaskScheduler(cache=cache, cache_scope="Google/gemini").run(FakeCrew(first_run))
+
+    second_run = _analysis_like_tasks()
+    callback_outputs = []
+    second_run[2].callback = callback_outputs.append
+    result, _ = TaskScheduler(cache=cache, cache_scope="Google/gemini").run(FakeCrew(second_run))
+
+    assert all(task.calls == 0 for task in second_run)
+    assert result.raw == "Reformatter output"
+    assert callback_outputs[0].raw == "Board Head output"
+    assert cache.stats()["hits"] == len(second_run)
+
+
+def test_cache_scope_separates_models(tmp_path):
+    cache = ResponseCache(path=str(tmp_path / "cache.sqlite"))
+    TaskScheduler(cache=cache, cache_scope="Google/gemini").run(FakeCrew(_analysis_like_tasks()))
+
+    other_model = _analysis_like_tasks()
+    TaskScheduler(cache=cache, cache_scope="OpenAI/gpt-4o-mini").run(FakeCrew(other_model))
+    assert all(task.calls == 1 for task in other_model)
+
+
+def test_run_reuses_previous_outputs_for_unchanged_tasks():
+    first_run, _ = TaskScheduler(implicit_context=True).run(FakeCrew(_analysis_like_tasks()))
+
+    second_run = _analysis_like_tasks()
+    second_run[4].description = "Reformatter task with interview answers"
+    result, report = TaskScheduler(implicit_context=True).run(
+        FakeCrew(second_run), first_run.tasks_output, _fingerprints(_analysis_like_tasks())
+    )
+
+    assert [task.calls for task in second_run] == [0, 0, 0, 0, 1]
+    assert report.reused_tasks == [0, 1, 2, 3]
+    assert result.tasks_output[2] is first_run.tasks_output[2]
+
+
+def test_reused_tasks_fire_their_callback():
+    first_run, _ = TaskScheduler().run(FakeCrew(_analysis_like_tasks()))
+
+    second_run = _analysis_like_tasks()
+    received = []
+    for task in second_run:
+        task.callback = received.append
+    TaskScheduler().run(FakeCrew(second_run), first_run.tasks_output, _fingerprints(_analysis_like_tasks()))
+
+    assert all(task.calls == 0 for task in second_run)
+    assert sorted(output.raw for output in received) == sorted(output.raw for output in first_run.tasks_output)
+
+
+def test_run_reexecutes_downstream_of_changed_task():
+    first_run, _ = TaskScheduler().run(FakeCrew(_analysis_like_tasks()))
+
+    second_run = _analysis_like_tasks()
+    second_run[3].description = "Optimizer task for a new job"
+    TaskScheduler().run(FakeCrew(second_run), first_run.tasks_output, _fingerprints(_analysis_like_tasks()))
+
+    assert [task.calls for task in second_run] == [0, 0, 0, 1, 1]
+
+
+def test_run_reexecutes_every_task_when_only_the_system_template_changes():
+    first_tasks = _analysis_like_tasks()
+    for task in first_tasks:
+        task.agent.system_template = "Candidate CV: Jane Doe, backend engineer"
+    first_run, _ = TaskScheduler(implicit_context=True).run(FakeCrew(first_tasks))
+
+    second_run = _analysis_like_tasks()
+    for task in second_run:
+        task.agent.system_template = "Candidate CV: John Roe, data analyst"
+    _, report = TaskScheduler(implicit_context=True).run(
+        FakeCrew(second_run), first_run.tasks_output, _fingerprints(first_tasks)
+    )
+
+    assert [task.calls for task in second_run] == [1, 1, 1, 1, 1]
+    assert report.reused_tasks == []
+
+
+def test_outputs_from_another_model_are_not_reused():
+    first_tasks = _analysis_like_tasks()
+    first_run, _ = TaskScheduler(cache_scope="OpenAI/gpt-4o-mini").run(FakeCrew(first_tasks))
+    fingerprints = [TaskScheduler.fingerprint(task, "OpenAI/gpt-4o-mini") for task in first_tasks]
+
+    same_model = _analysis_like_tasks()
+    TaskScheduler(cache_scope="OpenAI/gpt-4o-mini").run(FakeCrew(same_model), first_run.tasks_output, fingerprints)
+    other_model = _analysis_like_tasks()
+    TaskScheduler(cache_scope="OpenAI/gpt-4o").run(FakeCrew(other_model), first_run.tasks_output, fingerprints)
+
+    assert all(task.calls == 0 for task in same_model)
+    assert all(task.calls == 1 for task in other_model)
+
+
+def test_outputs_without_fingerprints_are_not_reused():
+    first_run, _ = TaskScheduler().run(FakeCrew(_analysis_like_tasks()))
+    second_run = _analysis_like_tasks()
+    TaskScheduler().run(FakeCrew(second_run), first_run.tasks_output)
+    assert all(task.calls == 1 for task in second_run)
@@ -0,0 +1,30 @@
+"""Tests for the team selection step."""
+
+from streamlit.testing.v1 import AppTest
+
+JOB_DESCRIPTION = "Senior site reliability engineer, Kubernetes infrastructure, startup"
+
+
+def _team_step_app():
+    # AppTest runs this function's source on its own, so it cannot refer to module globals
+    from state_manager import state_manager
+    from steps.team import render_team_step
+
+    state_manager.ensure_initialized()
+    state_manager.update_job(description="Senior site reliability engineer, Kubernetes infrastructure, startup")
+    render_team_step()
+
+
+def test_applied_recommendations_do_not_count_as_a_manual_selection():
+    from services.persona_service import PersonaService
+
+    recommended = [name for name, _ in PersonaService.recommend_personas(JOB_DESCRIPTION, top_k=3)]
+    at = AppTest.from_function(_team_step_app, default_timeout=30).run()
+
+    assert not at.exception
+    assert at.session_state.selected_persona_names == recommended
+    assert at.session_state.persona_selection_touched is False
+    assert next(button for button in at.button if button.label == "Use").disabled
+
+    next(checkbox for checkbox in at.checkbox if checkbox.value).uncheck().run()
+    assert at.session_state.persona_selection_touched is True
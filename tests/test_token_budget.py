@@ -0,0 +1,89 @@
+"""Tests for prompt budgeting and run estimates."""
+
+import pytest
+
+import services.token_budget as token_budget
+from models import AppConfig, Persona
+from services.analysis_service import AnalysisService
+from services.token_budget import (
+    DEFAULT_PROFILE,
+    MODEL_PROFILES,
+    ModelProfile,
+    PromptBudget,
+    TaskBudget,
+    TokenCounter,
+    get_model_profile,
+)
+
+MODEL = "tiny-model"
+
+
+@pytest.fixture
+def counter(monkeypatch):
+    """A counter using the characters-per-token estimate, so tests never download encodings."""
+    counter = TokenCounter()
+    monkeypatch.setattr(counter, "_encoding", lambda model: None)
+    monkeypatch.setattr(token_budget, "token_counter", counter)
+    return counter
+
+
+@pytest.fixture
+def tiny_profile(monkeypatch):
+    profile = ModelProfile(
+        context_window=1_000, max_output_tokens=100, input_price=1.0, output_price=2.0, output_tokens_per_second=10
+    )
+    monkeypatch.setitem(MODEL_PROFILES, MODEL, profile)
+    return profile
+
+
+def test_model_profile_uses_longest_prefix():
+    assert get_model_profile("gpt-4o-mini-2024-07-18") is MODEL_PROFILES["gpt-4o-mini"]
+    assert get_model_profile("gemini/gemini-2.0-flash-exp") is MODEL_PROFILES["gemini-2.0-flash"]
+    assert get_model_profile("unknown-model") is DEFAULT_PROFILE
+
+
+def test_fit_keeps_inputs_that_fit(counter, tiny_profile):
+    budget = PromptBudget(MODEL, counter)
+    tasks = [TaskBudget("a", "fixed", cv_copies=1, job_copies=1)]
+    assert budget.fit(tasks, "cv " * 50, "job " * 50) == ("cv " * 50, "job " * 50)
+
+
+def test_fit_truncates_to_the_tightest_task(counter, tiny_profile):
+    budget = PromptBudget(MODEL, counter)
+    tasks = [
+        TaskBudget("specialist", "", cv_copies=1, job_copies=2, expected_output_tokens=100),
+        TaskBudget("board", "", context_tokens=200),
+    ]
+    cv, job = budget.fit(tasks, "c" * 8_000, "j" * 8_000)
+
+    available = int(1_000 * (1 - token_budget.SAFETY_MARGIN)) - 100
+    assert cv.endswith(token_budget.TRUNCATION_MARKER) and job.endswith(token_budget.TRUNCATION_MARKER)
+    assert budget.count(cv) + 2 * budget.count(job) <= available
+
+
+def test_estimate_runs_parallel_tasks_concurrently(counter, tiny_profile):
+    budget = PromptBudget(MODEL, counter)
+    tasks = [
+        TaskBudget("s1", "x" * 40, expected_output_tokens=50, parallel=True),
+        TaskBudget("s2", "x" * 40, expected_output_tokens=100, parallel=True),
+        TaskBudget("head", "x" * 40, expected_output_tokens=100),
+    ]
+    estimate = budget.estimate(tasks, "", "")
+
+    assert (estimate.input_tokens, estimate.output_tokens) == (30, 250)
+    assert estimate.seconds == pytest.approx((1 + 10) + (1 + 10))
+    assert estimate.cost_usd == pytest.approx((30 * 1.0 + 250 * 2.0) / 1_000_000)
+
+
+def test_analysis_estimate_counts_shared_context_once_per_task(counter):
+    personas = [
+        Persona(name="Recruiter", role="Recruiter", goal="Review", backstory="Hiring for {job_description}"),
+        Persona(name="Coach", role="Coach", goal="Review", backstory="Career coach"),
+    ]
+    config = AppConfig(llm_provider="OpenAI", selected_model="gpt-4o-mini")
+    small = AnalysisService.estimate_run(personas, "c" * 400, "j" * 400, config)
+    large = AnalysisService.estimate_run(personas, "c" * 800, "j" * 800, config)
+
+    assert [task.label for task in small.tasks[2:]] == ["Board Head", "Optimizer", "Reformatter"]
+    assert all(big.input_tokens - few.input_tokens == 200 for big, few in zip(large.tasks, small.tasks))
+    assert not small.cv_truncated